@@ -6,4 +6,30 @@ class CoreConfig(AppConfig):
     verbose_name = "CoMSES CoRe App"
 
     def ready(self):
-        pass
+        from django.contrib.auth.models import User
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+        from guardian.utils import get_group_obj_perms_model, get_user_obj_perms_model
+
+        from .backends import get_permission_model_map, invalidate_object_perms_cache
+        from .signals import register_signal_handlers
+
+        get_permission_model_map()
+        # assign_perm and remove_perm save and delete object permission rows
+        for model in (get_user_obj_perms_model(), get_group_obj_perms_model()):
+            label = model._meta.label_lower
+            post_save.connect(
+                invalidate_object_perms_cache,
+                sender=model,
+                dispatch_uid=f"object_perms_cache_save_{label}",
+            )
+            post_delete.connect(
+                invalidate_object_perms_cache,
+                sender=model,
+                dispatch_uid=f"object_perms_cache_delete_{label}",
+            )
+        m2m_changed.connect(
+            invalidate_object_perms_cache,
+            sender=User.groups.through,
+            dispatch_uid="object_perms_cache_user_groups",
+        )
+        register_signal_handlers()
@@ -1,8 +1,15 @@
 import logging
 import re
+from functools import cache
+from types import MappingProxyType
 
+from django.apps import apps
+from django.contrib.auth import get_permission_codename
 from django.contrib.auth.models import Permission
 from django.core.exceptions import PermissionDenied
+from guardian.backends import (
+    ObjectPermissionBackend as GuardianObjectPermissionBackend,
+)
 from guardian.shortcuts import get_perms
 
 from core.queryset import (
@@ -44,7 +51,28 @@ def is_delete_action(perm: str):
     return "delete_" in perm
 
 
+@cache
+def get_permission_model_map():
+    """
+    immutable map of "app_label.codename" permission strings to the model they belong to, built
+    from model Meta options (the same source as the Permission rows created by migrate)
+    """
+    permission_models = {}
+    for model in apps.get_models():
+        opts = model._meta
+        codenames = [
+            get_permission_codename(action, opts) for action in opts.default_permissions
+        ] + [codename for codename, name in opts.permissions]
+        for codename in codenames:
+            permission_models.setdefault(f"{opts.app_label}.{codename}", model)
+    return MappingProxyType(permission_models)
+
+
 def get_model(perm):
+    model = get_permission_model_map().get(perm)
+    if model is not None:
+        return model
+    # permissions created outside of model Meta options are looked up in the database
     try:
         app_label, codename = perm.split(".")
     except ValueError:
@@ -56,6 +84,40 @@ def get_model(perm):
     return permission.content_type.model_class()
 
 
+OBJECT_PERMS_CACHE_ATTRIBUTE = "_comses_object_perms_cache"
+# bumped whenever object permissions or group memberships change in this process
+_object_perms_version = 0
+
+
+def invalidate_object_perms_cache(**kwargs):
+    """
+    discard every memoized get_object_perms result in this process, connected to saves and
+    deletes of guardian's object permission models (assign_perm / remove_perm) and to group
+    membership changes in CoreConfig.ready
+    """
+    global _object_perms_version
+    _object_perms_version += 1
+
+
+def get_object_perms(user, obj):
+    """
+    guardian.shortcuts.get_perms memoized on the user instance. Each request loads its own user
+    instance so results are cached for at most the duration of a request, and are discarded
+    early if permissions are assigned or removed while the user instance is still in use.
+    """
+    if obj.pk is None:
+        return get_perms(user, obj)
+    cached = getattr(user, OBJECT_PERMS_CACHE_ATTRIBUTE, None)
+    if cached is None or cached[0] != _object_perms_version:
+        cached = (_object_perms_version, {})
+        setattr(user, OBJECT_PERMS_CACHE_ATTRIBUTE, cached)
+    object_perms = cached[1]
+    key = (obj._meta.label_lower, obj.pk)
+    if key not in object_perms:
+        object_perms[key] = get_perms(user, obj)
+    return object_perms[key]
+
+
 def has_authenticated_model_permission(user, perm, obj):
     if user.is_active and not is_object_action(perm):
         return True
@@ -87,7 +149,7 @@ def has_view_permission(perm, user, obj):
         if published:
             return True
         else:
-            perms = get_perms(user, obj)
+            perms = get_object_perms(user, obj)
             return bool(perms)
     return False
 
@@ -142,3 +204,23 @@ class ComsesObjectPermissionBackend:
         else:
             # Unhandled permissions are handled by the next permissions backend
             return False
+
+
+class CachedObjectPermissionBackend(GuardianObjectPermissionBackend):
+    """
+    django-guardian's object permission backend reading object permissions through the same
+    per-request cache as ComsesObjectPermissionBackend
+    """
+
+    def has_perm(self, user_obj, perm, obj=None):
+        if obj is None or obj.pk is None:
+            return super().has_perm(user_obj, perm, obj)
+        app_label, _, codename = perm.rpartition(".")
+        if app_label and app_label != obj._meta.app_label:
+            # let guardian raise WrongAppError
+            return super().has_perm(user_obj, perm, obj)
+        if user_obj.is_authenticated and not user_obj.is_active:
+            return False
+        if user_obj.is_superuser:
+            return True
+        return codename in get_object_perms(user_obj, obj)
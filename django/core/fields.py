@@ -1,7 +1,10 @@
+import hashlib
 import logging
+from functools import lru_cache
 
 import bleach
 import markdown
+from django.core.cache import cache
 from django.utils.html import linebreaks, escape
 from jinja2.utils import urlize
 from markupfield.fields import MarkupField
@@ -71,6 +74,58 @@ def sanitize_html(html: str):
     )
 
 
+# number of rendered markdown documents kept in each process in front of the shared redis cache
+MARKDOWN_LRU_CACHE_SIZE = 1024
+MARKDOWN_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+# rendered html depends on the markdown extensions and sanitizer allowlists as well as the source
+# text, so changes to either invalidate previously cached renders
+MARKDOWN_RENDERER_VERSION = hashlib.sha256(
+    repr(
+        (
+            DEFAULT_MARKDOWN_EXTENSIONS,
+            sorted(ALLOWED_TAGS),
+            sorted(ALLOWED_ATTRIBUTES.items()),
+        )
+    ).encode()
+).hexdigest()[:12]
+
+
+def get_markdown_cache_key(md_text: str):
+    digest = hashlib.sha256(md_text.encode()).hexdigest()
+    return f"markdown.{MARKDOWN_RENDERER_VERSION}.{digest}"
+
+
+@lru_cache(maxsize=MARKDOWN_LRU_CACHE_SIZE)
+def render_cached_markdown(md_text: str):
+    """
+    render_sanitized_markdown keyed by a hash of the source text, cached in-process and in redis
+    """
+    if not md_text:
+        return ""
+    key = get_markdown_cache_key(md_text)
+    html = cache.get(key)
+    if html is None:
+        html = render_sanitized_markdown(md_text)
+        cache.set(key, html, MARKDOWN_CACHE_TIMEOUT)
+    return html
+
+
+def warm_markdown_cache(md_texts):
+    """
+    render and store any of the given markdown texts that are missing from the shared cache
+    :return: number of texts rendered
+    """
+    texts = {get_markdown_cache_key(text): text for text in md_texts if text}
+    cached = cache.get_many(texts.keys())
+    rendered = {
+        key: render_sanitized_markdown(text)
+        for key, text in texts.items()
+        if key not in cached
+    }
+    cache.set_many(rendered, MARKDOWN_CACHE_TIMEOUT)
+    return len(rendered)
+
+
 class MarkdownField(MarkupField):
     CUSTOM_RENDERERS = (
         ("markdown", render_sanitized_markdown),
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django_redis import get_redis_connection
 from huey import RedisHuey
 
@@ -7,7 +8,66 @@ class DjangoRedisHuey(RedisHuey):
     from the django-redis cache backend
     """
 
+    COALESCE_KEY_TIMEOUT = 60 * 60 * 24
+
     def __init__(self, *args, **kwargs):
         connection = get_redis_connection("default")
         kwargs["connection_pool"] = connection.connection_pool
         super().__init__(*args, **kwargs)
+        self.pre_execute()(self._release_coalesced_task)
+
+    @property
+    def coalesce_pending_key(self):
+        """hash of coalesced task id -> coalesce key for tasks that have not started yet"""
+        return f"huey.{self.name}.coalesce.pending"
+
+    @property
+    def coalesce_stats_key(self):
+        return f"huey.{self.name}.coalesce.stats"
+
+    def get_coalesce_key(self, task_wrapper, key):
+        return f"huey.{self.name}.coalesce.{task_wrapper.func.__module__}.{task_wrapper.func.__name__}.{key}"
+
+    def enqueue_coalesced(self, task_wrapper, key, *args, delay=None, **kwargs):
+        """
+        schedule task_wrapper(*args, **kwargs) to run after a debounce delay, revoking any task
+        scheduled through this method with the same key that has not started yet so that only
+        the last of several rapid calls runs
+        """
+        if self.immediate:
+            return task_wrapper(*args, **kwargs)
+        if delay is None:
+            delay = settings.HUEY_COALESCE_DELAY
+        result = task_wrapper.schedule(args=args, kwargs=kwargs, delay=delay)
+        coalesce_key = self.get_coalesce_key(task_wrapper, key)
+        conn = self.storage.conn
+        conn.hset(self.coalesce_pending_key, result.id, coalesce_key)
+        previous_id = conn.set(
+            coalesce_key, result.id, ex=self.COALESCE_KEY_TIMEOUT, get=True
+        )
+        conn.hincrby(self.coalesce_stats_key, "enqueued", 1)
+        # only revoke the previous task if it is still waiting, a running task can't be undone
+        if previous_id and conn.hdel(self.coalesce_pending_key, previous_id):
+            self.revoke_by_id(previous_id.decode(), revoke_once=True)
+            conn.hincrby(self.coalesce_stats_key, "skipped_duplicates", 1)
+        return result
+
+    def _release_coalesced_task(self, task):
+        if not self.immediate:
+            self.storage.conn.hdel(self.coalesce_pending_key, task.id)
+
+    def get_queue_stats(self) -> dict:
+        """queue depth and task coalescing metrics"""
+        stats = {
+            "pending": self.pending_count(),
+            "scheduled": self.scheduled_count(),
+        }
+        if not self.immediate:
+            conn = self.storage.conn
+            counters = conn.hgetall(self.coalesce_stats_key)
+            stats.update(
+                coalesced_waiting=conn.hlen(self.coalesce_pending_key),
+                coalesced_enqueued=int(counters.get(b"enqueued", 0)),
+                skipped_duplicates=int(counters.get(b"skipped_duplicates", 0)),
+            )
+        return stats
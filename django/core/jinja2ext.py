@@ -1,4 +1,8 @@
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from jinja2 import nodes
 from jinja2.ext import Extension
+from markupsafe import Markup
 
 from django_vite.templatetags.django_vite import vite_hmr_client, vite_asset
 
@@ -20,3 +24,33 @@ class ViteExtension(Extension):
         super(ViteExtension, self).__init__(environment)
         environment.globals["vite_hmr_client"] = _vite_hmr_client
         environment.globals["vite_asset"] = _vite_asset
+
+
+class FragmentCacheExtension(Extension):
+    """
+    jinja2 equivalent of the django cache template tag, caches the rendered block in the default
+    cache keyed by fragment name and any additional vary on values:
+
+    {% cache timeout, "fragment_name", vary_on... %} ... {% endcache %}
+    """
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_render_cached", [nodes.List(args)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render_cached(self, args, caller):
+        timeout, fragment_name, *vary_on = args
+        key = make_template_fragment_key(fragment_name, vary_on)
+        rendered = cache.get(key)
+        if rendered is None:
+            rendered = str(caller())
+            cache.set(key, rendered, timeout)
+        return Markup(rendered)
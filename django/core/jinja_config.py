@@ -12,6 +12,7 @@ from django.utils.text import slugify
 from django.utils.timezone import get_current_timezone
 from django.utils.timesince import timeuntil, timesince
 from jinja2 import Environment
+from markupfield.fields import Markup as MarkupFieldValue
 from markupsafe import Markup
 
 from hcaptcha_field import hCaptchaField
@@ -23,7 +24,7 @@ from datetime import datetime
 from urllib.parse import parse_qsl
 
 from core.discourse import get_sanitized_username, sanitize_username
-from core.fields import render_sanitized_markdown
+from core.fields import render_cached_markdown
 from core.models import ComsesGroups
 from core.serializers import FULL_DATE_FORMAT, FULL_DATETIME_FORMAT
 
@@ -236,13 +237,16 @@ def is_hcaptcha(bound_field):
     return isinstance(bound_field.field, hCaptchaField)
 
 
-def markdown(text: str):
+def markdown(text):
     """
     Returns a sanitized HTML string representing the rendered version of the incoming Markdown text.
-    :param text: string markdown source text to be converted
+    Renders are cached by content hash, MarkdownField values use their stored rendered column.
+    :param text: string markdown source text or MarkdownField value to be converted
     :return: sanitized html string, explicitly marked as safe via jinja2.Markup
     """
-    return Markup(render_sanitized_markdown(text))
+    if isinstance(text, MarkupFieldValue):
+        return Markup(text.rendered)
+    return Markup(render_cached_markdown(text))
 
 
 def add_field_css(field, css_classes: str):
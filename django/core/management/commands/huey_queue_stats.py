@@ -0,0 +1,12 @@
+import json
+
+from django.core.management.base import BaseCommand
+from huey.contrib.djhuey import HUEY
+
+
+class Command(BaseCommand):
+    help = """Report huey queue depth and coalesced task metrics (tasks enqueued through
+    DjangoRedisHuey.enqueue_coalesced and duplicates skipped within the debounce window)"""
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(HUEY.get_queue_stats(), indent=2))
@@ -0,0 +1,40 @@
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+
+from core.fields import warm_markdown_cache
+from core.models import Event, Job
+from home.models import FaqEntry
+from library.models import Codebase
+
+
+class Command(BaseCommand):
+    help = """Prerender markdown text that templates pass through the markdown() filter into the
+    shared render cache, e.g., after a deploy that changes markdown extensions or sanitizer
+    allowlists. MarkdownField values are not included, their rendered columns are used directly."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="number of texts to check against the cache at once, defaults to 500",
+        )
+
+    def get_markdown_texts(self):
+        for codebase in Codebase.objects.filter(live=True).exclude_spam().iterator():
+            yield codebase.summarized_description
+            yield codebase.associated_publication_text
+            yield codebase.replication_text
+            yield codebase.references_text
+        for model in (Event, Job):
+            for obj in model.objects.live().exclude_spam().iterator():
+                yield obj.summary
+                yield obj.description.raw
+        yield from FaqEntry.objects.values_list("answer", flat=True).iterator()
+
+    def handle(self, *args, **options):
+        rendered = 0
+        for texts in batched(self.get_markdown_texts(), options["batch_size"]):
+            rendered += warm_markdown_cache(texts)
+        self.stdout.write(f"rendered {rendered} markdown texts into the cache")
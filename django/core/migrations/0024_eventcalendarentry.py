@@ -0,0 +1,138 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.urls import reverse
+
+
+def get_event_calendar_entries(event):
+    """
+    frozen copy of core.models.get_event_calendar_entries as of this migration, migrations must
+    not depend on code that may change after they were written
+    """
+    url = reverse("core:event-detail", kwargs={"pk": event.pk})
+    entries = []
+    if event.early_registration_deadline:
+        entries.append(
+            (
+                "early_registration_deadline",
+                event.early_registration_deadline,
+                event.early_registration_deadline,
+                {
+                    "title": "Early Registration Deadline: " + event.title,
+                    "start": event.early_registration_deadline.isoformat(),
+                    "url": url,
+                    "color": "#D9230F",
+                },
+            )
+        )
+    if event.submission_deadline:
+        entries.append(
+            (
+                "submission_deadline",
+                event.submission_deadline,
+                event.submission_deadline,
+                {
+                    "title": "Submission Deadline: " + event.title,
+                    "start": event.submission_deadline.isoformat(),
+                    "url": url,
+                    "color": "#D9230F",
+                },
+            )
+        )
+    if event.start_date:
+        end_date = event.end_date or event.start_date
+        entries.append(
+            (
+                "event",
+                event.start_date,
+                end_date,
+                {
+                    "title": event.title,
+                    "start": event.start_date.isoformat(),
+                    "end": end_date.isoformat(),
+                    "url": url,
+                    "color": "#3a87ad",
+                },
+            )
+        )
+    return entries
+
+
+def build_event_calendar_entries(apps, schema_editor):
+    Event = apps.get_model("core", "Event")
+    EventCalendarEntry = apps.get_model("core", "EventCalendarEntry")
+    EventCalendarEntry.objects.bulk_create(
+        (
+            EventCalendarEntry(
+                event=event, kind=kind, start_date=start, end_date=end, data=data
+            )
+            for event in Event.objects.filter(
+                is_deleted=False, is_marked_spam=False
+            ).iterator()
+            for kind, start, end, data in get_event_calendar_entries(event)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0023_add_librarian_group"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventCalendarEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            (
+                                "early_registration_deadline",
+                                "Early registration deadline",
+                            ),
+                            ("submission_deadline", "Submission deadline"),
+                            ("event", "Event"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                ("data", models.JSONField(help_text="Rendered calendar entry")),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="calendar_entries",
+                        to="core.event",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["start_date", "end_date"],
+                        name="core_eventc_start_d_88b67e_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("event", "kind"),
+                        name="unique_event_calendar_entry_kind",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_event_calendar_entries, migrations.RunPython.noop),
+    ]
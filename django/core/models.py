@@ -6,6 +6,7 @@ from enum import Enum
 from allauth.account.models import EmailAddress
 from django import forms
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, User
 from django.contrib.postgres.fields import ArrayField
@@ -482,6 +483,15 @@ class MemberProfile(index.Indexed, ClusterableModel):
             return social_acct.get_profile_url()
 
     def get_social_account(self, provider_name):
+        if "socialaccount_set" in getattr(self.user, "_prefetched_objects_cache", {}):
+            return next(
+                (
+                    account
+                    for account in self.user.socialaccount_set.all()
+                    if account.provider == provider_name
+                ),
+                None,
+            )
         return self.user.socialaccount_set.filter(provider=provider_name).first()
 
     @property
@@ -700,12 +710,15 @@ class EventQuerySet(models.QuerySet):
         # FIXME: duplicated across Event/Job/Codebase querysets
         return self.exclude(is_marked_spam=True)
 
-    def latest_for_feed(self, number=10):
-        return (
+    def latest_for_feed(self, number=10, include_all=False):
+        qs = (
             self.public()
             .select_related("submitter__member_profile")
-            .order_by("-date_created")[:number]
+            .order_by("-date_created")
         )
+        if include_all:
+            return qs
+        return qs[:number]
 
     def public(self):
         return self.filter(is_deleted=False).exclude_spam()
@@ -782,6 +795,140 @@ class Event(index.Indexed, ModeratedContent, ClusterableModel):
             self.title, self.submitter.username, self.date_created.strftime("%c")
         )
 
+    @property
+    def is_public(self):
+        return not (self.is_deleted or self.is_marked_spam)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            EventCalendarEntry.objects.rebuild(self)
+
+
+EVENT_CALENDAR_CACHE_VERSION_KEY = "core.events.calendar.version"
+EVENT_CALENDAR_CACHE_TIMEOUT = 60 * 60
+
+
+def get_event_calendar_cache_version():
+    return cache.get_or_set(EVENT_CALENDAR_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_event_calendar_cache():
+    try:
+        cache.incr(EVENT_CALENDAR_CACHE_VERSION_KEY)
+    except ValueError:
+        # key is missing, there is nothing cached under the current version
+        pass
+
+
+def get_event_calendar_entries(event):
+    """
+    :return: list of (kind, start date, end date, rendered calendar entry) for the early
+    registration deadline, submission deadline and span of the given event
+    """
+    url = reverse("core:event-detail", kwargs={"pk": event.pk})
+    entries = []
+    if event.early_registration_deadline:
+        entries.append(
+            (
+                EventCalendarEntry.Kind.EARLY_REGISTRATION_DEADLINE,
+                event.early_registration_deadline,
+                event.early_registration_deadline,
+                {
+                    "title": "Early Registration Deadline: " + event.title,
+                    "start": event.early_registration_deadline.isoformat(),
+                    "url": url,
+                    "color": "#D9230F",
+                },
+            )
+        )
+    if event.submission_deadline:
+        entries.append(
+            (
+                EventCalendarEntry.Kind.SUBMISSION_DEADLINE,
+                event.submission_deadline,
+                event.submission_deadline,
+                {
+                    "title": "Submission Deadline: " + event.title,
+                    "start": event.submission_deadline.isoformat(),
+                    "url": url,
+                    "color": "#D9230F",
+                },
+            )
+        )
+    if event.start_date:
+        end_date = event.end_date or event.start_date
+        entries.append(
+            (
+                EventCalendarEntry.Kind.EVENT,
+                event.start_date,
+                end_date,
+                {
+                    "title": event.title,
+                    "start": event.start_date.isoformat(),
+                    "end": end_date.isoformat(),
+                    "url": url,
+                    "color": "#3a87ad",
+                },
+            )
+        )
+    return entries
+
+
+class EventCalendarEntryQuerySet(models.QuerySet):
+    def find_by_interval(self, start, end):
+        """entries that overlap the closed interval [start, end]"""
+        return self.filter(start_date__lte=end, end_date__gte=start)
+
+    def rebuild(self, event):
+        """
+        replace the calendar entries of an event, public events only have entries
+        """
+        self.filter(event=event).delete()
+        if event.is_public:
+            self.bulk_create(
+                EventCalendarEntry(
+                    event=event, kind=kind, start_date=start, end_date=end, data=data
+                )
+                for kind, start, end, data in get_event_calendar_entries(event)
+            )
+        transaction.on_commit(invalidate_event_calendar_cache)
+
+
+class EventCalendarEntry(models.Model):
+    """
+    Precomputed events calendar entry, one row per event deadline or event span with the JSON
+    rendered for the calendar so that a calendar month is a single indexed range scan
+    """
+
+    class Kind(models.TextChoices):
+        EARLY_REGISTRATION_DEADLINE = "early_registration_deadline", _(
+            "Early registration deadline"
+        )
+        SUBMISSION_DEADLINE = "submission_deadline", _("Submission deadline")
+        EVENT = "event", _("Event")
+
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="calendar_entries"
+    )
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    data = models.JSONField(help_text=_("Rendered calendar entry"))
+
+    objects = EventCalendarEntryQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "kind"], name="unique_event_calendar_entry_kind"
+            )
+        ]
+        indexes = [models.Index(fields=["start_date", "end_date"])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.start_date} - {self.end_date}: {self.event_id}"
+
 
 class JobTag(TaggedItemBase):
     content_object = ParentalKey("core.Job", related_name="tagged_jobs")
@@ -836,12 +983,15 @@ class JobQuerySet(models.QuerySet):
         # FIXME: duplicated across Event/Job/Codebase querysets
         return self.exclude(is_marked_spam=True)
 
-    def latest_for_feed(self, number=10):
-        return (
+    def latest_for_feed(self, number=10, include_all=False):
+        qs = (
             self.public()
             .select_related("submitter__member_profile")
-            .order_by("-date_created")[:number]
+            .order_by("-date_created")
         )
+        if include_all:
+            return qs
+        return qs[:number]
 
 
 @add_to_comses_permission_whitelist
@@ -1,6 +1,8 @@
-from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
-from guardian import shortcuts as sc
+from django.db.models import CharField, Exists, OuterRef, Q
+from django.db.models.functions import Cast
+from guardian.models import GroupObjectPermission, UserObjectPermission
 
 
 def make_change_delete_view_perms(model):
@@ -12,23 +14,50 @@ def make_change_delete_view_perms(model):
     ]
 
 
+def get_object_permission_q(user, model):
+    """
+    EXISTS predicates matching objects on which the user, directly or through one of their groups,
+    has change, delete or view object permissions. Each subquery is correlated on
+    (content_type, object_pk) so it can use guardian's object permission index.
+    """
+    codenames = [perm.split(".")[1] for perm in make_change_delete_view_perms(model)]
+    permission_filters = dict(
+        content_type=ContentType.objects.get_for_model(model),
+        permission__codename__in=codenames,
+        object_pk=Cast(OuterRef("pk"), output_field=CharField()),
+    )
+    return Exists(
+        UserObjectPermission.objects.filter(user=user, **permission_filters)
+    ) | Exists(
+        GroupObjectPermission.objects.filter(
+            group__in=user.groups.values("pk"), **permission_filters
+        )
+    )
+
+
 def get_viewable_objects_for_user(user, queryset):
-    """A user can view an object in a list view if they have any permissions on the object
-    (currently change, delete or view permission)"""
+    """A user can view an object in a list view if it is public, they submitted it, or they
+    have any permissions on the object (currently change, delete or view permission).
+
+    Compiles to a single WHERE clause: the public filter OR submitter OR object permission
+    EXISTS subqueries. Anonymous users only see public objects."""
     model = queryset.model
-    perms = make_change_delete_view_perms(model)
 
     # Do not filter the queryset if the model does not have the PUBLISHED_ATTRIBUTE_KEY
     # (models without PUBLISHED_ATTRIBUTE_KEY are assumed to be live so are always included in list results)
     if hasattr(model, "HAS_PUBLISHED_KEY") or has_field(model, PUBLISHED_ATTRIBUTE_KEY):
-        user = get_db_user(user)
+        # combining querysets merges only their filters, related lookups like prefetches are
+        # kept from the left hand side
         is_public_queryset = queryset.public()
-        is_submitter_queryset = queryset.filter(submitter=user)
-        has_object_permission_queryset = sc.get_objects_for_user(
-            user, perms=perms, any_perm=True, accept_global_perms=False, klass=queryset
-        )
-        queryset &= (
-            has_object_permission_queryset | is_public_queryset | is_submitter_queryset
+        if user.is_anonymous:
+            return queryset & is_public_queryset
+        if user.is_superuser:
+            return queryset
+        queryset = (
+            queryset.filter(
+                Q(**{OWNER_ATTRIBUTE_KEY: user}) | get_object_permission_q(user, model)
+            )
+            | is_public_queryset
         )
 
     return queryset
@@ -39,11 +68,6 @@ DELETABLE_ATTRIBUTE_KEY = "deletable"
 OWNER_ATTRIBUTE_KEY = "submitter"
 
 
-def get_db_user(user):
-    """Replaces AnonymousUser with Guardian anonymous user db record. Otherwise returns input"""
-    return User.get_anonymous() if user.is_anonymous else user
-
-
 def has_field(model, field_name):
     try:
         model._meta.get_field(field_name)
@@ -176,8 +176,10 @@ MIDDLEWARE = [
 AUTHENTICATION_BACKENDS = (
     "allauth.account.auth_backends.AuthenticationBackend",
     "core.backends.ComsesObjectPermissionBackend",
-    "guardian.backends.ObjectPermissionBackend",
+    "core.backends.CachedObjectPermissionBackend",
 )
+# guardian warns when its own ObjectPermissionBackend is not configured, the subclass above is used instead
+SILENCED_SYSTEM_CHECKS = ["guardian.W001"]
 
 ### configure wagtailmarkdown https://github.com/torchbox/wagtail-markdown
 
@@ -246,13 +248,15 @@ ROOT_URLCONF = "core.urls"
 # tune down elasticsearch complaints
 warnings.simplefilter("ignore", category=ElasticsearchWarning)
 
-# configure elasticsearch 7 wagtail backend
+# configure elasticsearch 7 wagtail backend. Documents are not updated inline on save,
+# changes are queued by search.signals and bulk indexed by search.tasks.update_dirty_search_documents
 WAGTAILSEARCH_BACKENDS = {
     "default": {
-        "BACKEND": "wagtail.search.backends.elasticsearch7",
+        # elasticsearch7 backend with keyword term filters and facet aggregations
+        "BACKEND": "search.backends",
         "URLS": ["http://elasticsearch:9200"],
         "ATOMIC_REBUILD": True,
-        "AUTO_UPDATE": True,
+        "AUTO_UPDATE": False,
         "TIMEOUT": 30,
         "OPTIONS": {
             "max_retries": 2,
@@ -531,6 +535,9 @@ HUEY = {
     # FIXME: this should generally be True in development, the huey consumer WILL NOT
     # automatically reload when the code changes when False
 }
+# seconds to wait for further calls before running a task queued with
+# core.huey.DjangoRedisHuey.enqueue_coalesced, only the last call within the window runs
+HUEY_COALESCE_DELAY = int(os.getenv("HUEY_COALESCE_DELAY", 30))
 
 # SSO, user registration, and django-allauth configuration, see
 # https://django-allauth.readthedocs.io/en/latest/installation/quickstart.html
@@ -628,6 +635,7 @@ TEMPLATES = [
         "OPTIONS": {
             "extensions": [
                 "core.jinja2ext.ViteExtension",
+                "core.jinja2ext.FragmentCacheExtension",
                 "wagtail.contrib.settings.jinja2tags.settings",
                 "wagtail.jinja2tags.core",
                 "wagtail.admin.jinja2tags.userbar",
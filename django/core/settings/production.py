@@ -79,6 +79,7 @@ TEMPLATES = [
         "OPTIONS": {
             "extensions": [
                 "core.jinja2ext.ViteExtension",
+                "core.jinja2ext.FragmentCacheExtension",
                 "wagtail.contrib.settings.jinja2tags.settings",
                 "wagtail.jinja2tags.core",
                 "wagtail.admin.jinja2tags.userbar",
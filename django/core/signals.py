@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+
+from .models import Event, invalidate_event_calendar_cache
+
+
+def on_event_delete(sender, **kwargs):
+    """
+    Deleted events take their calendar entries with them, orphan the cached calendar windows
+    """
+    transaction.on_commit(invalidate_event_calendar_cache)
+
+
+def register_signal_handlers():
+    post_delete.connect(
+        on_event_delete, sender=Event, dispatch_uid="event_calendar_invalidate_delete"
+    )
@@ -1,11 +1,15 @@
 import logging
 
 from allauth.socialaccount.models import SocialApp
+from django.contrib.auth.models import Group, User
 from django.urls import reverse
 from django.test import TestCase
+from guardian.shortcuts import assign_perm, remove_perm
 from rest_framework.status import HTTP_302_FOUND, HTTP_200_OK
 
-from .base import UserFactory
+from core.backends import get_model
+from core.models import Event, MemberProfile
+from .base import EventFactory, UserFactory
 
 logger = logging.getLogger(__name__)
 
@@ -99,3 +103,44 @@ class EmailAuthenticationBackendTestCase(TestCase):
         superuser = self.user_factory.create(is_superuser=True)
         self.check_response_200(superuser, password=self.wrong_password)
         self.check_authentication_failed(user, password=self.wrong_password)
+
+
+class ObjectPermissionCachingTestCase(TestCase):
+    OBJECT_PERMS = ["core.view_event", "core.change_event", "core.delete_event"]
+
+    def setUp(self):
+        user_factory = UserFactory()
+        self.user = user_factory.create()
+        # deleted events are unpublished so view permission requires object permissions
+        self.event = EventFactory(user_factory.create()).create(is_deleted=True)
+
+    def test_permission_model_lookup_does_not_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(get_model("core.change_event"), Event)
+            self.assertEqual(get_model("core.view_memberprofile"), MemberProfile)
+
+    def test_object_permissions_are_cached_per_user_instance(self):
+        self.assertFalse(
+            any(self.user.has_perm(perm, self.event) for perm in self.OBJECT_PERMS)
+        )
+        with self.assertNumQueries(0):
+            for perm in self.OBJECT_PERMS:
+                self.assertFalse(self.user.has_perm(perm, self.event))
+        assign_perm("change_event", self.user, self.event)
+        # the next request loads a new user instance and sees the assigned permission
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.has_perm("core.change_event", self.event))
+        self.assertTrue(user.has_perm("core.view_event", self.event))
+        self.assertFalse(user.has_perm("core.delete_event", self.event))
+
+    def test_cached_object_permissions_are_discarded_on_change(self):
+        self.assertFalse(self.user.has_perm("core.change_event", self.event))
+        assign_perm("change_event", self.user, self.event)
+        self.assertTrue(self.user.has_perm("core.change_event", self.event))
+        remove_perm("change_event", self.user, self.event)
+        self.assertFalse(self.user.has_perm("core.change_event", self.event))
+        group = Group.objects.create(name="event editors")
+        assign_perm("change_event", group, self.event)
+        self.assertFalse(self.user.has_perm("core.change_event", self.event))
+        self.user.groups.add(group)
+        self.assertTrue(self.user.has_perm("core.change_event", self.event))
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+from core.fields import (
+    get_markdown_cache_key,
+    render_cached_markdown,
+    render_sanitized_markdown,
+    warm_markdown_cache,
+)
+from core.jinja_config import markdown
+from core.tests.base import BaseModelTestCase
+
+MARKDOWN_TEXT = "# Wolf Sheep\n\nSee https://www.comses.net for *more* models"
+
+
+class MarkdownRenderCacheTestCase(BaseModelTestCase):
+    def setUp(self):
+        super().setUp()
+        render_cached_markdown.cache_clear()
+        cache.delete(get_markdown_cache_key(MARKDOWN_TEXT))
+
+    def tearDown(self):
+        render_cached_markdown.cache_clear()
+        cache.delete(get_markdown_cache_key(MARKDOWN_TEXT))
+
+    @patch("core.fields.render_sanitized_markdown", wraps=render_sanitized_markdown)
+    def test_render_is_cached_in_process_and_shared(self, render):
+        html = render_sanitized_markdown(MARKDOWN_TEXT)
+        self.assertEqual(markdown(MARKDOWN_TEXT), html)
+        self.assertEqual(markdown(MARKDOWN_TEXT), html)
+        self.assertEqual(render_cached_markdown.cache_info().hits, 1)
+        # a process with a cold LRU cache reuses the shared render
+        render_cached_markdown.cache_clear()
+        self.assertEqual(markdown(MARKDOWN_TEXT), html)
+        render.assert_called_once_with(MARKDOWN_TEXT)
+
+    @patch("core.fields.render_sanitized_markdown")
+    def test_markdown_field_uses_rendered_column(self, render):
+        event = self.create_event(description=MARKDOWN_TEXT)
+        self.assertEqual(markdown(event.description), event.description.rendered)
+        render.assert_not_called()
+
+    def test_warm_renders_missing_texts(self):
+        self.assertEqual(warm_markdown_cache([MARKDOWN_TEXT, "", MARKDOWN_TEXT]), 1)
+        self.assertEqual(warm_markdown_cache([MARKDOWN_TEXT]), 0)
+        self.assertEqual(
+            cache.get(get_markdown_cache_key(MARKDOWN_TEXT)),
+            render_sanitized_markdown(MARKDOWN_TEXT),
+        )
@@ -0,0 +1,52 @@
+from django.test import SimpleTestCase
+
+from core.huey import DjangoRedisHuey
+
+
+class CoalescedTaskTestCase(SimpleTestCase):
+    def setUp(self):
+        self.huey = DjangoRedisHuey("comses-coalesce-test", immediate=False)
+        self.calls = []
+
+        @self.huey.task()
+        def record_call(value):
+            self.calls.append(value)
+
+        self.record_call = record_call
+
+    def tearDown(self):
+        self.huey.flush()
+        self.huey.storage.conn.delete(
+            self.huey.coalesce_pending_key,
+            self.huey.coalesce_stats_key,
+            self.huey.get_coalesce_key(self.record_call, "release:1"),
+        )
+
+    def run_queued_tasks(self):
+        while (task := self.huey.dequeue()) is not None:
+            self.huey.execute(task)
+
+    def test_only_last_task_runs(self):
+        results = [
+            self.huey.enqueue_coalesced(self.record_call, "release:1", value, delay=0)
+            for value in range(3)
+        ]
+        for result in results[:-1]:
+            self.assertTrue(result.is_revoked())
+        self.assertFalse(results[-1].is_revoked())
+        stats = self.huey.get_queue_stats()
+        self.assertEqual(stats["pending"], 3)
+        self.assertEqual(stats["coalesced_waiting"], 1)
+        self.assertEqual(stats["coalesced_enqueued"], 3)
+        self.assertEqual(stats["skipped_duplicates"], 2)
+        self.run_queued_tasks()
+        self.assertEqual(self.calls, [2])
+        self.assertEqual(self.huey.get_queue_stats()["coalesced_waiting"], 0)
+
+    def test_started_task_is_not_revoked(self):
+        self.huey.enqueue_coalesced(self.record_call, "release:1", "first", delay=0)
+        self.run_queued_tasks()
+        self.huey.enqueue_coalesced(self.record_call, "release:1", "second", delay=0)
+        self.run_queued_tasks()
+        self.assertEqual(self.calls, ["first", "second"])
+        self.assertEqual(self.huey.get_queue_stats()["skipped_duplicates"], 0)
@@ -1,4 +1,5 @@
 import logging
+from datetime import date, timedelta
 
 from django.conf import settings
 from rest_framework.test import APIClient
@@ -9,7 +10,14 @@ from django.test import TestCase
 from .base import create_test_user, update_index, JobFactory, EventFactory
 from .permissions_base import BaseViewSetTestCase
 from core.views import EventViewSet, JobViewSet
-from core.models import Job, Event, SpamModeration, ComsesGroups
+from core.models import (
+    Job,
+    Event,
+    EventCalendarEntry,
+    SpamModeration,
+    ComsesGroups,
+    invalidate_event_calendar_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -107,6 +115,55 @@ class EventPageRenderTestCase(TestCase):
         response = self.client.get(reverse("core:event-calendar"))
         self.assertEqual(response.status_code, 200)
 
+    def test_calendar_entries(self):
+        today = date.today()
+        event = self.event_factory.create(
+            title="Deadlines",
+            submission_deadline=today + timedelta(days=3),
+            start_date=today + timedelta(days=10),
+            end_date=today + timedelta(days=12),
+        )
+        self.assertEqual(
+            set(event.calendar_entries.values_list("kind", flat=True)),
+            {
+                EventCalendarEntry.Kind.SUBMISSION_DEADLINE,
+                EventCalendarEntry.Kind.EVENT,
+            },
+        )
+        invalidate_event_calendar_cache()
+        params = {
+            "start": today.isoformat(),
+            "end": (today + timedelta(days=7)).isoformat(),
+        }
+        response = self.client.get(
+            reverse("core:event-calendar"), params, HTTP_ACCEPT="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [entry["title"] for entry in response.json()],
+            [self.event.title, "Submission Deadline: Deadlines"],
+        )
+        # deleting the event orphans the cached calendar window
+        with self.captureOnCommitCallbacks(execute=True):
+            event.delete()
+        response = self.client.get(
+            reverse("core:event-calendar"), params, HTTP_ACCEPT="application/json"
+        )
+        self.assertEqual(
+            [entry["title"] for entry in response.json()], [self.event.title]
+        )
+        # deleted events are removed from the calendar
+        with self.captureOnCommitCallbacks(execute=True):
+            event.is_deleted = True
+            event.save()
+        self.assertFalse(event.calendar_entries.exists())
+        response = self.client.get(
+            reverse("core:event-calendar"), params, HTTP_ACCEPT="application/json"
+        )
+        self.assertEqual(
+            [entry["title"] for entry in response.json()], [self.event.title]
+        )
+
 
 class ProfilePageRenderTestCase(TestCase):
     client_class = APIClient
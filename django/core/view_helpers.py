@@ -3,7 +3,6 @@ from collections import defaultdict
 from django.core.exceptions import FieldError
 from rest_framework.response import Response
 from wagtail.search.backends import get_search_backend
-from wagtail.contrib.search_promotions.models import Query
 from wagtail.search.query import (
     MATCH_ALL,
     Phrase,
@@ -13,8 +12,11 @@ from wagtail.search.query import (
     SearchQuery,
 )
 
+from functools import lru_cache
 from itertools import combinations
 
+from search.query_hits import record_query_hit
+
 from .models import ComsesGroups
 
 logger = logging.getLogger(__name__)
@@ -49,7 +51,16 @@ STOP_WORDS = {
 }
 
 
+# only the leading words of long queries are paired up into 2-word phrases, the number of
+# phrase clauses grows quadratically with the number of words
+MAX_PHRASE_COMBINATION_WORDS = 6
+
+
+@lru_cache(maxsize=512)
 def build_search_query(input_text: str) -> SearchQuery:
+    """
+    build a search query tree from the given text. Cached, the returned query must not be mutated
+    """
     words = [word for word in input_text.split() if word.lower() not in STOP_WORDS]
 
     # Highest priority: Fuzzy match of the entire input text
@@ -58,8 +69,10 @@ def build_search_query(input_text: str) -> SearchQuery:
     # Second priority: Exact match using Phrase
     exact_match_query = Boost(Phrase(input_text), boost=15.0)
 
-    # Generate all 2-word combinations
-    two_word_combos = list(combinations(words, 2))
+    # Generate 2-word combinations of the leading (distinct) words
+    two_word_combos = list(
+        combinations(list(dict.fromkeys(words))[:MAX_PHRASE_COMBINATION_WORDS], 2)
+    )
 
     # Create queries for 2-word combinations
     two_word_queries = []
@@ -129,7 +142,8 @@ def get_search_queryset(
         operator = 'and'
     """
     if query:
-        Query.get(query).add_hit()
+        # buffered in redis, flushed to QueryDailyHits by search.tasks.flush_search_query_hits
+        record_query_hit(query)
 
         # this can be used to create split query and filters from search field input text:
         # `some search terms peer_reviewed:True` -> query="some search terms" and filters=["peer_reviewed": True]
@@ -1,6 +1,7 @@
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
@@ -46,7 +47,16 @@ from .sso import (
     get_verified_sso_payload,
     is_sso_secret_configured,
 )
-from .models import ComsesGroups, Event, FollowUser, Job, MemberProfile
+from .models import (
+    EVENT_CALENDAR_CACHE_TIMEOUT,
+    ComsesGroups,
+    Event,
+    EventCalendarEntry,
+    FollowUser,
+    Job,
+    MemberProfile,
+    get_event_calendar_cache_version,
+)
 from .serializers import (
     EventSerializer,
     JobSerializer,
@@ -511,72 +521,31 @@ class EventViewSet(
     def retrieve(self, request, *args, **kwargs):
         return retrieve_with_perms(self, request, *args, **kwargs)
 
-    def get_calendar_queryset(self):
+    def get_calendar_entries(self):
         start = parse_date(self.request.query_params["start"])
         end = parse_date(self.request.query_params["end"])
-        return self.queryset.public().find_by_interval(start, end), start, end
-
-    @staticmethod
-    def to_calendar_early_registration_deadline_event(event):
-        return {
-            "title": "Early Registration Deadline: " + event.title,
-            "start": event.early_registration_deadline.isoformat(),
-            "url": event.get_absolute_url(),
-            "color": "#D9230F",
-        }
-
-    @staticmethod
-    def to_calendar_submission_deadline_event(event):
-        return {
-            "title": "Submission Deadline: " + event.title,
-            "start": event.submission_deadline.isoformat(),
-            "url": event.get_absolute_url(),
-            "color": "#D9230F",
-        }
-
-    @staticmethod
-    def to_calendar_event(event):
-        return {
-            "title": event.title,
-            "start": event.start_date.isoformat(),
-            "end": event.end_date.isoformat(),
-            "url": event.get_absolute_url(),
-            "color": "#3a87ad",
-        }
+        cache_key = (
+            f"core.events.calendar.{get_event_calendar_cache_version()}.{start}.{end}"
+        )
+        calendar_events = cache.get(cache_key)
+        if calendar_events is None:
+            calendar_events = list(
+                EventCalendarEntry.objects.find_by_interval(start, end)
+                .order_by("start_date", "id")
+                .values_list("data", flat=True)
+            )
+            cache.set(cache_key, calendar_events, EVENT_CALENDAR_CACHE_TIMEOUT)
+        return calendar_events
 
     @action(detail=False)
     def calendar(self, request, *args, **kwargs):
         """Arrange events so that early registration deadline, registration deadline and the actual event
-        are events to be rendered in the calendar"""
+        are events to be rendered in the calendar. Calendar entries are precomputed when an event is
+        saved, see EventCalendarEntry"""
         calendar_events = {}
         if request.query_params:
             if request.accepted_media_type == "application/json":
-                calendar_events = []
-                queryset, start, end = self.get_calendar_queryset()
-                for event in list(queryset):
-                    if (
-                        event.early_registration_deadline
-                        and start <= event.early_registration_deadline <= end
-                    ):
-                        calendar_events.append(
-                            self.to_calendar_early_registration_deadline_event(event)
-                        )
-
-                    if (
-                        event.submission_deadline
-                        and start <= event.submission_deadline <= end
-                    ):
-                        calendar_events.append(
-                            self.to_calendar_submission_deadline_event(event)
-                        )
-
-                    if event.start_date:
-                        min_date = max(start, event.start_date)
-                        if event.end_date is None:
-                            event.end_date = event.start_date
-                        max_date = min(end, event.end_date)
-                        if min_date <= max_date:
-                            calendar_events.append(self.to_calendar_event(event))
+                calendar_events = self.get_calendar_entries()
             else:
                 # FIXME: revert if this turns out to be a terrible idea
                 return redirect(
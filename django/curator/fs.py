@@ -58,9 +58,9 @@ class CodebaseReleaseFileConsistencyChecker:
         if self.release.is_published:
             with TemporaryDirectory() as d:
                 new_archive_path = os.path.join(d, "archive.zip")
-                aip_exists = self.fs_api.build_archive_at_dest(new_archive_path)
-                if not aip_exists:
-                    raise IOError("AIP directory does not exist")
+                sip_exists = self.fs_api.build_archive_at_dest(new_archive_path)
+                if not sip_exists:
+                    raise IOError("SIP directory does not exist")
                 new_archive_hash = hash_file(new_archive_path)
                 old_archive_hash = hash_file(str(self.fs_api.archivepath))
                 return new_archive_hash.hexdigest() == old_archive_hash.hexdigest()
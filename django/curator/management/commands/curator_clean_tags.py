@@ -4,6 +4,7 @@ import pathlib
 from django.core.management.base import BaseCommand
 
 from curator.models import TagCleanup, PENDING_TAG_CLEANUPS_FILENAME
+from curator.tag_clustering import DEFAULT_SIMILARITY_THRESHOLD, TagClusteringEngine
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,25 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--run", "-r", action="store_true", default=False)
         parser.add_argument("--load", "-l", action="store_true", default=False)
-        parser.add_argument("--method", "-m", default=False)
+        parser.add_argument(
+            "--method",
+            "-m",
+            default=False,
+            help="porter_stemmer, programming_language or similarity",
+        )
+        parser.add_argument(
+            "--threshold",
+            "-t",
+            type=float,
+            default=DEFAULT_SIMILARITY_THRESHOLD,
+            help="minimum n-gram similarity between tags grouped by the similarity method",
+        )
+        parser.add_argument(
+            "--timings",
+            action="store_true",
+            default=False,
+            help="report the time spent in each clustering stage for the selected method",
+        )
         parser.add_argument(
             "--view",
             action="store_true",
@@ -35,14 +54,25 @@ class Command(BaseCommand):
         tag_cleanups = TagCleanup.load(path)
         TagCleanup.objects.bulk_create(tag_cleanups)
 
-    def handle_method(self, method):
+    def handle_method(self, method, threshold, timings):
+        engine = TagClusteringEngine()
         if method == "porter_stemmer":
-            tag_cleanups = TagCleanup.find_groups_by_porter_stemmer()
+            tag_cleanups = TagCleanup.find_groups_by_porter_stemmer(engine=engine)
         elif method == "programming_language":
-            tag_cleanups = TagCleanup.find_groups_by_platform_and_language()
+            tag_cleanups = TagCleanup.find_groups_by_platform_and_language(
+                engine=engine
+            )
+        elif method == "similarity":
+            tag_cleanups = TagCleanup.find_groups_by_similarity(
+                threshold=threshold, engine=engine
+            )
         else:
             raise Exception("invalid method name")
         TagCleanup.objects.bulk_create(tag_cleanups)
+        if timings:
+            self.stdout.write(
+                f"{method}: {len(tag_cleanups)} tag cleanups\n{engine.report_timings()}"
+            )
 
     def handle_run(self):
         TagCleanup.objects.process()
@@ -68,7 +98,7 @@ class Command(BaseCommand):
         elif load:
             self.handle_load(load_directory)
         elif method:
-            self.handle_method(method)
+            self.handle_method(method, options["threshold"], options["timings"])
         elif dump:
             logger.debug(
                 "Dumping tag curation data to %s",
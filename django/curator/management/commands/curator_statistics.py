@@ -7,11 +7,12 @@ import pytz
 from dateutil.parser import parse as parse_date
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
-from django.db.models import Count, Max
+from django.db.models import Count, Max, Sum
 
 from core.models import MemberProfile, Job, Event
 from library.models import (
     CodebaseReleaseDownload,
+    CodebaseReleaseDownloadCount,
     CodebaseRelease,
     Codebase,
     PeerReview,
@@ -45,17 +46,19 @@ class Command(BaseCommand):
             help="comma separated list of things to aggregate, default is release, codebase, ip, new, reviewed, users",
         )
 
-    def export_release_download_statistics(self, downloads, dest):
+    def export_release_download_statistics(self, download_counts, dest):
         releases = (
             CodebaseRelease.objects.filter(
-                id__in=downloads.values_list("release_id", flat=True)
+                id__in=download_counts.values_list("release_id", flat=True)
             )
             .prefetch_related("codebase")
             .only("version_number", "codebase__identifier")
             .in_bulk()
         )
         results = (
-            downloads.values("release_id").annotate(count=Count("*")).order_by("-count")
+            download_counts.values("release_id")
+            .annotate(total=Sum("count"))
+            .order_by("-total")
         )
         with open(dest, "w", newline="") as f:
             fieldnames = ["url", "count", "authors"]
@@ -72,35 +75,35 @@ class Command(BaseCommand):
                 writer.writerow(
                     {
                         "url": release.get_absolute_url(),
-                        "count": result["count"],
+                        "count": result["total"],
                         "authors": authors,
                     }
                 )
 
-    def export_codebase_download_statistics(self, downloads, dest):
+    def export_codebase_download_statistics(self, download_counts, dest):
         codebases = (
             Codebase.objects.filter(
-                releases__id__in=downloads.values_list("release_id", flat=True)
+                id__in=download_counts.values_list("codebase_id", flat=True)
             )
             .prefetch_related("releases")
             .only("identifier", "title")
             .in_bulk()
         )
         results = (
-            downloads.values("release__codebase__id")
-            .annotate(count=Count("*"))
-            .order_by("-count")
+            download_counts.values("codebase_id")
+            .annotate(total=Sum("count"))
+            .order_by("-total")
         )
         with open(dest, "w", newline="") as f:
             fieldnames = ["url", "count", "title"]
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             for result in results.iterator():
-                codebase = codebases[result["release__codebase__id"]]
+                codebase = codebases[result["codebase_id"]]
                 writer.writerow(
                     {
                         "url": codebase.permanent_url,
-                        "count": result["count"],
+                        "count": result["total"],
                         "title": codebase.title,
                     }
                 )
@@ -237,21 +240,29 @@ class Command(BaseCommand):
         aggregations = options["aggregations"].split(",")
         if to_date:
             filters = dict(date_created__range=[from_date, to_date])
+            # daily rollups, to_date is exclusive as the raw range ends at midnight
+            count_filters = dict(date__gte=from_date, date__lt=to_date)
         else:
             filters = dict(date_created__gte=from_date)
+            count_filters = dict(date__gte=from_date)
             to_date = default_to_date
 
         os.makedirs(directory, exist_ok=True)
         downloads = CodebaseReleaseDownload.objects.filter(
             release__in=CodebaseRelease.objects.public()
         ).filter(**filters)
+        download_counts = CodebaseReleaseDownloadCount.objects.filter(
+            release__in=CodebaseRelease.objects.public()
+        ).filter(**count_filters)
         if "codebase" in aggregations:
             self.export_codebase_download_statistics(
-                downloads, dest=os.path.join(directory, "codebase_download_counts.csv")
+                download_counts,
+                dest=os.path.join(directory, "codebase_download_counts.csv"),
             )
         if "release" in aggregations:
             self.export_release_download_statistics(
-                downloads, dest=os.path.join(directory, "release_download_counts.csv")
+                download_counts,
+                dest=os.path.join(directory, "release_download_counts.csv"),
             )
         if "ip" in aggregations:
             self.export_ip_download_statistics(
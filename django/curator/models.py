@@ -3,19 +3,20 @@ import logging
 import os
 import re
 
-from collections import defaultdict
 from django.core.exceptions import FieldDoesNotExist
 from django.contrib.auth.models import User
 from django.contrib.postgres.aggregates import ArrayAgg
-from django.db import models, transaction
+from django.db import connection, models, transaction
 from django.urls import reverse
 from modelcluster import fields
-from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
 from taggit.models import Tag
 
 from library.models import ProgrammingLanguageTag, CodebaseReleasePlatformTag
+from .tag_clustering import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    CombinedMatcher,
+    TagClusteringEngine,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,22 +80,18 @@ class TagCuratorProxy(Tag):
 class TagCleanupQuerySet(models.QuerySet):
     @transaction.atomic
     def process(self):
-        migrator = TagMigrator()
         tag_cleanups = self.filter(transaction_id__isnull=True)
         tag_groupings = (
             tag_cleanups.values("old_name")
             .annotate(new_names=ArrayAgg("new_name"))
             .order_by("old_name")
         )
-        for tag_grouping in tag_groupings:
-            logger.debug(
-                "tag cleanup: %s => %s",
-                tag_grouping["old_name"],
-                tag_grouping["new_names"],
-            )
-            migrator.migrate(
-                old_name=tag_grouping["old_name"], new_names=tag_grouping["new_names"]
-            )
+        TagMigrator().migrate_all(
+            {
+                tag_grouping["old_name"]: tag_grouping["new_names"]
+                for tag_grouping in tag_groupings
+            }
+        )
         tct = TagCleanupTransaction.objects.create()
         tag_cleanups.update(transaction=tct)
 
@@ -163,6 +160,8 @@ PLATFORM_AND_LANGUAGE_MATCHERS = [
     Matcher("VBA", pl_regex("vba")),
 ]
 
+PLATFORM_AND_LANGUAGE_MATCHER = CombinedMatcher(PLATFORM_AND_LANGUAGE_MATCHERS)
+
 VERSION_NUMBER_MATCHER = re.compile(
     r"^(?:[\d.x_()\s>=<\\/^]|version|update|build|or|higher|beta|alpha|rc)+$"
 )
@@ -188,59 +187,57 @@ class TagCleanup(models.Model):
         return f"id={self.id} new_name={self.new_name}, old_name={self.old_name}"
 
     @classmethod
-    def find_groups_by_porter_stemmer(cls):
-        ps = PorterStemmer()
-        names = [
-            (
-                tag,
-                frozenset(
-                    ps.stem(token)
-                    for token in word_tokenize(tag)
-                    if token not in stopwords.words("english")
-                ),
-            )
-            for tag in Tag.objects.order_by("name").values_list("name", flat=True)
-        ]
-
-        groups = defaultdict(lambda: [])
-        for tag in names:
-            groups[tag[1]].append(tag[0])
-
+    def from_groups(cls, groups):
+        """
+        :return: TagCleanups renaming every name in each group to its shortest (then
+        alphabetically first) name
+        """
         tag_cleanups = []
-        for k, old_names in groups.items():
-            if len(old_names) > 1:
-                min_name_len = min(len(name) for name in old_names)
-                smallest_names = sorted(
-                    name for name in old_names if len(name) == min_name_len
-                )
-                new_name = smallest_names[0]
-                old_names.remove(new_name)
-                for old_name in old_names:
+        for old_names in groups:
+            new_name = min(old_names, key=lambda name: (len(name), name))
+            for old_name in old_names:
+                if old_name != new_name:
                     tag_cleanups.append(
                         TagCleanup(new_name=new_name, old_name=old_name)
                     )
-
         return tag_cleanups
 
     @classmethod
-    def find_groups_by_platform_and_language(cls):
+    def find_groups_by_porter_stemmer(cls, engine=None):
+        engine = engine or TagClusteringEngine()
+        with engine.timed("load tags"):
+            names = list(Tag.objects.order_by("name").values_list("name", flat=True))
+        return cls.from_groups(engine.group_by_stem(names))
+
+    @classmethod
+    def find_groups_by_similarity(
+        cls, threshold=DEFAULT_SIMILARITY_THRESHOLD, engine=None
+    ):
+        engine = engine or TagClusteringEngine()
+        with engine.timed("load tags"):
+            names = list(Tag.objects.order_by("name").values_list("name", flat=True))
+        return cls.from_groups(engine.cluster_similar(names, threshold=threshold))
+
+    @classmethod
+    def find_groups_by_platform_and_language(cls, engine=None):
+        engine = engine or TagClusteringEngine()
+        with engine.timed("load tags"):
+            names = list(
+                TagCuratorProxy.objects.programming_language_tags()
+                .union(TagCuratorProxy.objects.platforms())
+                .order_by("name")
+                .values_list("name", flat=True)
+            )
         tag_cleanups = []
-        for tag in (
-            TagCuratorProxy.objects.programming_languages()
-            .union(TagCuratorProxy.objects.platforms())
-            .order_by("name")
-            .iterator()
-        ):
-            new_names = []
-            for matcher in PLATFORM_AND_LANGUAGE_MATCHERS:
-                match = matcher.regex.search(tag.name)
-                if match and tag.name != matcher.name:
-                    new_names.append(matcher.name)
+        for name, matched_names in engine.match_all(
+            PLATFORM_AND_LANGUAGE_MATCHER, names
+        ).items():
+            new_names = [new_name for new_name in matched_names if new_name != name]
             if not new_names:
-                if not VERSION_NUMBER_MATCHER.search(tag.name):
+                if not VERSION_NUMBER_MATCHER.search(name):
                     continue
             for new_name in new_names:
-                tag_cleanups.append(TagCleanup(new_name=new_name, old_name=tag.name))
+                tag_cleanups.append(TagCleanup(new_name=new_name, old_name=name))
         return tag_cleanups
 
     def to_dict(self):
@@ -265,41 +262,130 @@ class TagCleanup(models.Model):
 
 
 class TagMigrator:
+    """
+    Set based tag migration: all new tags are created with a single bulk insert and every through
+    table is rewritten with one INSERT ... SELECT joined against a temporary old tag -> new tag
+    mapping table, followed by a single delete of the old tags.
+    """
+
+    MAPPING_TABLE = "curator_tag_migration_mapping"
+
     def __init__(self):
         self.through_models = get_through_tables()
 
+    @staticmethod
+    def resolve_mapping(mapping):
+        """
+        :param mapping: dict of old tag name -> iterable of new tag names, an empty new name
+        deletes the old tag
+        :return: dict of old tag name -> set of final new tag names, following chains of
+        renames (a -> b, b -> c becomes a -> c, b -> c). Raises ValueError on rename cycles
+        """
+        mapping = {
+            old_name: set(new_names).difference({old_name, ""})
+            for old_name, new_names in mapping.items()
+        }
+
+        def resolve(name, seen):
+            if name in seen:
+                raise ValueError(f"tag cleanups rename {name} in a cycle")
+            if name not in mapping:
+                return {name}
+            seen = seen | {name}
+            return set().union(*(resolve(new_name, seen) for new_name in mapping[name]))
+
+        return {
+            old_name: set().union(
+                *(resolve(new_name, {old_name}) for new_name in new_names)
+            )
+            for old_name, new_names in mapping.items()
+        }
+
     @classmethod
     def create_new_tags(cls, new_names):
-        nonexisting_new_names = new_names.difference(
-            Tag.objects.filter(name__in=new_names).values_list("name", flat=True)
+        nonexisting_new_names = sorted(
+            set(new_names).difference(
+                Tag.objects.filter(name__in=new_names).values_list("name", flat=True)
+            )
         )
-        # Generating a unique slug without appending unique a id requires adding tags one by one
+        if not nonexisting_new_names:
+            return
+        # assign unique slugs the same way Tag.save() does (slug, slug_1, slug_2, ...) without
+        # saving tags one by one
+        taken_slugs = set(Tag.objects.values_list("slug", flat=True))
+        tags = []
         for name in nonexisting_new_names:
             tag = Tag(name=name)
-            tag.save()
+            slug = tag.slugify(name)
+            i = 0
+            while slug in taken_slugs:
+                i += 1
+                slug = tag.slugify(name, i)
+            taken_slugs.add(slug)
+            tag.slug = slug
+            tags.append(tag)
+        Tag.objects.bulk_create(tags)
+
+    def copy_through_model_refs(self, cursor, model):
+        """
+        add the new tags to every object tagged with an old tag, skipping objects that already
+        have the new tag
+        """
+        quote_name = connection.ops.quote_name
+        table = quote_name(model._meta.db_table)
+        tag_column = quote_name(model._meta.get_field("tag").column)
+        object_column = quote_name(model._meta.get_field("content_object").column)
+        cursor.execute(f"""
+            INSERT INTO {table} ({tag_column}, {object_column})
+            SELECT DISTINCT m.new_tag_id, t.{object_column}
+            FROM {table} t
+            JOIN {self.MAPPING_TABLE} m ON m.old_tag_id = t.{tag_column}
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {table} e
+                WHERE e.{tag_column} = m.new_tag_id
+                AND e.{object_column} = t.{object_column}
+            )
+            """)
+        logger.debug("copied %s tag references in %s", cursor.rowcount, table)
 
-    @staticmethod
-    def copy_through_model_refs(model, new_tags, old_tag):
-        pks = list(
-            model.objects.filter(tag=old_tag).values_list("content_object", flat=True)
+    @transaction.atomic
+    def migrate_all(self, mapping):
+        mapping = self.resolve_mapping(mapping)
+        all_new_names = set().union(*mapping.values())
+        self.create_new_tags(all_new_names)
+        tag_ids = dict(
+            Tag.objects.filter(name__in=all_new_names.union(mapping)).values_list(
+                "name", "id"
+            )
         )
-        through_instances = []
-        for pk in pks:
-            for new_tag in new_tags:
-                through_instances.append(model(tag=new_tag, content_object_id=pk))
-        model.objects.bulk_create(through_instances)
+        old_tag_ids, new_tag_ids = [], []
+        for old_name, new_names in mapping.items():
+            logger.info("Mapping %s -> %s", old_name, new_names)
+            if old_name not in tag_ids:
+                continue
+            for new_name in new_names:
+                old_tag_ids.append(tag_ids[old_name])
+                new_tag_ids.append(tag_ids[new_name])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {self.MAPPING_TABLE} "
+                "(old_tag_id integer NOT NULL, new_tag_id integer NOT NULL)"
+            )
+            cursor.execute(
+                f"INSERT INTO {self.MAPPING_TABLE} (old_tag_id, new_tag_id) "
+                "SELECT * FROM unnest(%s::integer[], %s::integer[])",
+                [old_tag_ids, new_tag_ids],
+            )
+            cursor.execute(f"ANALYZE {self.MAPPING_TABLE}")
+            for model in self.through_models:
+                self.copy_through_model_refs(cursor, model)
+            cursor.execute(f"DROP TABLE {self.MAPPING_TABLE}")
+        Tag.objects.filter(
+            id__in=[tag_ids[name] for name in mapping if name in tag_ids]
+        ).delete()
 
     def migrate(self, new_names, old_name):
-        through_models = self.through_models
-        new_names = set(new_names).difference(old_name).difference({""})
-        self.create_new_tags(new_names)
-        new_tags = Tag.objects.filter(name__in=new_names).order_by("name")
-        old_tag = Tag.objects.filter(name=old_name).first()
-        logger.info("Mapping %s -> %s", old_name, new_names)
-        if old_tag is not None:
-            for model in through_models:
-                self.copy_through_model_refs(model, new_tags=new_tags, old_tag=old_tag)
-            old_tag.delete()
+        self.migrate_all({old_name: new_names})
 
 
 class TagCluster(models.Model):
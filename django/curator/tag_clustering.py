@@ -0,0 +1,179 @@
+"""
+Tag clustering engine used by the curator TagCleanup finders
+
+Tag names are tokenized, stopword filtered and stemmed once per distinct token, the platform and
+programming language matchers run as a single compiled regex and similar tag names are
+found by scoring only the candidate pairs that share character n-grams in an inverted index
+instead of comparing every pair of tags. Each stage is timed so that clustering the full tag
+table can be profiled, see `curator_clean_tags --timings`.
+"""
+
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from nltk.corpus import stopwords
+from nltk.stem import PorterStemmer
+from nltk.tokenize import word_tokenize
+
+NGRAM_SIZE = 3
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+# n-grams shared by more than this fraction of all tags are too common to block on
+MAX_BLOCK_FRACTION = 0.05
+MIN_MAX_BLOCK_SIZE = 50
+
+NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=1)
+def get_stopwords():
+    return frozenset(stopwords.words("english"))
+
+
+def normalize(name):
+    return NON_ALPHANUMERIC.sub(" ", name.lower()).strip()
+
+
+def get_ngrams(name, n=NGRAM_SIZE):
+    padded = f" {name} "
+    if len(padded) <= n:
+        return frozenset([padded])
+    return frozenset(padded[i : i + n] for i in range(len(padded) - n + 1))
+
+
+class CombinedMatcher:
+    """
+    Runs a list of named regex matchers as one compiled regex. Each matcher becomes a named
+    group inside an optional lookahead so that every matcher is tried at every position of the
+    text, like calling search() on each matcher, even where matches overlap. A single finditer
+    pass reports every matcher that matched, in the order of the original matcher list. All
+    matchers must share the same flags.
+    """
+
+    def __init__(self, matchers):
+        self.names = [matcher.name for matcher in matchers]
+        flags = {matcher.regex.flags for matcher in matchers}
+        if len(flags) != 1:
+            raise ValueError("combined matchers must share the same regex flags")
+        # an alternation would only report one (non-overlapping) matcher per position
+        self.regex = re.compile(
+            "".join(
+                f"(?:(?=(?P<m{index}>{matcher.regex.pattern})))?"
+                for index, matcher in enumerate(matchers)
+            ),
+            flags=flags.pop(),
+        )
+
+    def match(self, text):
+        indices = set()
+        for match in self.regex.finditer(text):
+            indices.update(
+                int(group_name[1:])
+                for group_name, group in match.groupdict().items()
+                if group is not None
+            )
+        return [self.names[index] for index in sorted(indices)]
+
+
+class TagClusteringEngine:
+    def __init__(self):
+        self.stemmer = PorterStemmer()
+        self.stem = lru_cache(maxsize=None)(self.stemmer.stem)
+        self.timings = {}
+
+    @contextmanager
+    def timed(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0) + (
+                time.perf_counter() - start
+            )
+
+    def report_timings(self):
+        return "\n".join(
+            f"{stage}: {seconds:.3f}s" for stage, seconds in self.timings.items()
+        )
+
+    def stem_key(self, name):
+        words = get_stopwords()
+        return frozenset(
+            self.stem(token) for token in word_tokenize(name) if token not in words
+        )
+
+    def group_by_stem(self, names):
+        """
+        :return: list of groups (lists of names, in input order) with more than one name that
+        share the same set of stemmed, non stopword tokens
+        """
+        with self.timed("stem keys"):
+            groups = defaultdict(list)
+            for name in names:
+                groups[self.stem_key(name)].append(name)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def match_all(self, matcher: CombinedMatcher, names):
+        """
+        :return: dict of name -> list of matcher names that match it
+        """
+        with self.timed("matchers"):
+            return {name: matcher.match(name) for name in names}
+
+    def candidate_pairs(self, grams):
+        """
+        block on shared n-grams: yields (i, j, shared n-gram count) for i < j only for pairs that
+        share at least one n-gram that is not too common to be informative
+        """
+        index = defaultdict(list)
+        for i, name_grams in enumerate(grams):
+            for gram in name_grams:
+                index[gram].append(i)
+        max_block_size = max(MIN_MAX_BLOCK_SIZE, int(len(grams) * MAX_BLOCK_FRACTION))
+        for i, name_grams in enumerate(grams):
+            shared = Counter()
+            for gram in name_grams:
+                block = index[gram]
+                if len(block) <= max_block_size:
+                    shared.update(j for j in block if j > i)
+            for j, count in shared.items():
+                yield i, j, count
+
+    def similar_pairs(self, names, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        """
+        :return: list of (name, other name, jaccard similarity of their n-grams) for all pairs
+        with a similarity of at least threshold
+        """
+        with self.timed("ngrams"):
+            grams = [get_ngrams(normalize(name)) for name in names]
+        with self.timed("scoring"):
+            pairs = []
+            for i, j, shared in self.candidate_pairs(grams):
+                score = shared / (len(grams[i]) + len(grams[j]) - shared)
+                if score >= threshold:
+                    pairs.append((names[i], names[j], score))
+        return pairs
+
+    def cluster_similar(self, names, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        """
+        :return: list of clusters (sorted lists of names) of transitively similar names
+        """
+        names = list(names)
+        parents = {name: name for name in names}
+
+        def find(name):
+            while parents[name] != name:
+                parents[name] = parents[parents[name]]
+                name = parents[name]
+            return name
+
+        pairs = self.similar_pairs(names, threshold=threshold)
+        with self.timed("clustering"):
+            for name, other, _ in pairs:
+                parents[find(name)] = find(other)
+            clusters = defaultdict(list)
+            for name in names:
+                clusters[find(name)].append(name)
+        return [sorted(c) for c in clusters.values() if len(c) > 1]
@@ -3,7 +3,7 @@ from taggit.models import Tag
 
 from core.models import Event, Job
 from core.tests.base import UserFactory
-from curator.models import TagCleanup
+from curator.models import TagCleanup, TagMigrator
 from core.tests.base import EventFactory, JobFactory
 from library.models import Codebase
 from library.tests.base import CodebaseFactory
@@ -58,3 +58,32 @@ class TagCleanupTestCase(TestCase):
         self.check_tag_name_presence(Event, new_names)
         self.check_tag_name_presence(Job, new_names)
         self.check_tag_name_presence(Codebase, new_names)
+
+    def test_set_based_migration(self):
+        Tag.objects.create(name="Agent Based Modeling", slug="agent-based-modeling")
+        old_tags = [Tag.objects.create(name=name) for name in ("abm", "ABM")]
+        self.add_tags(old_tags)
+        for old_tag in old_tags:
+            TagCleanup.objects.create(
+                new_name="agent based modeling", old_name=old_tag.name
+            )
+        TagCleanup.objects.process()
+        new_tag = Tag.objects.get(name="agent based modeling")
+        self.assertEqual(new_tag.slug, "agent-based-modeling_1")
+        self.assertFalse(Tag.objects.filter(name__in=["abm", "ABM"]).exists())
+        for model in (Event, Job, Codebase):
+            # both old tags map to the same new tag, it is only added once
+            self.assertEqual(model.tags.through.objects.filter(tag=new_tag).count(), 1)
+        self.assertFalse(TagCleanup.objects.filter(transaction__isnull=True).exists())
+
+    def test_resolve_mapping(self):
+        self.assertEqual(
+            TagMigrator.resolve_mapping(
+                {"abm": ["agent based", "abm"], "agent based": ["agent-based", ""]}
+            ),
+            {"abm": {"agent-based"}, "agent based": {"agent-based"}},
+        )
+        with self.assertRaises(ValueError):
+            TagMigrator.resolve_mapping(
+                {"abm": ["agent based"], "agent based": ["abm"]}
+            )
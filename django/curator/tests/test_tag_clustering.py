@@ -0,0 +1,77 @@
+from django.test import TestCase
+from taggit.models import Tag
+
+from curator.models import (
+    PLATFORM_AND_LANGUAGE_MATCHER,
+    PLATFORM_AND_LANGUAGE_MATCHERS,
+    TagCleanup,
+)
+from curator.tag_clustering import TagClusteringEngine
+
+TAG_NAMES = [
+    "agent based model",
+    "agent-based models",
+    "Agent Based Modeling",
+    "netlogo 6.0.4",
+    "NetLogo",
+    "python",
+    "python 3",
+    "Python3",
+    "c++ and java",
+    "objective-c",
+    "r",
+    "repast simphony",
+    "gama platform",
+    "land use",
+    "land-use change",
+    "ecology",
+]
+
+
+class TagClusteringEngineTestCase(TestCase):
+    def setUp(self):
+        self.engine = TagClusteringEngine()
+
+    def test_combined_matcher_matches_serial_matchers(self):
+        # matches of different matchers may overlap, e.g. the version suffix of jason1.2.3
+        # consumes the start of cormas
+        overlapping_names = [
+            "jason1.2.3-cormas",
+            "objective-c1.2.3-java,",
+            "relogo netlogo logo",
+            "matlab, r and python",
+        ]
+        for name in TAG_NAMES + overlapping_names:
+            expected = [
+                matcher.name
+                for matcher in PLATFORM_AND_LANGUAGE_MATCHERS
+                if matcher.regex.search(name)
+            ]
+            self.assertEqual(PLATFORM_AND_LANGUAGE_MATCHER.match(name), expected, name)
+        self.assertEqual(
+            PLATFORM_AND_LANGUAGE_MATCHER.match("jason1.2.3-cormas"),
+            ["Cormas", "Jason"],
+        )
+
+    def test_group_by_stem(self):
+        groups = self.engine.group_by_stem(TAG_NAMES)
+        self.assertIn(["agent based model", "Agent Based Modeling"], groups)
+        self.assertIn("stem keys", self.engine.timings)
+
+    def test_cluster_similar(self):
+        clusters = self.engine.cluster_similar(TAG_NAMES, threshold=0.7)
+        self.assertIn(
+            ["Agent Based Modeling", "agent based model", "agent-based models"],
+            clusters,
+        )
+        self.assertIn(["python", "python 3"], clusters)
+        self.assertFalse(any("ecology" in cluster for cluster in clusters))
+        self.assertEqual(set(self.engine.timings), {"ngrams", "scoring", "clustering"})
+
+    def test_find_groups_by_similarity(self):
+        Tag.objects.bulk_create(Tag(name=name, slug=name) for name in TAG_NAMES)
+        tag_cleanups = TagCleanup.find_groups_by_similarity(threshold=0.7)
+        self.assertIn(
+            ("python", "python 3"),
+            {(tc.new_name, tc.old_name) for tc in tag_cleanups},
+        )
@@ -1,28 +1,39 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
 from django.conf import settings
+from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.syndication.views import Feed
 from django.core.cache import cache
-from django.http import JsonResponse
+from django.db.models import IntegerField, Value
+from django.http import HttpResponse, JsonResponse
 from django.urls import path
+from django.utils.cache import get_conditional_response
 from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date, parse_http_date, quote_etag
 from django.views import View
-from itertools import chain
-from operator import attrgetter
 
 from library.models import CodebaseRelease
 from core.discourse import build_discourse_url, get_categories, get_latest_posts
 from core.models import Event, Job
 
+import hashlib
 import logging
 import re
 import requests
 import sys
+import time
 
 DEFAULT_HOMEPAGE_FEED_MAX_ITEMS = settings.DEFAULT_HOMEPAGE_FEED_MAX_ITEMS
 DEFAULT_CACHE_TIMEOUT = 3600  # 1 hour cache timeout
+# bump when the cached feed entry format changes so that old entries are ignored
+FEED_CACHE_VERSION = 2
+# cached feed items are served (stale) for this long past their cache timeout while a refresh
+# runs in the background
+FEED_STALE_TIMEOUT = 60 * 60 * 24 * 7
+FEED_REFRESH_LOCK_TIMEOUT = 60 * 5
 
 logger = logging.getLogger(__name__)
 
@@ -70,11 +81,91 @@ invalid_character_ranges = [
 XML_INVALID_CHARACTER_REGEX = re.compile(f"[{''.join(invalid_character_ranges)}]")
 
 SINGLE_FEED_MAX_ITEMS = settings.DEFAULT_FEED_MAX_ITEMS
+SITE_NEWS_FEED_MAX_ITEMS = 30
+# rendered syndication feeds are rebuilt after any feed content changes or at most this often
+SYNDICATION_FEED_CACHE_TIMEOUT = 60 * 30
+SYNDICATION_FEED_VERSION_KEY = "feeds.syndication.version"
+
+
+def get_syndication_feed_version():
+    return cache.get_or_set(SYNDICATION_FEED_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_syndication_feeds():
+    try:
+        cache.incr(SYNDICATION_FEED_VERSION_KEY)
+    except ValueError:
+        # key is missing, there is nothing cached under the current version
+        pass
+
+
+def merge_latest_for_feed(*querysets, number=None):
+    """
+    merge querysets over different models into a single list ordered by date_created, newest
+    first. The merge and limit run in the database over (queryset index, pk, date_created) rows
+    and only the selected objects are loaded, keeping each queryset's select_related and
+    annotations. The querysets must not be sliced.
+    """
+    keys = [
+        qs.order_by().values_list(
+            Value(index, output_field=IntegerField()), "pk", "date_created"
+        )
+        for index, qs in enumerate(querysets)
+    ]
+    merged = keys[0].union(*keys[1:], all=True).order_by("-date_created")
+    if number is not None:
+        merged = merged[:number]
+    rows = list(merged)
+    pks = defaultdict(list)
+    for index, pk, _ in rows:
+        pks[index].append(pk)
+    objects = {index: querysets[index].in_bulk(pks[index]) for index in pks}
+    # skip objects deleted between the two queries
+    return [objects[index][pk] for index, pk, _ in rows if pk in objects.get(index, {})]
 
 
 class ComsesFeed(Feed):
+    """
+    Syndication feed rendered once per content change and served from the cache with ETag and
+    Last-Modified headers so that pollers get 304 Not Modified responses
+    """
+
     feed_type = Rss201rev2Feed
 
+    def get_cache_key(self, request):
+        # rendered links depend on the site domain and request scheme
+        return (
+            f"feeds.syndication.{get_syndication_feed_version()}."
+            f"{self.__class__.__name__}.{request.scheme}.{get_current_site(request).domain}"
+        )
+
+    def render(self, request, *args, **kwargs):
+        response = super().__call__(request, *args, **kwargs)
+        last_modified = response.get("Last-Modified")
+        return {
+            "content": response.content,
+            "content_type": response["Content-Type"],
+            "etag": quote_etag(hashlib.sha256(response.content).hexdigest()),
+            "last_modified": parse_http_date(last_modified) if last_modified else None,
+        }
+
+    def __call__(self, request, *args, **kwargs):
+        cache_key = self.get_cache_key(request)
+        feed = cache.get(cache_key)
+        if feed is None:
+            feed = self.render(request, *args, **kwargs)
+            cache.set(cache_key, feed, SYNDICATION_FEED_CACHE_TIMEOUT)
+        response = HttpResponse(feed["content"], content_type=feed["content_type"])
+        response["ETag"] = feed["etag"]
+        if feed["last_modified"] is not None:
+            response["Last-Modified"] = http_date(feed["last_modified"])
+        return get_conditional_response(
+            request,
+            etag=feed["etag"],
+            last_modified=feed["last_modified"],
+            response=response,
+        )
+
     def item_title(self, item):
         return XML_INVALID_CHARACTER_REGEX.sub("", item.title)
 
@@ -109,11 +200,10 @@ class AllFeed(ComsesFeed):
     feed_url = "/feeds/all/"
 
     def items(self):
-        releases = CodebaseRelease.objects.latest_for_feed(include_all=True)
-        jobs = Job.objects.live()
-        events = Event.objects.live()
-        return sorted(
-            chain(releases, jobs, events), key=attrgetter("date_created"), reverse=True
+        return merge_latest_for_feed(
+            CodebaseRelease.objects.latest_for_feed(include_all=True),
+            Job.objects.live().select_related("submitter__member_profile"),
+            Event.objects.live().select_related("submitter__member_profile"),
         )
 
     def item_author_name(self, item):
@@ -127,11 +217,11 @@ class RssSiteNewsFeed(ComsesFeed):
     feed_url = "/feeds/rss/"
 
     def items(self):
-        releases = CodebaseRelease.objects.latest_for_feed()
-        jobs = Job.objects.latest_for_feed()
-        events = Event.objects.latest_for_feed()
-        return sorted(
-            chain(releases, jobs, events), key=attrgetter("date_created"), reverse=True
+        return merge_latest_for_feed(
+            CodebaseRelease.objects.latest_for_feed(include_all=True),
+            Job.objects.latest_for_feed(include_all=True),
+            Event.objects.latest_for_feed(include_all=True),
+            number=SITE_NEWS_FEED_MAX_ITEMS,
         )
 
 
@@ -201,9 +291,21 @@ class FeedItem:
 
 
 class AbstractFeed(ABC):
+    """
+    Landing page feed served stale-while-revalidate from the cache.
+
+    Cache entries hold serialized FeedItem dicts and the time they were refreshed. Entries older
+    than cache_timeout are still served while a single background refresh (guarded by a cache
+    lock) fetches new items, and home.tasks.refresh_home_feeds keeps the default feeds warm so
+    that page loads do not wait on external sources.
+    """
+
     max_number_of_items = DEFAULT_HOMEPAGE_FEED_MAX_ITEMS
     _cache_key = None  # subclasses can define a custom cache key if needed
     rate_limited = False  # set to True if the feed is rate limited to cache in dev mode
+    # set to True if the feed source is an external service that should never be called
+    # in the request path
+    is_external = False
     cache_timeout = DEFAULT_CACHE_TIMEOUT
 
     def __init__(self, max_items=None):
@@ -211,9 +313,10 @@ class AbstractFeed(ABC):
             self.max_number_of_items = max_items
 
     def get_feed_data(self):
+        entry = self.get_cache_entry()
         return {
-            "items": self.get_feed_items(),
-            "last_updated": datetime.now().isoformat(),
+            "items": entry["items"],
+            "last_updated": datetime.fromtimestamp(entry["refreshed_at"]).isoformat(),
         }
 
     def items(self):
@@ -234,25 +337,69 @@ class AbstractFeed(ABC):
         if self._cache_key is None:
             logger.debug("using default cache key for %s", self.__class__.__name__)
             self._cache_key = f"cache_{self.__class__.__name__}"
-        return f"{self._cache_key}_{self.max_number_of_items}"
+        return f"{self._cache_key}_{self.max_number_of_items}.v{FEED_CACHE_VERSION}"
 
-    def get_feed_items(self):
-        # check for cached data first (skip in dev mode)
-        source_feed_data = (
-            None
-            if (settings.DEBUG and not self.rate_limited)
-            else cache.get(self.cache_key)
-        )
-        if not source_feed_data:
-            source_feed_data = self._get_feed_source_data()
-            if not source_feed_data:
-                # feed source may be down, do not cache
+    @property
+    def refresh_lock_key(self):
+        return f"{self.cache_key}.refresh_lock"
+
+    @property
+    def use_cache(self):
+        # skip the cache in dev mode unless the source is rate limited
+        return not (settings.DEBUG and not self.rate_limited)
+
+    def fetch_feed_items(self) -> list[dict]:
+        return [
+            asdict(self.to_feed_item(item)) for item in self._get_feed_source_data()
+        ]
+
+    def refresh(self, force=False):
+        """
+        fetch the feed items from the source and cache them. Only one refresh runs at a time,
+        returns the cached entry or None if another refresh holds the lock or the source returned
+        no items (the feed source may be down, keep serving the previous entry)
+        """
+        if not cache.add(self.refresh_lock_key, True, FEED_REFRESH_LOCK_TIMEOUT):
+            logger.debug("feed refresh already in progress [%s]", self.cache_key)
+            return None
+        try:
+            if not force and not self.is_stale(cache.get(self.cache_key)):
+                return None
+            items = self.fetch_feed_items()
+            if not items:
                 logger.warning("No feed data found [%s]", self.cache_key)
-                return []
-            if not (settings.DEBUG and not self.rate_limited):
-                cache.set(self.cache_key, source_feed_data, self.cache_timeout)
+                return None
+            entry = {"items": items, "refreshed_at": time.time()}
+            cache.set(self.cache_key, entry, self.cache_timeout + FEED_STALE_TIMEOUT)
+            return entry
+        finally:
+            cache.delete(self.refresh_lock_key)
+
+    def is_stale(self, entry) -> bool:
+        return entry is None or time.time() - entry["refreshed_at"] > self.cache_timeout
+
+    def schedule_refresh(self):
+        from .tasks import refresh_feed
+
+        # avoid enqueueing a refresh per request while one is already running
+        if cache.get(self.refresh_lock_key) is None:
+            refresh_feed(self.__class__.__name__, self.max_number_of_items)
+
+    def get_cache_entry(self) -> dict:
+        if not self.use_cache:
+            return {"items": self.fetch_feed_items(), "refreshed_at": time.time()}
+        entry = cache.get(self.cache_key)
+        if entry is None and not self.is_external:
+            # cold cache for a local (database) feed, cheap enough to fill in the request
+            entry = self.refresh(force=True)
+        elif self.is_stale(entry):
+            self.schedule_refresh()
+        if entry is None:
+            return {"items": [], "refreshed_at": time.time()}
+        return entry
 
-        return [asdict(self.to_feed_item(item)) for item in source_feed_data]
+    def get_feed_items(self):
+        return self.get_cache_entry()["items"]
 
 
 class ReviewedModelFeed(AbstractFeed):
@@ -301,6 +448,10 @@ class ForumFeed(AbstractFeed):
         super().__init__(max_items=max_items)
         self.mock = mock
 
+    @property
+    def is_external(self):
+        return not self.mock
+
     def _get_feed_source_data(self):
         if self.mock:
             logger.info("Using mock data for forum feed")
@@ -350,6 +501,7 @@ class JobFeed(AbstractFeed):
 
 class YouTubeFeed(AbstractFeed):
     rate_limited = True
+    is_external = True
 
     def _get_feed_source_data(self):
         yt_api_url = f"{settings.YOUTUBE_API_URL}/search"
@@ -382,6 +534,30 @@ class YouTubeFeed(AbstractFeed):
         )
 
 
+# landing page feeds by class name, used to refresh feeds from background tasks
+HOMEPAGE_FEEDS = {
+    feed_class.__name__: feed_class
+    for feed_class in (
+        ReviewedModelFeed,
+        EventFeed,
+        ForumFeed,
+        ForumCategoryFeed,
+        JobFeed,
+        YouTubeFeed,
+    )
+}
+
+# (feed class, number of items) requested by each landing page feed, see home/index.jinja. The
+# limit is part of the feed cache key so these are the entries refresh_home_feeds keeps warm
+LANDING_PAGE_FEEDS = {
+    "reviewed_models": (ReviewedModelFeed, 3),
+    "forum_categories": (ForumCategoryFeed, 6),
+    "events": (EventFeed, 3),
+    "jobs": (JobFeed, 3),
+    "youtube": (YouTubeFeed, 4),
+}
+
+
 class BaseFeedView(View):
 
     feed_class = None
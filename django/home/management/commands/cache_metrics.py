@@ -8,26 +8,20 @@ logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = """generate metrics and cache in redis"""
+    help = """refresh materialized metrics and cache each series in redis. By default only the
+    current year and years touched by rows modified since the last refresh are recomputed"""
 
     def add_arguments(self, parser):
-        """
-        this uses argparse https://docs.python.org/3/library/argparse.html
         parser.add_argument(
-            "--full-member-only", "-u", action="store_true", dest="full_member_only"
+            "--full",
+            action="store_true",
+            dest="full",
+            default=False,
+            help="recompute every year of every metrics series",
         )
-        parser.add_argument(
-            "--after",
-            "-a",
-            action="store",
-            dest="after",
-            default=None,
-            help="yyyy-mm-dd date to filter users e.g., --after=2018-03-15",
-        )
-        """
-        pass
 
     def handle(self, *args, **options):
         metrics = Metrics()
-        logger.debug("caching all metrics")
-        metrics.cache_all()
+        full = options["full"]
+        logger.debug("caching all metrics (full=%s)", full)
+        metrics.cache_all(full=full)
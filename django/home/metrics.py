@@ -1,41 +1,336 @@
 import logging
 import pandas as pd
 from collections import defaultdict
-from django.db import connection
+from dataclasses import dataclass
+from django.db import connection, transaction
 from django.core.cache import cache
-from django.db.models import Count, F
+from django.db.models import Count, F, Min
+from django.utils import timezone
 
 from core.models import MemberProfile, ComsesGroups
 from library.models import CodebaseRelease, CodebaseReleaseDownload, Codebase
+from .models import MetricsAggregate
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class MetricsSeries:
+    """
+    Describes a single materialized metrics series (one chart on the metrics page)
+    """
+
+    key: str
+    title: str
+    y_label: str
+    # series sharing a group share a startYear, computed from the group's anchor series
+    group: str
+    # name of the single timeseries for uncategorized series
+    name: str = ""
+    categorized: bool = False
+    anchor: bool = False
+
+
 class Metrics:
-    REDIS_METRICS_KEY = "all_comses_metrics"
+    SERIES_CACHE_KEY_PREFIX = "comses_metrics"
+    LAST_REFRESHED_KEY = "comses_metrics_last_refreshed"
     DEFAULT_METRICS_CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
     MINIMUM_CATEGORY_COUNT = 10  # the threshold at which we group all other nominal values into an "other" category
+    INSTITUTION_DATA_KEY = "institutionData"
+    START_YEAR_KEY = "startYear"
+    # FIXME: temporary fix to combine netlogo and logo
+    CATEGORY_ALIASES = {"releasesByLanguage": {"Logo": "NetLogo"}}
+
+    SERIES = (
+        MetricsSeries(
+            "totalMembers",
+            "Total Members",
+            "# Members",
+            "members",
+            "Members",
+            anchor=True,
+        ),
+        MetricsSeries(
+            "fullMembers",
+            "Full Members",
+            "# Members",
+            "members",
+            "Full Members",
+            anchor=True,
+        ),
+        MetricsSeries(
+            "totalModels", "Total Models", "# Models", "models", "Models", anchor=True
+        ),
+        MetricsSeries(
+            "reviewedModels",
+            "Peer Reviewed Models",
+            "# Releases",
+            "models",
+            "Peer Reviewed Models",
+        ),
+        MetricsSeries(
+            "totalDownloads",
+            "Total Downloads",
+            "# Downloads",
+            "models",
+            "Model Downloads",
+        ),
+        MetricsSeries(
+            "releasesByOs", "Models by OS", "# Releases", "models", categorized=True
+        ),
+        MetricsSeries(
+            "releasesByPlatform",
+            "Models by Platform",
+            "# Releases",
+            "models",
+            categorized=True,
+        ),
+        MetricsSeries(
+            "releasesByLanguage",
+            "Models by Language",
+            "# Releases",
+            "models",
+            categorized=True,
+        ),
+        MetricsSeries(
+            "totalReleases",
+            "Total Releases",
+            "# Releases",
+            "releases",
+            "Releases",
+            anchor=True,
+        ),
+        MetricsSeries(
+            "reviewedReleases",
+            "Peer Reviewed Releases",
+            "# Releases",
+            "releases",
+            "Peer Reviewed releases",
+        ),
+    )
+
+    @classmethod
+    def get_cache_key(cls, key):
+        return f"{cls.SERIES_CACHE_KEY_PREFIX}:{key}"
+
+    @classmethod
+    def get_all_keys(cls):
+        return [cls.START_YEAR_KEY, cls.INSTITUTION_DATA_KEY] + [
+            series.key for series in cls.SERIES
+        ]
 
     def get_all_data(self, force=False):
-        data = cache.get(Metrics.REDIS_METRICS_KEY)
-        if not data or force:
-            return self.cache_all()
-        return data
+        """
+        Returns all metrics data, assembled from the individually cached series. Any
+        series missing from the cache is rendered from its materialized MetricsAggregate
+        rows, the underlying tables are only aggregated if nothing has been materialized yet
+        """
+        if force:
+            return self.cache_all(full=True)
+        keys = self.get_all_keys()
+        cached = cache.get_many([self.get_cache_key(key) for key in keys])
+        data = {
+            key: cached[self.get_cache_key(key)]
+            for key in keys
+            if self.get_cache_key(key) in cached
+        }
+        if len(data) == len(keys):
+            return data
+        if not MetricsAggregate.objects.exists():
+            return self.cache_all(full=True)
+        return self.cache_series_data()
 
-    def cache_all(self):
+    def cache_all(self, full=False):
         """
-        recompute and cache metrics data in redis
+        refresh the materialized metrics aggregates and cache each series in redis
+
+        only the current year and the years touched by rows modified since the last
+        refresh are recomputed unless full=True or there is no record of a prior refresh
         """
+        self.refresh(full=full)
+        return self.cache_series_data()
+
+    def cache_series_data(self):
         all_data = self.generate_metrics_data()
-        cache.set(
-            Metrics.REDIS_METRICS_KEY, all_data, Metrics.DEFAULT_METRICS_CACHE_TIMEOUT
+        cache.set_many(
+            {self.get_cache_key(key): value for key, value in all_data.items()},
+            Metrics.DEFAULT_METRICS_CACHE_TIMEOUT,
         )
         return all_data
 
+    def refresh(self, full=False):
+        now = timezone.now()
+        last_refreshed = None if full else cache.get(Metrics.LAST_REFRESHED_KEY)
+        for series in self.SERIES:
+            years = None
+            if last_refreshed is not None:
+                years = self.get_changed_years(series, last_refreshed) | {now.year}
+            logger.debug("refreshing metrics series %s for years %s", series.key, years)
+            self.materialize_series(series, years)
+        cache.set(
+            self.get_cache_key(Metrics.INSTITUTION_DATA_KEY),
+            self.get_member_affiliation_data(),
+            Metrics.DEFAULT_METRICS_CACHE_TIMEOUT,
+        )
+        cache.set(Metrics.LAST_REFRESHED_KEY, now, None)
+
+    def get_source_queryset(self, series):
+        """
+        Returns a (queryset, year field, modified field, category field) tuple describing
+        the source rows aggregated into the given series
+        """
+        sources = {
+            "totalMembers": lambda: (
+                MemberProfile.objects.public(),
+                "user__date_joined",
+                "user__date_joined",
+                None,
+            ),
+            "fullMembers": lambda: (
+                ComsesGroups.FULL_MEMBER.users(),
+                "date_joined",
+                "date_joined",
+                None,
+            ),
+            "totalModels": lambda: (
+                Codebase.objects.public(),
+                "first_published_at",
+                "last_modified",
+                None,
+            ),
+            "reviewedModels": lambda: (
+                Codebase.objects.public(peer_reviewed=True),
+                "first_published_at",
+                "last_modified",
+                None,
+            ),
+            "totalDownloads": lambda: (
+                CodebaseReleaseDownload.objects.all(),
+                "date_created",
+                "date_created",
+                None,
+            ),
+            "releasesByOs": lambda: (
+                CodebaseRelease.objects.public(),
+                "first_published_at",
+                "last_modified",
+                "os",
+            ),
+            "releasesByPlatform": lambda: (
+                CodebaseRelease.objects.public(),
+                "first_published_at",
+                "last_modified",
+                "platform_tags__name",
+            ),
+            "releasesByLanguage": lambda: (
+                CodebaseRelease.objects.public(),
+                "first_published_at",
+                "last_modified",
+                "programming_languages__name",
+            ),
+            "totalReleases": lambda: (
+                CodebaseRelease.objects.public(),
+                "first_published_at",
+                "last_modified",
+                None,
+            ),
+            "reviewedReleases": lambda: (
+                CodebaseRelease.objects.public(peer_reviewed=True),
+                "first_published_at",
+                "last_modified",
+                None,
+            ),
+        }
+        return sources[series.key]()
+
+    def get_changed_years(self, series, since):
+        """
+        Returns the set of year buckets touched by source rows modified after `since`
+
+        Platform tag and release language changes only touch through rows, library.signals
+        bumps the release's last_modified for these so they are detected here as well.
+
+        FIXME: rows that leave a series entirely (unpublished codebases, deactivated
+        users) are not detected, run cache_metrics --full periodically to pick these up
+        """
+        queryset, year_field, modified_field, _ = self.get_source_queryset(series)
+        return set(
+            queryset.filter(**{f"{modified_field}__gte": since})
+            .exclude(**{f"{year_field}__isnull": True})
+            .values_list(f"{year_field}__year", flat=True)
+            .distinct()
+        )
+
+    def aggregate_series(self, series, years=None):
+        """
+        Returns a list of {"category", "year", "total"} dicts for the given series, limited
+        to the given years if set
+        """
+        queryset, year_field, _, category_field = self.get_source_queryset(series)
+        if years is not None:
+            queryset = queryset.filter(**{f"{year_field}__year__in": years})
+        values = {"year": F(f"{year_field}__year")}
+        if category_field:
+            values["category"] = F(category_field)
+        counts = queryset.values(**values).annotate(total=Count("year")).order_by()
+        aliases = self.CATEGORY_ALIASES.get(series.key, {})
+        combined = defaultdict(int)
+        for row in counts:
+            if row["year"] is None:
+                continue
+            category = ""
+            if category_field:
+                category = row["category"]
+                # preserve previous behavior of labeling null categories as "None"
+                category = (
+                    "None" if category is None else aliases.get(category, category)
+                )
+            combined[(category, row["year"])] += row["total"]
+        return [
+            {"category": category, "year": year, "total": total}
+            for (category, year), total in combined.items()
+        ]
+
+    def materialize_series(self, series, years=None):
+        """
+        replace the MetricsAggregate rows for the given series and years (all years if None)
+        """
+        counts = self.aggregate_series(series, years)
+        with transaction.atomic():
+            stale = MetricsAggregate.objects.filter(series=series.key)
+            if years is not None:
+                stale = stale.filter(year__in=years)
+            stale.delete()
+            MetricsAggregate.objects.bulk_create(
+                [MetricsAggregate(series=series.key, **count) for count in counts]
+            )
+
+    def get_start_years(self):
+        """
+        Returns a dict of series group -> first year with data in any of the group's anchor series
+        """
+        anchors = defaultdict(list)
+        for series in self.SERIES:
+            if series.anchor:
+                anchors[series.group].append(series.key)
+        first_years = dict(
+            MetricsAggregate.objects.filter(
+                series__in=[key for keys in anchors.values() for key in keys]
+            )
+            .values_list("series")
+            .annotate(first_year=Min("year"))
+            .order_by()
+        )
+        return {
+            group: min(first_years[key] for key in keys if key in first_years)
+            for group, keys in anchors.items()
+            if any(key in first_years for key in keys)
+        }
+
     def generate_metrics_data(self):
         """
         Returns all metrics data in a format amenable to HighCharts / frontend
-        consumption.
+        consumption, rendered from the materialized MetricsAggregate rows.
         {
             totalMembers: {
                 "title": "Total Members",
@@ -58,210 +353,54 @@ class Metrics:
                 ...
                 ]
             },
-            releasesByPlatform : {
-                "title": "Models by Platform",
-                "yLabel": "# Releases",
-                "startYear": 2008,
-                "series": [
-                {
-                    name: "Ubuntu Mate",
-                    data: [40, 30, 30, 40, 40],
-                    start_year: 2008,
-                }, ...
-            ]},
+            ...
         }
         """
-        member_metrics, members_start_year = self.get_members_by_year_timeseries()
-        model_metrics, model_start_year = self.get_model_metrics_timeseries()
-        release_metrics, release_start_year = self.get_release_metrics_timeseries()
-        institution_metrics = self.get_member_affiliation_data()
-        min_start_year = min(members_start_year, model_start_year, release_start_year)
-        return dict(
-            startYear=min_start_year,
-            institutionData=institution_metrics,
-            **member_metrics,
-            **model_metrics,
-            **release_metrics,
-        )
-
-    def get_members_by_year_timeseries(self):
-        """
-        totalMembers: {
-            "title": "Total Members",
-            "yLabel": "# Members",
-            "startYear": 2008,
-            "series": [{
-                "name": "total members",
-                "data": [40, 30, 30, 40, 40],
-            }]
-        },
-        """
-        total_counts = list(
-            MemberProfile.objects.public()
-            .values(year=F("user__date_joined__year"))
-            .annotate(total=Count("year"))
-            .order_by("year")
-        )
-        full_member_counts = list(
-            ComsesGroups.FULL_MEMBER.users()
-            .values(year=F("date_joined__year"))
-            .annotate(total=Count("year"))
-            .order_by("year")
-        )
-        min_start_year = min(total_counts[0]["year"], full_member_counts[0]["year"])
-        member_metrics = {
-            "totalMembers": {
-                "title": "Total Members",
-                "yLabel": "# Members",
-                "startYear": min_start_year,
-                "series": [
-                    {
-                        "name": "Members",
-                        "data": self.to_timeseries(total_counts, min_start_year),
-                    }
-                ],
-            },
-            "fullMembers": {
-                "title": "Full Members",
-                "yLabel": "# Members",
-                "startYear": min_start_year,
-                "series": [
-                    {
-                        "name": "Full Members",
-                        "data": self.to_timeseries(full_member_counts, min_start_year),
-                    }
-                ],
-            },
+        start_years = self.get_start_years()
+        rows_by_series = defaultdict(list)
+        for row in MetricsAggregate.objects.order_by("year").values(
+            "series", "category", "year", "total"
+        ):
+            rows_by_series[row["series"]].append(row)
+        institution_data = cache.get(self.get_cache_key(Metrics.INSTITUTION_DATA_KEY))
+        if institution_data is None:
+            institution_data = self.get_member_affiliation_data()
+        data = {
+            Metrics.START_YEAR_KEY: min(start_years.values(), default=None),
+            Metrics.INSTITUTION_DATA_KEY: institution_data,
         }
-        return member_metrics, min_start_year
+        for series in self.SERIES:
+            start_year = start_years.get(series.group)
+            data[series.key] = {
+                "title": series.title,
+                "yLabel": series.y_label,
+                "startYear": start_year,
+                "series": self.to_series(
+                    series, rows_by_series[series.key], start_year
+                ),
+            }
+        return data
 
-    def get_model_metrics_timeseries(self):
+    def to_series(self, series, rows, start_year):
         """
-        model_by_os: {
-                "title": "Models by OS",
-                "yLabel": "# Models",
-                "startYear": 2008,
-                "series": [
-                {
-                    name: "Windows",
-                    data: [40, 30, 30, 40, 40, ...],
-                },
-                ...
-                ]
-            },
+        Converts materialized rows for a single series into a list of HighCharts series
         """
-        total_models_by_year = list(
-            Codebase.objects.public()
-            .values(year=F("first_published_at__year"))
-            .annotate(total=Count("year"))
-            .order_by("year")
-        )
-        reviewed_models_by_year = list(
-            Codebase.objects.public(peer_reviewed=True)
-            .values(year=F("first_published_at__year"))
-            .annotate(total=Count("year"))
-            .order_by("year")
-        )
-
-        release_downloads = list(
-            CodebaseReleaseDownload.objects.values(year=F("date_created__year"))
-            .annotate(total=Count("year"))
-            .order_by("year")
-        )
-        min_start_year = total_models_by_year[0]["year"]
-        model_metrics = {
-            "totalModels": {
-                "title": "Total Models",
-                "yLabel": "# Models",
-                "startYear": min_start_year,
-                "series": [
-                    {
-                        "name": "Models",
-                        "data": self.to_timeseries(
-                            total_models_by_year, min_start_year
-                        ),
-                    }
-                ],
-            },
-            "reviewedModels": {
-                "title": "Peer Reviewed Models",
-                "yLabel": "# Releases",
-                "startYear": min_start_year,
-                "series": [
-                    {
-                        "name": "Peer Reviewed Models",
-                        "data": self.to_timeseries(
-                            reviewed_models_by_year, min_start_year
-                        ),
-                    }
-                ],
-            },
-            "totalDownloads": {
-                "title": "Total Downloads",
-                "yLabel": "# Downloads",
-                "startYear": min_start_year,
-                "series": [
-                    {
-                        "name": "Model Downloads",
-                        "data": self.to_timeseries(release_downloads, min_start_year),
-                    }
-                ],
-            },
-            "releasesByOs": self.get_release_os_timeseries(min_start_year),
-            "releasesByPlatform": self.get_release_platform_timeseries(min_start_year),
-            "releasesByLanguage": self.get_release_programming_language_timeseries(
-                min_start_year
-            ),
-        }
-        return model_metrics, min_start_year
-
-    def get_release_metrics_timeseries(self):
-
-        total_releases_by_year = list(
-            CodebaseRelease.objects.public()
-            .values(year=F("first_published_at__year"))
-            .annotate(total=Count("year"))
-            .order_by("year")
-        )
-        reviewed_releases_by_year = list(
-            CodebaseRelease.objects.public(peer_reviewed=True)
-            .values(year=F("first_published_at__year"))
-            .annotate(total=Count("year"))
-            .order_by("year")
-        )
-
-        min_start_year = total_releases_by_year[0]["year"]
-
-        release_metrics = {
-            "totalReleases": {
-                "title": "Total Releases",
-                "yLabel": "# Releases",
-                "startYear": min_start_year,
-                "series": [
-                    {
-                        "name": "Releases",
-                        "data": self.to_timeseries(
-                            total_releases_by_year, min_start_year
-                        ),
-                    }
-                ],
-            },
-            "reviewedReleases": {
-                "title": "Peer Reviewed Releases",
-                "yLabel": "# Releases",
-                "startYear": min_start_year,
-                "series": [
+        if not rows:
+            return []
+        if series.categorized:
+            return self.convert_release_metrics_to_timeseries(
+                [
                     {
-                        "name": "Peer Reviewed releases",
-                        "data": self.to_timeseries(
-                            reviewed_releases_by_year, min_start_year
-                        ),
+                        "category": row["category"],
+                        "year": row["year"],
+                        "count": row["total"],
                     }
+                    for row in rows
                 ],
-            },
-        }
-
-        return release_metrics, min_start_year
+                start_year,
+                "category",
+            )
+        return [{"name": series.name, "data": self.to_timeseries(rows, start_year)}]
 
     def get_member_affiliation_data(self):
         sql_query = """
@@ -294,102 +433,6 @@ class Metrics:
 
         return institution_data
 
-    def get_release_os_timeseries(self, start_year):
-        """
-        Generate timeseries data for each possible release OS option
-
-        Platform independent, macos, linux, windows, other
-
-        releases_by_os: {
-            "title": "Models by OS",
-            "yLabel": "# Releases",
-            "startYear": 2008,
-            "series": [
-            {
-                name: "Windows",
-                data: [40, 30, 30, 40, 40, ...],
-            },
-            ...
-            ]
-        },
-        """
-        os_metrics = list(
-            CodebaseRelease.objects.public()
-            .values(operating_systems=F("os"), year=F("first_published_at__year"))
-            .annotate(count=Count("year"))
-            .order_by("year")
-        )
-
-        return {
-            "title": "Models by OS",
-            "yLabel": "# Releases",
-            "startYear": start_year,
-            "series": self.convert_release_metrics_to_timeseries(
-                os_metrics, start_year, "operating_systems"
-            ),
-        }
-
-    def get_release_platform_timeseries(self, start_year):
-        platform_metrics = list(
-            CodebaseRelease.objects.public()
-            .values(
-                platform=F("platform_tags__name"), year=F("first_published_at__year")
-            )
-            .annotate(count=Count("year"))
-            .order_by("year")
-        )
-        return {
-            "title": "Models by Platform",
-            "yLabel": "# Releases",
-            "startYear": start_year,
-            "series": self.convert_release_metrics_to_timeseries(
-                platform_metrics, start_year, "platform"
-            ),
-        }
-
-    def get_release_programming_language_timeseries(self, start_year):
-        programming_language_metrics = list(
-            CodebaseRelease.objects.public()
-            .values(
-                programming_language_names=F("programming_languages__name"),
-                year=F("first_published_at__year"),
-            )
-            .annotate(count=Count("year"))
-            .order_by("year")
-        )
-
-        # FIXME: temporary fix to combine netlogo and logo
-        combined_metrics = defaultdict(lambda: defaultdict(int))
-
-        for metric in programming_language_metrics:
-            language = metric["programming_language_names"]
-            if language in ["NetLogo", "Logo"]:
-                language = "NetLogo"
-
-            year = metric["year"]
-            combined_metrics[year][language] += metric["count"]
-
-        flattened_metrics = []
-
-        for year, languages in combined_metrics.items():
-            for language, count in languages.items():
-                flattened_metrics.append(
-                    {
-                        "programming_language_names": language,
-                        "year": year,
-                        "count": count,
-                    }
-                )
-
-        return {
-            "title": "Models by Language",
-            "yLabel": "# Releases",
-            "startYear": start_year,
-            "series": self.convert_release_metrics_to_timeseries(
-                flattened_metrics, start_year, "programming_language_names"
-            ),
-        }
-
     def to_timeseries(self, queryset_data, start_year):
         """
         incoming queryset_data is a list of dicts with keys 'year' and 'total'
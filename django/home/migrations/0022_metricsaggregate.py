@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-17 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0021_remove_landingpage_community_statement_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricsAggregate",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("series", models.CharField(max_length=64)),
+                (
+                    "category",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("last_modified", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["series", "year"], name="home_metrics_series_year_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("series", "category", "year"),
+                        name="unique_metrics_series_category_year",
+                    )
+                ],
+            },
+        ),
+    ]
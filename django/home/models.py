@@ -35,6 +35,7 @@ from core.models import MemberProfile, Platform, Event, Job
 from core.widgets import MarkdownTextarea
 
 from library.models import CodebaseRelease, Contributor
+from .feeds import LANDING_PAGE_FEEDS
 
 logger = logging.getLogger(__name__)
 
@@ -193,6 +194,10 @@ class LandingPage(Page):
         # disable featured content for now
         # context["featured_content"] = self.get_featured_content()
         context["feed_urls"] = self.get_feed_urls()
+        context["feed_limits"] = {
+            name: max_items
+            for name, (feed_class, max_items) in LANDING_PAGE_FEEDS.items()
+        }
         return context
 
     content_panels = Page.content_panels + [
@@ -1117,3 +1122,31 @@ class NewsPageRelatedLink(Orderable):
         FieldPanel("name"),
         FieldPanel("url"),
     ]
+
+
+class MetricsAggregate(models.Model):
+    """
+    Materialized per-year (and optionally per-category) count for a single metrics
+    series, see home.metrics.Metrics for how these rows are refreshed and rendered
+    """
+
+    series = models.CharField(max_length=64)
+    # blank for uncategorized series (e.g., totalMembers), otherwise the OS / platform / language name
+    category = models.CharField(max_length=255, blank=True, default="")
+    year = models.PositiveSmallIntegerField()
+    total = models.PositiveIntegerField(default=0)
+    last_modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"[{self.series}] {self.category} {self.year}: {self.total}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["series", "category", "year"],
+                name="unique_metrics_series_category_year",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["series", "year"], name="home_metrics_series_year_idx")
+        ]
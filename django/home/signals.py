@@ -4,12 +4,15 @@ import shortuuid
 from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from wagtail.models import Site as WagtailSite
 
 from core.discourse import sync_discourse_user
-from core.models import MemberProfile, EXCLUDED_USERNAMES
+from core.models import Event, Job, MemberProfile, EXCLUDED_USERNAMES
+from library.models import Codebase, CodebaseRelease
+
+from .feeds import invalidate_syndication_feeds
 
 logger = logging.getLogger(__name__)
 
@@ -83,3 +86,19 @@ def sync_wagtail_django_sites(sender, instance: WagtailSite, created: bool, **kw
         site.name = instance.site_name
         site.domain = instance.hostname
         site.save()
+
+
+def on_feed_content_change(sender, **kwargs):
+    """
+    Rebuild the rendered syndication feeds after a job, event, codebase or release changes
+    """
+    transaction.on_commit(invalidate_syndication_feeds)
+
+
+for feed_content_model in (Event, Job, Codebase, CodebaseRelease):
+    for signal in (post_save, post_delete):
+        signal.connect(
+            on_feed_content_change,
+            sender=feed_content_model,
+            dispatch_uid=f"syndication_feed_invalidate_{feed_content_model.__name__}",
+        )
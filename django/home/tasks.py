@@ -0,0 +1,31 @@
+import logging
+
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task, db_task, lock_task
+
+from .feeds import HOMEPAGE_FEEDS, LANDING_PAGE_FEEDS
+
+logger = logging.getLogger(__name__)
+
+
+@db_task()
+def refresh_feed(feed_name, max_items=None):
+    """refresh a single cached landing page feed after a stale read"""
+    HOMEPAGE_FEEDS[feed_name](max_items=max_items).refresh()
+
+
+@db_periodic_task(crontab(minute="*/10"))
+@lock_task("home-refresh-feeds")
+def refresh_home_feeds():
+    """keep the landing page feeds warm so page loads never wait on the sources"""
+    feeds = {(feed_class, None) for feed_class in HOMEPAGE_FEEDS.values()}
+    feeds.update(LANDING_PAGE_FEEDS.values())
+    for feed_class, max_items in feeds:
+        try:
+            feed_class(max_items=max_items).refresh()
+        except Exception:
+            logger.exception(
+                "failed to refresh feed %s (max items %s)",
+                feed_class.__name__,
+                max_items,
+            )
@@ -1,10 +1,23 @@
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import override_settings
 
 from core.models import Event, Job
 from core.tests.base import BaseModelTestCase
-from home.feeds import ForumFeed, ReviewedModelFeed, EventFeed, JobFeed, YouTubeFeed
+from home.feeds import (
+    LANDING_PAGE_FEEDS,
+    AbstractFeed,
+    AllFeed,
+    ForumFeed,
+    ReviewedModelFeed,
+    EventFeed,
+    JobFeed,
+    YouTubeFeed,
+    invalidate_syndication_feeds,
+)
+from home.tasks import refresh_home_feeds
 from library.models import CodebaseRelease, PeerReview
 from library.tests.base import CodebaseFactory
 
@@ -92,6 +105,81 @@ class LandingPageFeedsTestCase(BaseModelTestCase):
     def test_job_feed(self):
         self._verify_feed_structure(JobFeed(), Job.objects.count())
 
+    def test_stale_feed_is_served_while_refreshing(self):
+        feed = EventFeed()
+        cache.delete(feed.cache_key)
+        self.addCleanup(cache.delete, feed.cache_key)
+        entry = feed.refresh(force=True)
+        self.create_event(
+            title="Test Event 2",
+            description="This is another test event description.",
+            start_date=datetime.now() + timedelta(days=42),
+            submitter=self.user,
+        )
+        # stale entries are returned as is and a single refresh is scheduled
+        cache.set(feed.cache_key, {**entry, "refreshed_at": 0})
+        with patch("home.tasks.refresh_feed") as refresh_feed:
+            self.assertEqual(feed.items(), entry["items"])
+        refresh_feed.assert_called_once_with("EventFeed", feed.max_number_of_items)
+        feed.refresh()
+        self.assertEqual(
+            len(feed.items()), min(Event.objects.count(), feed.max_number_of_items)
+        )
+
+    def test_landing_page_feed_limits_are_kept_warm(self):
+        refreshed = []
+
+        def refresh(feed, force=False):
+            refreshed.append((feed.__class__, feed.max_number_of_items))
+
+        with patch.object(AbstractFeed, "refresh", autospec=True, side_effect=refresh):
+            refresh_home_feeds.call_local()
+        for feed_class, max_items in LANDING_PAGE_FEEDS.values():
+            self.assertIn((feed_class, max_items), refreshed)
+        self.assertIn((ForumFeed, ForumFeed.max_number_of_items), refreshed)
+
+    def test_external_feed_is_never_fetched_in_request(self):
+        feed = ForumFeed()
+        cache.delete(feed.cache_key)
+        with patch("home.tasks.refresh_feed") as refresh_feed, patch.object(
+            ForumFeed, "_get_feed_source_data"
+        ) as get_source_data:
+            self.assertEqual(feed.items(), [])
+        get_source_data.assert_not_called()
+        refresh_feed.assert_called_once_with("ForumFeed", feed.max_number_of_items)
+
+    def test_all_feed_is_merged_in_date_order(self):
+        items = AllFeed().items()
+        self.assertEqual(
+            len(items),
+            Job.objects.live().count()
+            + Event.objects.live().count()
+            + CodebaseRelease.objects.public().count(),
+        )
+        dates = [item.date_created for item in items]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_syndication_feed_conditional_get(self):
+        invalidate_syndication_feeds()
+        response = self.client.get("/feeds/rss/")
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertIn("Test Job 1", response.content.decode())
+        response = self.client.get("/feeds/rss/", headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        # feed content changes rebuild the feed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_job(
+                title="Test Job 2",
+                description="This is another test job description.",
+                external_url="https://example.com/jobbers",
+                submitter=self.user,
+            )
+        response = self.client.get("/feeds/rss/", headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("Test Job 2", response.content.decode())
+
     # FIXME: skipped until there is a mock YT api response
     # def test_youtube_feed(self):
     #     self._verify_feed_structure(YouTubeFeed())
@@ -1,6 +1,12 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
 
+from core.tests.base import UserFactory
 from home.metrics import Metrics
+from home.models import MetricsAggregate
+from library.models import CodebaseRelease, ProgrammingLanguage, ReleaseLanguage
+from library.tests.base import CodebaseFactory
 
 
 class MetricsTestCase(TestCase):
@@ -54,3 +60,75 @@ class MetricsTestCase(TestCase):
                 chart_data["name"] in OS_NAMES, f"Invalid OS name {chart_data['name']}"
             )
             self.assertEqual(len(chart_data["data"]), 7, "Should be 7 years of data")
+
+
+class MetricsMaterializationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.submitter = UserFactory().create()
+        self.codebase_factory = CodebaseFactory(submitter=self.submitter)
+        self.release = self.codebase_factory.create_published_release()
+        self.current_year = timezone.now().year
+
+    def test_full_refresh(self):
+        data = Metrics().cache_all(full=True)
+        self.assertEqual(
+            MetricsAggregate.objects.get(
+                series="totalReleases", year=self.current_year
+            ).total,
+            1,
+        )
+        self.assertEqual(data["totalModels"]["startYear"], self.current_year)
+        self.assertEqual(data["totalModels"]["series"][0]["data"], [1])
+        # each series is cached under its own key
+        self.assertEqual(
+            cache.get(Metrics.get_cache_key("totalModels")), data["totalModels"]
+        )
+
+    def test_incremental_refresh_only_touches_changed_years(self):
+        metrics = Metrics()
+        metrics.cache_all(full=True)
+        # a stale bucket for a year no modified row touches should survive an incremental refresh
+        MetricsAggregate.objects.create(series="totalReleases", year=2000, total=99)
+        self.codebase_factory.create_published_release(codebase=self.release.codebase)
+        metrics.cache_all()
+        self.assertEqual(
+            MetricsAggregate.objects.get(series="totalReleases", year=2000).total, 99
+        )
+        self.assertEqual(
+            MetricsAggregate.objects.get(
+                series="totalReleases", year=self.current_year
+            ).total,
+            2,
+        )
+        metrics.cache_all(full=True)
+        self.assertFalse(
+            MetricsAggregate.objects.filter(series="totalReleases", year=2000).exists()
+        )
+
+    def test_incremental_refresh_picks_up_release_language_changes(self):
+        past = timezone.now().replace(year=2015)
+        CodebaseRelease.objects.filter(pk=self.release.pk).update(
+            first_published_at=past, last_modified=past
+        )
+        metrics = Metrics()
+        metrics.cache_all(full=True)
+        julia = ProgrammingLanguage.objects.create(name="Julia")
+        # only the through row changes, the release itself is not saved
+        ReleaseLanguage.objects.create(release=self.release, programming_language=julia)
+        metrics.cache_all()
+        self.assertEqual(
+            MetricsAggregate.objects.get(
+                series="releasesByLanguage", category="Julia", year=2015
+            ).total,
+            1,
+        )
+
+    def test_get_all_data_renders_from_materialized_rows(self):
+        metrics = Metrics()
+        data = metrics.cache_all(full=True)
+        cache.delete(Metrics.get_cache_key("totalReleases"))
+        with self.assertNumQueries(3):
+            # existence check, start years and materialized rows, no aggregation over source tables
+            rebuilt = metrics.get_all_data()
+        self.assertEqual(rebuilt["totalReleases"], data["totalReleases"])
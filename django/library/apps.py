@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class LibraryConfig(AppConfig):
     name = "library"
+
+    def ready(self):
+        from .signals import register_signal_handlers
+
+        register_signal_handlers()
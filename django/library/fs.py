@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 import json
 import requests
 import yaml
@@ -8,13 +9,16 @@ import os
 import re
 import shutil
 import tarfile
+import uuid
 import zipfile
+import struct
 import filecmp
+import hashlib
 from packaging.version import Version
 from enum import Enum
 from functools import total_ordering
 from pathlib import Path
-from tempfile import TemporaryDirectory
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 from typing import Callable, Optional
 from git import Actor, GitCommandError, InvalidGitRepositoryError, Repo
 
@@ -355,6 +359,513 @@ class CodebaseReleaseAipStorage(CodebaseReleaseStorage):
         shutil.copytree(sip_storage.location, self.location)
 
 
+class ZipStreamBuffer:
+    """
+    Unseekable write-only sink for zipfile.ZipFile that collects written bytes until they
+    are drained
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ReleaseArchiveBuilder:
+    """
+    Builds a store-only zip archive directly from a release's SIP contents.
+
+    Entries are written in a stable order with the top-level metadata files (codemeta.json,
+    CITATION.cff, LICENSE) last. When the SIP file manifest is available the sha256 of every
+    archived file is recorded next to the archive so a later build can tell which entries of
+    the previous archive are still current from the manifest alone and copy their stored bytes
+    over verbatim instead of re-reading the files, wherever they sit in the previous archive
+    """
+
+    METADATA_FILES = ("codemeta.json", "CITATION.cff", "LICENSE")
+    STREAM_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, contents_dir: Path, file_manifest: Optional[dict] = None):
+        self.contents_dir = Path(contents_dir)
+        # SipFileManifestManager entries keyed by path relative to the contents dir
+        self.file_manifest = file_manifest
+
+    @staticmethod
+    def get_digests_path(dest) -> Path:
+        dest = Path(dest)
+        return dest.with_name(f"{dest.name}.digests.json")
+
+    def list_entries(self) -> list[tuple[str, Path]]:
+        """returns (arcname, path) pairs for every file in the contents dir in archive order"""
+        entries = []
+        metadata_entries = {}
+        for root_path, dirs, file_paths in os.walk(str(self.contents_dir)):
+            for file_path in file_paths:
+                path = Path(root_path, file_path)
+                arcname = str(path.relative_to(self.contents_dir))
+                if arcname in self.METADATA_FILES:
+                    metadata_entries[arcname] = path
+                else:
+                    entries.append((arcname, path))
+        entries.sort()
+        entries.extend(
+            (name, metadata_entries[name])
+            for name in self.METADATA_FILES
+            if name in metadata_entries
+        )
+        return entries
+
+    def get_sha256(self, arcname: str, path: Path) -> Optional[str]:
+        """
+        returns the manifest sha256 of the file at path if its manifest entry is current, i.e.
+        its recorded size and mtime still match the file, None otherwise
+        """
+        if not self.file_manifest:
+            return None
+        entry = self.file_manifest.get(arcname)
+        if entry is None:
+            return None
+        stat = path.stat()
+        if entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+            return None
+        return entry["sha256"]
+
+    def load_digests(self, previous_archive) -> dict:
+        digests_path = self.get_digests_path(previous_archive)
+        try:
+            return json.loads(digests_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def save_digests(self, dest: Path, digests: dict):
+        digests_path = self.get_digests_path(dest)
+        if not digests:
+            digests_path.unlink(missing_ok=True)
+            return
+        tmp_path = digests_path.with_name(f".{digests_path.name}.tmp")
+        tmp_path.write_text(json.dumps(digests))
+        os.replace(str(tmp_path), str(digests_path))
+
+    def is_unchanged(
+        self, info: zipfile.ZipInfo, digest: Optional[dict], sha256
+    ) -> bool:
+        """
+        an entry of the previous archive can be reused if the digest recorded for it when it
+        was written still describes it (same CRC-32 and size, so the digests file belongs to
+        that archive) and has the file's current manifest sha256
+        """
+        return (
+            sha256 is not None
+            and digest is not None
+            and digest["sha256"] == sha256
+            and digest["crc"] == info.CRC
+            and digest["size"] == info.file_size
+            # only stored entries with the sizes in their local header can be copied as-is
+            and info.compress_type == zipfile.ZIP_STORED
+            and not info.flag_bits & zipfile._MASK_USE_DATA_DESCRIPTOR
+        )
+
+    def build(self, dest, previous_archive=None) -> bool:
+        """
+        write the archive to dest, copying unchanged entries from previous_archive if it is a
+        valid zip file instead of re-reading them from the contents dir. The archive is
+        assembled in a uniquely named temporary file next to dest and moved into place so
+        concurrent builds and downloads never see a partially written archive.
+
+        Returns False if there are no contents to archive
+        """
+        if not self.contents_dir.exists():
+            return False
+        dest = Path(dest)
+        entries = self.list_entries()
+        previous = None
+        previous_digests = {}
+        if previous_archive is not None and zipfile.is_zipfile(str(previous_archive)):
+            previous = zipfile.ZipFile(str(previous_archive))
+            previous_digests = self.load_digests(previous_archive)
+        tmp_file = NamedTemporaryFile(
+            dir=str(dest.parent), prefix=f".{dest.name}.", suffix=".tmp", delete=False
+        )
+        tmp_dest = Path(tmp_file.name)
+        digests = {}
+        reused = 0
+        try:
+            with tmp_file, zipfile.ZipFile(tmp_file, "w") as archive:
+                for arcname, path in entries:
+                    sha256 = self.get_sha256(arcname, path)
+                    info = previous.NameToInfo.get(arcname) if previous else None
+                    if info is not None and self.is_unchanged(
+                        info, previous_digests.get(arcname), sha256
+                    ):
+                        zinfo = self._copy_raw_entry(previous, info, archive, path)
+                        reused += 1
+                    else:
+                        archive.write(str(path), arcname=arcname)
+                        zinfo = archive.NameToInfo[arcname]
+                    if sha256 is not None:
+                        digests[arcname] = {
+                            "sha256": sha256,
+                            "crc": zinfo.CRC,
+                            "size": zinfo.file_size,
+                        }
+            os.replace(str(tmp_dest), str(dest))
+        except Exception:
+            tmp_dest.unlink(missing_ok=True)
+            raise
+        finally:
+            if previous is not None:
+                previous.close()
+        self.save_digests(dest, digests)
+        logger.info(
+            "built archive %s: reused %s entries, wrote %s entries",
+            dest,
+            reused,
+            len(entries) - reused,
+        )
+        return True
+
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        generator that yields the archive in chunks as it is being built, without
+        writing it to disk first.
+
+        Streamed entries carry data descriptors since the sink cannot seek back to patch their
+        local headers, so the streamed bytes differ from an archive written by build() and
+        must never be saved as a release's archive.zip or its fixity check would fail
+        """
+        buffer = ZipStreamBuffer()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for arcname, path in self.list_entries():
+                zinfo = zipfile.ZipInfo.from_file(str(path), arcname=arcname)
+                with path.open("rb") as src, archive.open(zinfo, "w") as dest:
+                    while chunk := src.read(chunk_size):
+                        dest.write(chunk)
+                        if data := buffer.drain():
+                            yield data
+        if data := buffer.drain():
+            yield data
+
+    def _copy_raw_entry(self, previous, info, archive, path: Path) -> zipfile.ZipInfo:
+        """
+        append the stored bytes of the previous archive's entry info to archive without
+        reading the file at path, whose content they must match. The local header is built
+        from the file exactly as ZipFile.write would so the result is identical to a fresh
+        build. ZipFile has no public API for raw entry copies so this mirrors what its own
+        write handles do
+        """
+        zinfo = zipfile.ZipInfo.from_file(str(path), arcname=info.filename)
+        zinfo.compress_type = info.compress_type
+        zinfo.flag_bits = 0
+        zinfo.CRC = info.CRC
+        zinfo.compress_size = info.compress_size
+        zinfo.file_size = info.file_size
+        zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+
+        previous.fp.seek(info.header_offset)
+        header = struct.unpack(
+            zipfile.structFileHeader, previous.fp.read(zipfile.sizeFileHeader)
+        )
+        if header[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"bad local file header for {info.filename}")
+        previous.fp.seek(
+            header[zipfile._FH_FILENAME_LENGTH]
+            + header[zipfile._FH_EXTRA_FIELD_LENGTH],
+            os.SEEK_CUR,
+        )
+
+        archive.fp.seek(archive.start_dir)
+        zinfo.header_offset = archive.fp.tell()
+        archive._writecheck(zinfo)
+        archive._didModify = True
+        archive.fp.write(zinfo.FileHeader(zip64))
+        remaining = info.compress_size
+        while remaining:
+            chunk = previous.fp.read(min(remaining, self.STREAM_CHUNK_SIZE))
+            if not chunk:
+                raise zipfile.BadZipFile(f"truncated entry {info.filename}")
+            archive.fp.write(chunk)
+            remaining -= len(chunk)
+        archive.start_dir = archive.fp.tell()
+        archive.filelist.append(zinfo)
+        archive.NameToInfo[zinfo.filename] = zinfo
+        return zinfo
+
+
+class ContentAddressedBlobStore:
+    """
+    SHA-256 keyed blob store under LIBRARY_ROOT that release stage directories hardlink into so
+    that files shared between releases (e.g., across versions of the same model) are only
+    stored once. Blobs must live on the same filesystem as the release directories for
+    hardlinks to work.
+
+    NOTE: files linked into the store are shared between releases and must never be modified
+    in place, only deleted or replaced
+    """
+
+    BLOB_DIRNAME = ".blobs"
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, root=None):
+        if root is None:
+            root = Path(settings.LIBRARY_ROOT, self.BLOB_DIRNAME)
+        self.root = Path(root)
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root.joinpath(digest[:2], digest[2:4], digest)
+
+    @classmethod
+    def hash_file(cls, path: Path) -> str:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(cls.HASH_CHUNK_SIZE):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def ingest(self, path: Path) -> tuple[str, int]:
+        """
+        replace the file at path with a hardlink to the blob holding its contents, adding it to
+        the store if needed. Returns a (digest, bytes reclaimed) tuple
+        """
+        path = Path(path)
+        path_stat = path.stat()
+        digest = self.hash_file(path)
+        blob = self.blob_path(digest)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            blob_stat = blob.stat()
+        except FileNotFoundError:
+            try:
+                os.link(path, blob)
+                return digest, 0
+            except FileExistsError:
+                # concurrently added by another process
+                blob_stat = blob.stat()
+        if (blob_stat.st_dev, blob_stat.st_ino) == (path_stat.st_dev, path_stat.st_ino):
+            return digest, 0
+        # link to a temporary name and atomically swap it in place of the duplicate
+        link_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.link")
+        os.link(blob, link_path)
+        os.replace(link_path, path)
+        # the duplicate's storage is only freed if nothing else linked to it
+        return digest, path_stat.st_size if path_stat.st_nlink == 1 else 0
+
+    def collect_garbage(self) -> tuple[int, int]:
+        """
+        remove blobs that are no longer linked from any release stage directory.
+        Returns a (blobs removed, bytes reclaimed) tuple
+        """
+        removed = 0
+        reclaimed = 0
+        if not self.root.exists():
+            return removed, reclaimed
+        for blob in self.root.rglob("*"):
+            if blob.is_file():
+                blob_stat = blob.stat()
+                if blob_stat.st_nlink == 1:
+                    blob.unlink()
+                    removed += 1
+                    reclaimed += blob_stat.st_size
+        return removed, reclaimed
+
+
+class SipFileManifestManager:
+    """
+    Keeps a release's CodebaseReleaseFileManifest in sync with its sip contents. Callers
+    report the paths they changed and only those are re-examined, files are re-hashed only
+    when their size or mtime changed. A missing manifest is built by walking the sip once
+    """
+
+    def __init__(self, fs_api):
+        self.fs_api = fs_api
+        self._manifest = None
+        # (prefixes, relpaths) changed inside a deferred() block
+        self._deferred = None
+
+    @property
+    def sip_contents_dir(self) -> Path:
+        return self.fs_api.sip_contents_dir
+
+    @property
+    def entries(self) -> dict:
+        return self.get_manifest().entries
+
+    def get_manifest(self):
+        if self._manifest is None:
+            from .models import CodebaseReleaseFileManifest
+
+            release = self.fs_api.release
+            manifest = CodebaseReleaseFileManifest.objects.filter(
+                release=release
+            ).first()
+            if manifest is None:
+                manifest, created = (
+                    CodebaseReleaseFileManifest.objects.update_or_create(
+                        release=release, defaults={"entries": self._scan()}
+                    )
+                )
+            self._manifest = manifest
+        return self._manifest
+
+    def get_category(self, relpath: Path) -> str:
+        rel_parent = relpath.parent
+        if rel_parent == Path("."):
+            return FileCategories.metadata.name
+        return str(rel_parent)
+
+    def _stat_entry(self, path: Path, previous: Optional[dict] = None) -> dict:
+        stat = path.stat()
+        if (
+            previous
+            and previous["size"] == stat.st_size
+            and previous["mtime"] == stat.st_mtime
+        ):
+            sha256 = previous["sha256"]
+        else:
+            sha256 = ContentAddressedBlobStore.hash_file(path)
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "category": self.get_category(path.relative_to(self.sip_contents_dir)),
+            "sha256": sha256,
+        }
+
+    def _scan(self, prefix: Optional[str] = None, previous: Optional[dict] = None):
+        previous = previous or {}
+        root = self.sip_contents_dir
+        if prefix:
+            root = root.joinpath(prefix)
+        entries = {}
+        if not root.is_dir():
+            return entries
+        for path in root.rglob("*"):
+            if path.is_file():
+                key = str(path.relative_to(self.sip_contents_dir))
+                entries[key] = self._stat_entry(path, previous.get(key))
+        return entries
+
+    def _save(self, entries: dict):
+        manifest = self.get_manifest()
+        manifest.entries = entries
+        manifest.save(update_fields=["entries", "last_modified"])
+
+    @contextmanager
+    def deferred(self):
+        """
+        collect the changes reported inside the block and apply them with a single scan and
+        save when it exits, for callers that add or remove many files in a row
+        """
+        if self._deferred is not None:
+            # nested blocks are applied by the outermost one
+            yield
+            return
+        self._deferred = (set(), set())
+        try:
+            yield
+        finally:
+            prefixes, relpaths = self._deferred
+            self._deferred = None
+            if prefixes or relpaths:
+                self._apply_changes(prefixes, relpaths)
+
+    def _apply_changes(self, prefixes, relpaths):
+        """
+        replace the manifest entries under each prefix (a directory relative to the sip
+        contents, or everything if None) and of each relpath with what is on disk now
+        """
+        if self._deferred is not None:
+            self._deferred[0].update(prefixes)
+            self._deferred[1].update(str(relpath) for relpath in relpaths)
+            return
+        previous = self.entries
+        if None in prefixes:
+            entries = self._scan(previous=previous)
+        else:
+            entries = dict(previous)
+            for prefix in prefixes:
+                entries = {
+                    key: entry
+                    for key, entry in entries.items()
+                    if not key.startswith(f"{prefix}/")
+                }
+                entries.update(self._scan(prefix, previous=previous))
+            for relpath in relpaths:
+                key = str(relpath)
+                path = self.sip_contents_dir.joinpath(key)
+                if path.is_file():
+                    entries[key] = self._stat_entry(path, previous.get(key))
+                else:
+                    entries.pop(key, None)
+        self._save(entries)
+
+    def rescan(self, prefix: Optional[str] = None):
+        """
+        re-read the sip contents under prefix (a directory relative to the sip contents, or
+        everything if None) and replace their manifest entries
+        """
+        self._apply_changes({prefix}, ())
+
+    def remove_prefix(self, prefix: str):
+        # the directory is gone so rescanning it drops its entries
+        self._apply_changes({prefix}, ())
+
+    def update_paths(self, relpaths):
+        """add, refresh or remove the manifest entries for individual sip relative paths"""
+        self._apply_changes(set(), relpaths)
+
+    def list(self, category: Optional[FileCategories] = None) -> list[str]:
+        """
+        returns the sip file paths in category relative to the category directory, or all
+        sip file paths relative to the sip contents if category is None
+        """
+        if category is None:
+            return sorted(self.entries)
+        prefix = f"{category.name}/"
+        return sorted(
+            key[len(prefix) :] for key in self.entries if key.startswith(prefix)
+        )
+
+    def has_category(self, category: FileCategories) -> bool:
+        prefix = f"{category.name}/"
+        return any(key.startswith(prefix) for key in self.entries)
+
+    def build_tree(self) -> dict:
+        """
+        build the same nested {label, contents} tree that walking the sip contents would
+        produce, with leaves carrying path and category
+        """
+        root = {"label": "archive-project-root", "contents": []}
+        directories = {(): root}
+        for key in sorted(self.entries):
+            relpath = Path(key)
+            parent = root
+            for depth in range(1, len(relpath.parts)):
+                dir_parts = relpath.parts[:depth]
+                node = directories.get(dir_parts)
+                if node is None:
+                    node = {"label": dir_parts[-1], "contents": []}
+                    directories[dir_parts] = node
+                    parent["contents"].append(node)
+                parent = node
+            parent["contents"].append(
+                {
+                    "label": relpath.name,
+                    "path": key,
+                    "category": self.entries[key]["category"],
+                }
+            )
+        return root
+
+
 class BaseCodebaseReleaseFsApi(ABC):
     """
     Base interface to maintain files associated with a codebase release
@@ -385,10 +896,6 @@ class BaseCodebaseReleaseFsApi(ABC):
     def archivepath(self):
         return self.rootdir.joinpath("archive.zip")
 
-    @property
-    def review_archivepath(self):
-        return self.rootdir.joinpath("review_archive.zip")
-
     @property
     def rootdir(self):
         return Path(
@@ -581,16 +1088,44 @@ class BaseCodebaseReleaseFsApi(ABC):
         self.validate_bagit(bag)
         self.build_archive(force=force)
 
-    def build_review_archive(self):
-        self.create_or_update_codemeta(force=True)
-        self.create_or_update_citation_cff(force=True)
-        self.create_or_update_license(force=True)
-        shutil.make_archive(
-            str(self.review_archivepath.with_suffix("")),
-            format="zip",
-            root_dir=str(self.sip_contents_dir),
-        )
-        return self.review_archivepath
+    def stream_review_archive(self):
+        """
+        returns a generator that streams a freshly built review archive, see
+        ReleaseArchiveBuilder.stream
+        """
+        self.create_or_update_metadata_files(force=True)
+        return ReleaseArchiveBuilder(self.sip_contents_dir).stream()
+
+    def stream_archive(self):
+        """
+        returns a generator that streams the release archive built from the sip contents. The
+        streamed bytes are not cached, use build_archive to write this release's archive.zip
+        """
+        return ReleaseArchiveBuilder(self.sip_contents_dir).stream()
+
+    def deduplicate(self, blob_store: Optional[ContentAddressedBlobStore] = None):
+        """
+        replace this release's original and submission package files with hardlinks into the
+        content-addressed blob store. Generated metadata files are skipped since they are
+        rewritten on every metadata change. Returns the number of bytes reclaimed
+        """
+        if blob_store is None:
+            blob_store = ContentAddressedBlobStore()
+        reclaimed = 0
+        for stage_dir in (self.originals_dir, self.sip_contents_dir):
+            if not stage_dir.exists():
+                continue
+            for path in stage_dir.rglob("*"):
+                if not path.is_file() or path.is_symlink():
+                    continue
+                if (
+                    path.parent == self.sip_contents_dir
+                    and path.name in ReleaseArchiveBuilder.METADATA_FILES
+                ):
+                    continue
+                digest, reclaimed_bytes = blob_store.ingest(path)
+                reclaimed += reclaimed_bytes
+        return reclaimed
 
     @property
     def codemeta_uri(self):
@@ -601,19 +1136,10 @@ class BaseCodebaseReleaseFsApi(ABC):
         """returns the internal URI used by nginx to access this release's official archive package"""
         return self.archivepath.relative_to(settings.LIBRARY_ROOT)
 
-    @property
-    def review_archive_uri(self):
-        """returns the internal uri used by nginx to access this release's review archive package"""
-        return self.review_archivepath.relative_to(settings.LIBRARY_ROOT)
-
     @property
     def archive_size(self):
         return self.archivepath.stat().st_size
 
-    @property
-    def review_archive_size(self):
-        return self.review_archivepath.stat().st_size
-
     @abstractmethod
     def list(self, stage: StagingDirectories, category: Optional[FileCategories]):
         pass
@@ -636,34 +1162,102 @@ class BaseCodebaseReleaseFsApi(ABC):
         bag.save(manifests=True)
         return bag
 
-    def build_aip(self, sip_dir: Optional[str] = None):
-        logger.info("building aip")
-        if sip_dir is None:
-            sip_dir = str(self.sip_dir)
-        shutil.rmtree(str(self.aip_dir), ignore_errors=True)
-        shutil.copytree(sip_dir, str(self.aip_dir))
+    def get_file_manifest_entries(self) -> Optional[dict]:
+        """
+        returns the sip file manifest entries used to reuse unchanged archive entries, or None
+        if this release does not keep a file manifest
+        """
+        return None
 
-    def build_archive_at_dest(self, dest):
+    def build_archive_at_dest(self, dest, previous_archive=None):
+        """
+        build a store-only zip archive of the SIP contents at dest, reusing unchanged
+        entries from previous_archive if given
+        """
         logger.info("building archive")
-        self.build_aip()
-        if self.aip_contents_dir.exists():
-            with zipfile.ZipFile(dest, "w") as archive:
-                for root_path, dirs, file_paths in os.walk(str(self.aip_contents_dir)):
-                    for file_path in file_paths:
-                        path = Path(root_path, file_path)
-                        archive.write(
-                            str(path),
-                            arcname=str(path.relative_to(self.aip_contents_dir)),
-                        )
+        builder = ReleaseArchiveBuilder(
+            self.sip_contents_dir, file_manifest=self.get_file_manifest_entries()
+        )
+        if builder.build(dest, previous_archive=previous_archive):
             logger.info("building archive succeeded")
             return True
         else:
-            logger.error("building archive failed - no aip directory")
+            logger.error("building archive failed - no sip directory")
             return False
 
+    def _is_aip_link_candidate(self, sip_path: Path) -> bool:
+        """
+        sip content files are replaced rather than modified (and may be hardlinks into the
+        blob store) so the aip can share them. Bag tag files and generated metadata files are
+        rewritten in place and must be copied
+        """
+        return sip_path.parent != self.sip_dir and not (
+            sip_path.parent == self.sip_contents_dir
+            and sip_path.name in ReleaseArchiveBuilder.METADATA_FILES
+        )
+
+    def build_aip(self):
+        """
+        sync the aip with the sip, touching only the files that were added, changed or
+        removed since the last sync. Returns the number of aip files written or removed
+        """
+        logger.info("building aip")
+        sip_dir = self.sip_dir
+        aip_dir = self.aip_dir
+        changed = 0
+        expected = set()
+        for sip_path in sip_dir.rglob("*"):
+            if not sip_path.is_file():
+                continue
+            relpath = sip_path.relative_to(sip_dir)
+            expected.add(relpath)
+            aip_path = aip_dir.joinpath(relpath)
+            link = self._is_aip_link_candidate(sip_path)
+            if aip_path.exists():
+                if link and aip_path.samefile(sip_path):
+                    continue
+                sip_stat = sip_path.stat()
+                aip_stat = aip_path.stat()
+                if (
+                    not link
+                    and sip_stat.st_size == aip_stat.st_size
+                    and sip_stat.st_mtime == aip_stat.st_mtime
+                ):
+                    continue
+            aip_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = aip_path.with_name(f".{aip_path.name}.tmp")
+            tmp_path.unlink(missing_ok=True)
+            try:
+                if link:
+                    os.link(sip_path, tmp_path)
+                else:
+                    shutil.copy2(sip_path, tmp_path)
+            except OSError:
+                # e.g. the aip is on another device
+                shutil.copy2(sip_path, tmp_path)
+            os.replace(tmp_path, aip_path)
+            changed += 1
+        if aip_dir.exists():
+            # deepest paths first so emptied directories can be removed as well
+            for aip_path in sorted(aip_dir.rglob("*"), reverse=True):
+                if aip_path.is_dir():
+                    if not any(aip_path.iterdir()):
+                        aip_path.rmdir()
+                elif aip_path.relative_to(aip_dir) not in expected:
+                    aip_path.unlink()
+                    changed += 1
+        logger.info("synced aip, %s files changed", changed)
+        return changed
+
     def build_archive(self, force=False):
         if not self.archivepath.exists() or force:
-            self.build_archive_at_dest(dest=str(self.archivepath))
+            previous_archive = self.archivepath if self.archivepath.exists() else None
+            if self.build_archive_at_dest(
+                dest=str(self.archivepath), previous_archive=previous_archive
+            ):
+                # the archive no longer needs the aip but it is still kept as the
+                # preservation copy of the sip the archive was built from
+                self.build_aip()
 
     def create_or_update_metadata_files(self, force=False):
         self.create_or_update_codemeta(force=force)
@@ -673,7 +1267,7 @@ class BaseCodebaseReleaseFsApi(ABC):
     def rebuild_metadata(self):
         self.create_or_update_metadata_files(force=True)
         # only rebuild the archive package if it already exists
-        if self.aip_dir.exists():
+        if self.archivepath.exists():
             self.build_archive(force=True)
 
 
@@ -699,20 +1293,22 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
             system_file_presence_message_level,
             mimetype_mismatch_message_level,
         )
+        self.file_manifest = SipFileManifestManager(self)
 
     def list(self, stage, category):
+        if stage == StagingDirectories.sip:
+            return self.file_manifest.list(category)
         stage_storage = self.get_stage_storage(stage)
         return [str(p) for p in stage_storage.list(category)]
 
     def list_sip_contents(self, path=None):
         """recursively build a tree representing the SIP contents.
-        Each node includes a label (file name), path (relative to sip contents), and category
+        Each node includes a label (file name), path (relative to sip contents), and category.
+        The full tree is served from the file manifest, subtrees are read from the filesystem
         """
         if path is None:
-            path = self.sip_contents_dir
-            name = "archive-project-root"
-        else:
-            name = path.name
+            return self.file_manifest.build_tree()
+        name = path.name
         contents = {"label": name, "contents": []}
         for p in path.iterdir():
             if p.is_dir():
@@ -738,10 +1334,34 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
         return contents
 
     def check_category_file_exists(self, category):
-        sip_storage = self.get_sip_storage()
-        category_dir_exists = sip_storage.exists(category.name)
-        category_dir_list = list(sip_storage.list(category))
-        return category_dir_exists and bool(category_dir_list)
+        return self.file_manifest.has_category(category)
+
+    def get_file_manifest_entries(self):
+        return self.file_manifest.entries
+
+    def create_or_update_codemeta(self, force=False):
+        created = super().create_or_update_codemeta(force=force)
+        if created:
+            self.file_manifest.update_paths(
+                [self.codemeta_path.relative_to(self.sip_contents_dir)]
+            )
+        return created
+
+    def create_or_update_citation_cff(self, force=False):
+        created = super().create_or_update_citation_cff(force=force)
+        if created:
+            self.file_manifest.update_paths(
+                [self.cff_path.relative_to(self.sip_contents_dir)]
+            )
+        return created
+
+    def create_or_update_license(self, force=False):
+        created = super().create_or_update_license(force=force)
+        if created:
+            self.file_manifest.update_paths(
+                [self.license_path.relative_to(self.sip_contents_dir)]
+            )
+        return created
 
     def retrieve(
         self,
@@ -777,7 +1397,7 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
                 msgs.append(
                     self._add_to_sip(name=str(name), content=f, category=category)
                 )
-
+        self.file_manifest.rescan()
         return msgs
 
     def rebuild(self) -> MessageGroup:
@@ -785,7 +1405,7 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
         msgs = self.build_sip()
         self.create_or_update_metadata_files(force=True)
         # only rebuild the archive package if it already exists
-        if self.aip_dir.exists():
+        if self.archivepath.exists():
             self.build_archive(force=True)
         return msgs
 
@@ -794,6 +1414,7 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
         originals_storage.clear_category(category)
         sip_storage = self.get_sip_storage()
         sip_storage.clear_category(category)
+        self.file_manifest.remove_prefix(category.name)
 
     def add(self, category: FileCategories, content, name=None):
         if name is None:
@@ -809,6 +1430,8 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
         msgs.append(self._add_to_sip(name=name, content=content, category=category))
         if msgs.has_errors:
             self.delete(category, Path(content.name))
+        # archives are unpacked into the category directory so rescan all of it
+        self.file_manifest.rescan(category.name)
 
         return msgs
 
@@ -821,13 +1444,22 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
             self.identifier,
         )
         source_fs_api = source_release.get_fs_api()
-        for category in FileCategories:
-            source_files = source_fs_api.list(StagingDirectories.originals, category)
-            for relpath in source_files:
-                with source_fs_api.retrieve(
-                    StagingDirectories.originals, category, Path(relpath)
-                ) as file_content:
-                    self.add(category, file_content, name=relpath)
+        blob_store = ContentAddressedBlobStore()
+        # ingest the source files first so that the copies below are linked to the same blobs
+        source_fs_api.deduplicate(blob_store=blob_store)
+        with self.file_manifest.deferred():
+            for category in FileCategories:
+                source_files = source_fs_api.list(
+                    StagingDirectories.originals, category
+                )
+                for relpath in source_files:
+                    with source_fs_api.retrieve(
+                        StagingDirectories.originals, category, Path(relpath)
+                    ) as file_content:
+                        self.add(category, file_content, name=relpath)
+        # share unchanged files with the source release instead of keeping full copies
+        reclaimed = self.deduplicate(blob_store=blob_store)
+        logger.info("deduplicated copied files, reclaimed %s bytes", reclaimed)
 
     def delete(self, category: FileCategories, relpath: Path):
         originals_storage = self.get_originals_storage()
@@ -848,6 +1480,7 @@ class CodebaseReleaseFsApi(BaseCodebaseReleaseFsApi):
                 return logs
             logs.append(sip_storage.log_delete(str(relpath)))
             logs.append(originals_storage.log_delete(str(relpath)))
+            self.file_manifest.update_paths([relpath])
         return logs
 
 
@@ -1114,6 +1747,9 @@ class CodebaseGitRepositoryApi:
     FILE_SIZE_LIMIT_MB = FILE_SIZE_LIMIT / MEGABYTE
     DEFAULT_BRANCH_NAME = "main"
     RELEASE_BRANCH_PREFIX = "release/"
+    README_PATTERN = re.compile(
+        r"(?i)^readme(?:\.(?:markdown|mdown|mkdn|md|textile|rdoc|org|creole|mediawiki|wiki|rst|asciidoc|adoc|asc|pod|txt))?$"
+    )
 
     def __init__(self, codebase):
         self.codebase = codebase
@@ -1180,65 +1816,79 @@ class CodebaseGitRepositoryApi:
             )
             main_state.record_build(commit_sha=self.repo.head.commit.hexsha)
 
-    def clear_existing_files(self):
-        """
-        clear any existing files in the working tree (tracked or untracked) besides .git
-        """
-        for item in self.repo_dir.iterdir():
-            if item.name != ".git":
-                if item.is_dir():
-                    shutil.rmtree(item)
-                else:
-                    item.unlink()
-                self.repo.index.remove(
-                    [str(item.relative_to(self.repo_dir))],
-                    working_tree=True,
-                    r=True,
-                )
-
-    def add_release_files(self, release):
+    def get_release_tree(self, release) -> dict[str, Path | bytes]:
         """
-        copy over submission package files for a release to the working tree of the git repo
-        starting from a clean directory by removing all files except .git/
+        map each path that should be committed for a release to its source, either a
+        submission package file or generated content. An existing readme is duplicated to the
+        repository root for github to recognize, otherwise one is generated from a template
         """
         release_fs_api: CodebaseReleaseFsApi = release.get_fs_api()
         sip_storage = release_fs_api.get_sip_storage()
-        self.clear_existing_files()
-        # copy over files from the sip storage and add to the index
-        # FIXME: consider moving this copy all operation to the CodebaseReleaseStorage class
+        tree = {}
+        readme = None
         for file in sip_storage.list(absolute=True):
-            rel_path = file.relative_to(sip_storage.location)
-            dest_path = self.repo_dir / rel_path
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy(file, dest_path)
-            self.repo.index.add([str(rel_path)])
+            tree[str(file.relative_to(sip_storage.location))] = file
+            if readme is None and self.README_PATTERN.match(file.name):
+                readme = file
+        if readme is not None:
+            tree[readme.name] = readme
+        else:
+            tree["README.md"] = (
+                f"# {self.codebase.title}\n\n{self.codebase.description.raw}\n"
+            ).encode("utf-8")
+        return tree
 
-    def add_readme(self, release):
+    @classmethod
+    def hash_blob(cls, source: Path | bytes) -> bytes:
+        """returns the binary git blob sha1 of a file or content"""
+        if isinstance(source, bytes):
+            return hashlib.sha1(b"blob %d\0" % len(source) + source).digest()
+        sha1 = hashlib.sha1(b"blob %d\0" % source.stat().st_size)
+        with source.open("rb") as f:
+            while chunk := f.read(ContentAddressedBlobStore.HASH_CHUNK_SIZE):
+                sha1.update(chunk)
+        return sha1.digest()
+
+    def add_release_files(self, release):
         """
-        add a readme file to the repository root. If one already exists somewhere, move it.
-        Otherwise, generate one from a template
+        stage the files of a release by applying the difference between the current index and
+        the release's submission package: new and modified files are written to the working
+        tree and files that are no longer part of the release are removed, each in a single
+        batched index operation. Unchanged files (same size and blob hash) are left untouched
         """
-        release_fs_api: CodebaseReleaseFsApi = release.get_fs_api()
-        sip_storage = release_fs_api.get_sip_storage()
-        readme_pattern = re.compile(
-            r"(?i)^readme(?:\.(?:markdown|mdown|mkdn|md|textile|rdoc|org|creole|mediawiki|wiki|rst|asciidoc|adoc|asc|pod|txt))?$"
+        tree = self.get_release_tree(release)
+        current_entries = {
+            path: entry for (path, stage), entry in self.repo.index.entries.items()
+        }
+        changed_paths = []
+        for path, source in tree.items():
+            dest_path = self.repo_dir / path
+            entry = current_entries.get(path)
+            size = len(source) if isinstance(source, bytes) else source.stat().st_size
+            if (
+                entry is not None
+                and entry.size == size
+                and dest_path.exists()
+                and entry.binsha == self.hash_blob(source)
+            ):
+                continue
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(source, bytes):
+                dest_path.write_bytes(source)
+            else:
+                shutil.copy(source, dest_path)
+            changed_paths.append(path)
+        removed_paths = [path for path in current_entries if path not in tree]
+        if removed_paths:
+            self.repo.index.remove(removed_paths, working_tree=True)
+        if changed_paths:
+            self.repo.index.add(changed_paths)
+        logger.debug(
+            "staged release %s: %s added or modified, %s removed",
+            release.version_number,
+            len(changed_paths),
+            len(removed_paths),
         )
-        for file in sip_storage.list(absolute=True):
-            # check for an existing readme and duplicate it to the repo root
-            # for github to recognize. Otherwise, we'll generate one later
-            if readme_pattern.match(file.name):
-                shutil.copy(file, self.repo_dir / file.name)
-                self.repo.index.add([file.name])
-                return
-        readme_content = f"# {self.codebase.title}\n\n{self.codebase.description.raw}\n"
-        self._add_single_file("README.md", readme_content)
-
-    def _add_single_file(self, filename, content: str, overwrite=False):
-        dest_path = self.repo_dir / filename
-        if not dest_path.exists() or overwrite:
-            with dest_path.open("w") as f:
-                f.write(content)
-            self.repo.index.add([filename])
 
     def commit_release(self, release):
         """
@@ -1281,7 +1931,6 @@ class CodebaseGitRepositoryApi:
         commit the release, create a branch/tag, and create the git ref sync state
         """
         self.add_release_files(release)
-        self.add_readme(release)
         commit, tag_name = self.commit_release(release)
         branch_name = self.create_release_branch(release, commit)
         # create git ref sync state for the release
@@ -1314,7 +1963,6 @@ class CodebaseGitRepositoryApi:
 
         self.repo.git.checkout(release_branch_name)
         self.add_release_files(release)
-        self.add_readme(release)
 
         # check for changes before committing
         if not self.repo.is_dirty():
@@ -1343,6 +1991,18 @@ class CodebaseGitRepositoryApi:
 
         return Repo(self.repo_dir)
 
+    def update_release_branches(self, releases) -> Repo | None:
+        """
+        update the release branches of several releases with new metadata in a single pass,
+        see update_release_branch. Returns None if no branches changed
+        """
+        releases = sorted(releases, key=lambda r: Version(r.version_number))
+        updated = False
+        for release in releases:
+            if self.update_release_branch(release) is not None:
+                updated = True
+        return Repo(self.repo_dir) if updated else None
+
     def append_releases(self, releases=None) -> Repo:
         """
         add new releases to the git repository.
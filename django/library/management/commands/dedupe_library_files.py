@@ -0,0 +1,67 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from library.fs import ContentAddressedBlobStore
+from library.models import CodebaseRelease
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Deduplicate the existing library in place by replacing release original and submission
+    package files with hardlinks into the content-addressed blob store under LIBRARY_ROOT.
+
+    Safe to run repeatedly, files that are already linked into the store are skipped.
+    """
+
+    help = "Deduplicate release files into the content-addressed blob store and report the bytes reclaimed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--codebase",
+            dest="codebase_identifier",
+            default=None,
+            help="only deduplicate releases of the codebase with this identifier",
+        )
+        parser.add_argument(
+            "--gc",
+            action="store_true",
+            default=False,
+            help="remove blobs that are no longer linked from any release",
+        )
+
+    def handle(self, *args, **options):
+        blob_store = ContentAddressedBlobStore()
+        releases = CodebaseRelease.objects.select_related(
+            "codebase", "imported_release_sync_state"
+        ).order_by("codebase_id", "id")
+        if options["codebase_identifier"]:
+            releases = releases.filter(
+                codebase__identifier=options["codebase_identifier"]
+            )
+        total_reclaimed = 0
+        errors = []
+        for release in releases.iterator():
+            try:
+                reclaimed = release.get_fs_api().deduplicate(blob_store=blob_store)
+            except Exception as e:
+                logger.exception("Error deduplicating files for %s", release)
+                errors.append((release, e))
+                continue
+            total_reclaimed += reclaimed
+            if reclaimed:
+                self.stdout.write(f"{release}: reclaimed {filesizeformat(reclaimed)}")
+        if options["gc"]:
+            removed, gc_reclaimed = blob_store.collect_garbage()
+            total_reclaimed += gc_reclaimed
+            self.stdout.write(
+                f"Removed {removed} unreferenced blobs ({filesizeformat(gc_reclaimed)})"
+            )
+        if errors:
+            self.stdout.write(f"Failed to deduplicate {len(errors)} releases:")
+            for release, e in errors:
+                self.stdout.write(f"    {release}: {e}")
+        self.stdout.write(f"Total reclaimed: {filesizeformat(total_reclaimed)}")
@@ -0,0 +1,34 @@
+import logging
+
+from dateutil.parser import parse as parse_date
+from django.core.management.base import BaseCommand
+
+from library.models import CodebaseReleaseDownloadCount
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Reconcile the daily CodebaseReleaseDownloadCount rollups with the raw
+    CodebaseReleaseDownload log.
+    """
+
+    help = "Rebuild daily download count rollups from the raw download log"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="from_date",
+            default=None,
+            help="isoformat start date (yyyy-mm-dd), only rebuild rollups on or after this date. Blank rebuilds everything.",
+        )
+
+    def handle(self, *args, **options):
+        from_date_string = options["from_date"]
+        start_date = parse_date(from_date_string).date() if from_date_string else None
+        self.stdout.write(
+            f"Rebuilding download counts from {start_date or 'the beginning'}..."
+        )
+        rows = CodebaseReleaseDownloadCount.objects.rebuild(start_date=start_date)
+        self.stdout.write(f"Wrote {rows} daily download count rows")
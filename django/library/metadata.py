@@ -156,7 +156,7 @@ class CodeMetaConverter:
             ]
             or None,
             # tags are sorted so that comparisons are deterministic
-            keywords=[tag.name for tag in codebase.tags.all().order_by("name")] or None,
+            keywords=codebase.get_metadata_keywords() or None,
             publisher=cls.COMSES_ORGANIZATION,
             description=codebase.description.raw,
             referencePublication=codebase.associated_publication_text or None,
@@ -200,6 +200,7 @@ class CodeMetaConverter:
     @classmethod
     def _convert_release(cls, release) -> CodeMeta:
         codebase = release.codebase
+        authors, nonauthors = release.get_metadata_release_contributors()
         return CodeMeta(
             **cls._common_codebase_fields(codebase),
             id_=release.permanent_url,
@@ -210,12 +211,9 @@ class CodeMetaConverter:
             ),
             programmingLanguage=[
                 cls._convert_release_language(rl)
-                for rl in release.release_languages.all()
+                for rl in release.get_metadata_release_languages()
             ],
-            runtimePlatform=[
-                tag.name for tag in release.platform_tags.all().order_by("name")
-            ]
-            or None,
+            runtimePlatform=release.get_metadata_platforms() or None,
             # FIXME: anything to use this for? it can be either the target os or target
             # framework (e.g. Mesa, NetLogo) but these are both already covered
             # targetProduct=release.os,
@@ -234,14 +232,8 @@ class CodeMetaConverter:
                 or None
             ),
             # FIXME: need better guidance on author vs contributor fields in CodeMeta
-            author=cls.convert_contributors(
-                release.author_release_contributors, "author"
-            )
-            or None,
-            contributor=cls.convert_contributors(
-                release.nonauthor_release_contributors, "contributor"
-            )
-            or None,
+            author=cls.convert_contributors(authors, "author") or None,
+            contributor=cls.convert_contributors(nonauthors, "contributor") or None,
             copyrightYear=(
                 release.last_published_on.year if release.last_published_on else None
             ),
@@ -330,18 +322,17 @@ class DataCiteConverter:
             related_identifiers.append(
                 cls.to_related_identifier(release.codebase.doi, "IsVersionOf")
             )
-        previous_release = release.get_previous_release()
-        next_release = release.get_next_release()
+        previous_release_doi, next_release_doi = release.get_adjacent_release_dois()
         # set relationship to previous_release
-        if previous_release and previous_release.doi:
+        if previous_release_doi:
             related_identifiers.append(
-                cls.to_related_identifier(previous_release.doi, "IsNewVersionOf")
+                cls.to_related_identifier(previous_release_doi, "IsNewVersionOf")
             )
 
         # set relationship to next_release
-        if next_release and next_release.doi:
+        if next_release_doi:
             related_identifiers.append(
-                cls.to_related_identifier(next_release.doi, "IsPreviousVersionOf")
+                cls.to_related_identifier(next_release_doi, "IsPreviousVersionOf")
             )
         return related_identifiers or None
 
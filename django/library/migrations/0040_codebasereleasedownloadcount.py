@@ -0,0 +1,93 @@
+# Generated by Django 5.2.17 on 2026-10-17 17:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def populate_download_counts(apps, schema):
+    """
+    roll up the existing CodebaseReleaseDownload log into daily counts
+    """
+    CodebaseReleaseDownload = apps.get_model("library", "CodebaseReleaseDownload")
+    CodebaseReleaseDownloadCount = apps.get_model(
+        "library", "CodebaseReleaseDownloadCount"
+    )
+    daily_counts = (
+        CodebaseReleaseDownload.objects.values(
+            "release_id",
+            codebase_id=models.F("release__codebase_id"),
+            day=TruncDate("date_created"),
+        )
+        .annotate(total=models.Count("id"))
+        .order_by()
+    )
+    CodebaseReleaseDownloadCount.objects.bulk_create(
+        (
+            CodebaseReleaseDownloadCount(
+                release_id=row["release_id"],
+                codebase_id=row["codebase_id"],
+                date=row["day"],
+                count=row["total"],
+            )
+            for row in daily_counts.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+def noop(apps, schema):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("library", "0039_codebaserelease_input_data_url"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CodebaseReleaseDownloadCount",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "codebase",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="download_counts",
+                        to="library.codebase",
+                    ),
+                ),
+                (
+                    "release",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="download_counts",
+                        to="library.codebaserelease",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["date"], name="library_dlcount_date_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("release", "date"), name="unique_release_download_date"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_download_counts, noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.17 on 2026-10-17 18:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("library", "0040_codebasereleasedownloadcount"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CodebaseReleaseFileManifest",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entries", models.JSONField(default=dict)),
+                ("last_modified", models.DateTimeField(auto_now=True)),
+                (
+                    "release",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="file_manifest",
+                        to="library.codebaserelease",
+                    ),
+                ),
+            ],
+        ),
+    ]
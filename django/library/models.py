@@ -6,6 +6,7 @@ import logging
 import os
 import pathlib
 import re
+import time
 from string import Template
 import uuid
 import semver
@@ -18,11 +19,24 @@ from datetime import date, timedelta
 from allauth.socialaccount.models import SocialAccount
 from django.conf import settings
 from django.contrib.admin.widgets import FilteredSelectMultiple
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.postgres.fields import ArrayField
+from django.core.cache import cache
 from django.core.files.images import ImageFile
 from django.core.files.storage import FileSystemStorage
 from django.db import IntegrityError, models, transaction
-from django.db.models import Prefetch, Q, Count, Max
+from django.db.models import (
+    F,
+    OuterRef,
+    Prefetch,
+    Q,
+    Count,
+    Max,
+    Subquery,
+    Sum,
+    prefetch_related_objects,
+)
+from django.db.models.functions import JSONObject, TruncDate
 from django.utils.functional import cached_property
 from django.urls import reverse
 from django.utils import timezone
@@ -262,6 +276,18 @@ class Contributor(index.Indexed, ClusterableModel):
         ),
     ]
 
+    # contributor and user fields included in the search text of codebases they contributed to,
+    # keyed by name relative to ReleaseContributor for use in JSONObject aggregates
+    SEARCH_FIELD_LOOKUPS = {
+        "given_name": "contributor__given_name",
+        "family_name": "contributor__family_name",
+        "email": "contributor__email",
+        "user_first_name": "contributor__user__first_name",
+        "user_last_name": "contributor__user__last_name",
+        "user_username": "contributor__user__username",
+        "user_email": "contributor__user__email",
+    }
+
     @property
     def affiliations(self):
         if self.json_affiliations:
@@ -370,6 +396,14 @@ class Contributor(index.Indexed, ClusterableModel):
             {self.given_name, self.family_name, self.email} | self._get_user_fields()
         )
 
+    @staticmethod
+    def join_search_fields(values: dict):
+        """
+        equivalent of get_aggregated_search_fields for a dict of SEARCH_FIELD_LOOKUPS values,
+        user fields are null for contributors without a user
+        """
+        return " ".join({value for value in values.values() if value is not None})
+
     def _get_user_fields(self):
         if self.user:
             user = self.user
@@ -468,6 +502,121 @@ class CodebaseReleaseDownload(models.Model):
         indexes = [models.Index(fields=["date_created"])]
 
 
+class CodebaseReleaseDownloadCountQuerySet(models.QuerySet):
+    def total(self):
+        return self.aggregate(total=Sum("count"))["total"] or 0
+
+    def for_codebase(self, codebase):
+        return self.filter(codebase=codebase)
+
+    def for_release(self, release):
+        return self.filter(release=release)
+
+    def increment(self, download: CodebaseReleaseDownload):
+        """
+        increment the daily rollup for the given (saved) CodebaseReleaseDownload
+        """
+        release = download.release
+        day = timezone.localdate(download.date_created)
+        counter = self.filter(release=release, date=day)
+        if counter.update(count=F("count") + 1):
+            return
+        try:
+            with transaction.atomic():
+                self.create(
+                    release=release, codebase_id=release.codebase_id, date=day, count=1
+                )
+        except IntegrityError:
+            # a concurrent download created today's row first
+            counter.update(count=F("count") + 1)
+
+    def rebuild(self, start_date=None):
+        """
+        rebuild daily download rollups from the raw CodebaseReleaseDownload log, optionally
+        only for days on or after start_date. Returns the number of rollup rows written
+        """
+        downloads = CodebaseReleaseDownload.objects.all()
+        stale = self.all()
+        if start_date:
+            downloads = downloads.filter(date_created__date__gte=start_date)
+            stale = stale.filter(date__gte=start_date)
+        daily_counts = (
+            downloads.values(
+                "release_id",
+                codebase_id=F("release__codebase_id"),
+                day=TruncDate("date_created"),
+            )
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        with transaction.atomic():
+            stale.delete()
+            created = self.bulk_create(
+                (
+                    CodebaseReleaseDownloadCount(
+                        release_id=row["release_id"],
+                        codebase_id=row["codebase_id"],
+                        date=row["day"],
+                        count=row["total"],
+                    )
+                    for row in daily_counts.iterator()
+                ),
+                batch_size=1000,
+            )
+        return len(created)
+
+
+class CodebaseReleaseDownloadCount(models.Model):
+    """
+    Daily rollup of CodebaseReleaseDownloads, incremented as downloads are recorded and
+    rebuildable from the raw log via `manage.py rebuild_download_counts`
+    """
+
+    release = models.ForeignKey(
+        "library.CodebaseRelease",
+        related_name="download_counts",
+        on_delete=models.CASCADE,
+    )
+    # denormalized from release so codebase totals don't need a join
+    codebase = models.ForeignKey(
+        "library.Codebase", related_name="download_counts", on_delete=models.CASCADE
+    )
+    date = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    objects = CodebaseReleaseDownloadCountQuerySet.as_manager()
+
+    def __str__(self):
+        return f"[download count] release: {self.release_id}, {self.date}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["release", "date"], name="unique_release_download_date"
+            )
+        ]
+        indexes = [models.Index(fields=["date"], name="library_dlcount_date_idx")]
+
+
+class CodebaseReleaseFileManifest(models.Model):
+    """
+    Index of the files in a release's submission package (SIP), kept in sync by the release's
+    fs api whenever it changes the SIP so that file listings don't need to walk the filesystem
+    """
+
+    release = models.OneToOneField(
+        "library.CodebaseRelease",
+        related_name="file_manifest",
+        on_delete=models.CASCADE,
+    )
+    # sip relative path -> {"size": int, "mtime": float, "category": str, "sha256": str}
+    entries = models.JSONField(default=dict)
+    last_modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"[file manifest] release: {self.release_id}, {len(self.entries)} files"
+
+
 class CodebaseQuerySet(models.QuerySet):
     def update_publish_date(self):
         for codebase in self.all():
@@ -497,6 +646,39 @@ class CodebaseQuerySet(models.QuerySet):
     def with_featured_images(self):
         return self.prefetch_related("featured_images")
 
+    def with_search_fields(self):
+        """
+        annotate the values that Codebase.search_fields derives from releases and contributors
+        (one aggregate subquery each) and prefetch tags so that search documents can be built
+        for a batch of codebases without per-codebase queries
+        """
+        releases = CodebaseRelease.objects.filter(codebase=OuterRef("pk")).values(
+            "codebase"
+        )
+        release_contributors = ReleaseContributor.objects.filter(
+            release__codebase=OuterRef("pk"),
+            release__status=CodebaseRelease.Status.PUBLISHED,
+        ).values("release__codebase")
+        return self.with_tags().annotate(
+            search_contributor_fields=Subquery(
+                release_contributors.annotate(
+                    fields=ArrayAgg(
+                        JSONObject(**Contributor.SEARCH_FIELD_LOOKUPS), distinct=True
+                    )
+                ).values("fields")
+            ),
+            search_release_frameworks=Subquery(
+                releases.filter(platform_tags__isnull=False)
+                .annotate(names=ArrayAgg("platform_tags__name", distinct=True))
+                .values("names")
+            ),
+            search_release_programming_languages=Subquery(
+                releases.annotate(
+                    names=ArrayAgg("programming_languages__name", distinct=True)
+                ).values("names")
+            ),
+        )
+
     def with_submitter(self):
         return self.select_related("submitter")
 
@@ -862,6 +1044,34 @@ class GitRefSyncState(BaseReleaseSyncState):
         if main_state:
             main_state.reassign_remote(remote)
 
+    @classmethod
+    def for_codebase_refs(cls, codebase):
+        """git ref sync states of the codebase main branch and all of its releases"""
+        return cls.objects.filter(
+            models.Q(release__codebase=codebase) | models.Q(codebase=codebase)
+        )
+
+    @classmethod
+    def get_push_progress(cls, codebase) -> dict:
+        """counts of the codebase's git refs by sync status. `pushed` counts running refs that
+        have been pushed and are waiting for their GitHub release to be created
+        """
+        return cls.for_codebase_refs(codebase).aggregate(
+            total=models.Count("id"),
+            **{
+                status.lower(): models.Count("id", filter=models.Q(status=status))
+                for status in cls.Status.values
+            },
+            pushed=models.Count(
+                "id",
+                filter=models.Q(
+                    status=cls.Status.RUNNING,
+                    pushed_commit_sha=models.F("built_commit_sha"),
+                )
+                & ~models.Q(pushed_commit_sha=""),
+            ),
+        )
+
     @classmethod
     def start_all_push_jobs_for_codebase(cls, codebase, remote) -> bool:
         """set remotes and mark pushable refs (main + releases) as RUNNING"""
@@ -917,9 +1127,15 @@ class GitRefSyncState(BaseReleaseSyncState):
         self.save()
         return self
 
-    def record_push_success(self, commit_sha, summary=None):
+    def record_pushed_commit(self, commit_sha):
+        """checkpoint the pushed commit while the rest of the sync job is still running so that an
+        interrupted job can resume without pushing this ref again"""
         self.pushed_commit_sha = commit_sha
         self.save(update_fields=["pushed_commit_sha", "last_modified"])
+        return self
+
+    def record_push_success(self, commit_sha, summary=None):
+        self.record_pushed_commit(commit_sha)
         return self.log_success(summary)
 
     def can_push(self) -> bool:
@@ -1163,6 +1379,7 @@ class Codebase(index.Indexed, ModeratedContent, ClusterableModel):
         index.FilterField("id"),
         index.FilterField("all_release_frameworks"),
         index.FilterField("all_release_programming_languages"),
+        index.FilterField("tag_names"),
         index.FilterField("is_marked_spam"),
         index.FilterField("last_modified"),
         index.FilterField("peer_reviewed"),
@@ -1206,6 +1423,25 @@ class Codebase(index.Indexed, ModeratedContent, ClusterableModel):
     def concatenated_tags(self):
         return " ".join(self.tags.values_list("name", flat=True))
 
+    def get_metadata_keywords(self):
+        """
+        tag names sorted case insensitively, read from prefetched tagged_codebases if available
+        """
+        if "tagged_codebases" in getattr(self, "_prefetched_objects_cache", {}):
+            tagged_items = self.tagged_codebases.all()
+        else:
+            tagged_items = self.tagged_codebases.select_related("tag")
+        # order like the database collation does rather than by code point
+        return sorted(
+            (tagged_item.tag.name for tagged_item in tagged_items), key=str.casefold
+        )
+
+    @property
+    def tag_names(self):
+        """lowercased tag names for exact, case insensitive keyword filtering in search"""
+        # iterate over the through model so that with_tags() prefetches are used
+        return sorted({tc.tag.name.lower() for tc in self.tagged_codebases.all()})
+
     @property
     def deletable(self):
         return not self.live
@@ -1367,12 +1603,20 @@ class Codebase(index.Indexed, ModeratedContent, ClusterableModel):
         )
 
     def get_all_contributors_search_fields(self):
+        if hasattr(self, "search_contributor_fields"):
+            # annotated by CodebaseQuerySet.with_search_fields
+            return " ".join(
+                Contributor.join_search_fields(fields)
+                for fields in self.search_contributor_fields or []
+            )
         return " ".join(
             [c.get_aggregated_search_fields() for c in self.all_contributors]
         )
 
     @property
     def all_release_frameworks(self):
+        if hasattr(self, "search_release_frameworks"):
+            return self.search_release_frameworks or []
         return list(
             self.releases.exclude(platform_tags__isnull=True).values_list(
                 "platform_tags__name", flat=True
@@ -1381,6 +1625,8 @@ class Codebase(index.Indexed, ModeratedContent, ClusterableModel):
 
     @property
     def all_release_programming_languages(self):
+        if hasattr(self, "search_release_programming_languages"):
+            return self.search_release_programming_languages or []
         return list(
             self.releases.values_list(
                 "programming_languages__name", flat=True
@@ -1388,9 +1634,7 @@ class Codebase(index.Indexed, ModeratedContent, ClusterableModel):
         )
 
     def download_count(self):
-        return CodebaseReleaseDownload.objects.filter(
-            release__codebase__id=self.id
-        ).count()
+        return CodebaseReleaseDownloadCount.objects.for_codebase(self).total()
 
     def ordered_releases_list(
         self, has_change_perm=False, asc=True, internal_only=False, **kwargs
@@ -1642,15 +1886,91 @@ class Codebase(index.Indexed, ModeratedContent, ClusterableModel):
             logger.debug("Building codemeta for codebase: %s", self)
             self.codemeta_snapshot = self.codemeta.dict(serialize=True)
         super().save(**kwargs)
-        # saving releases will trigger metadata rebuilding and updating
-        # the fs and git mirror if one exists
+        # rebuilding release metadata also updates the fs and git mirror if one exists
         if rebuild_metadata and rebuild_release_metadata:
-            for release in self.releases.internal():
-                release.save(rebuild_metadata=True)
+            self.rebuild_release_metadata()
+        self.invalidate_page_cache()
+
+    # detail page fragments are orphaned by bumping the page cache version, download counts change
+    # with every download and are only cached briefly
+    PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+    DOWNLOAD_COUNT_CACHE_TIMEOUT = 60 * 15
+
+    @staticmethod
+    def get_page_cache_version_key(codebase_id):
+        return f"library.codebase.{codebase_id}.page_cache_version"
+
+    def get_page_cache_version(self):
+        """
+        current version of the cached detail page fragments for this codebase and its releases,
+        used as part of every fragment cache key
+        """
+        return cache.get_or_set(
+            self.get_page_cache_version_key(self.pk), time.time_ns, None
+        )
+
+    @classmethod
+    def invalidate_page_cache_by_id(cls, codebase_id):
+        """
+        orphan all cached detail page fragments for a codebase by bumping its page cache version
+        once the current transaction commits. Called whenever a codebase or release is saved,
+        which includes publishing, unpublishing, metadata rebuilds, DOI minting and spam marking
+        """
+        cls.invalidate_page_cache_by_ids([codebase_id])
+
+    @classmethod
+    def invalidate_page_cache_by_ids(cls, codebase_ids):
+        keys = [
+            cls.get_page_cache_version_key(codebase_id) for codebase_id in codebase_ids
+        ]
+        if keys:
+            transaction.on_commit(
+                lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), None)
+            )
+
+    @classmethod
+    def invalidate_page_cache_by_contributors(cls, contributors):
+        """
+        orphan the cached detail page fragments of every codebase that lists any of the given
+        contributors, their names and profile links are rendered into the cached fragments
+        """
+        cls.invalidate_page_cache_by_ids(
+            cls.objects.filter(
+                releases__codebase_contributors__contributor__in=contributors
+            )
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+
+    def invalidate_page_cache(self):
+        self.invalidate_page_cache_by_id(self.pk)
+
+    def rebuild_release_metadata(self):
+        """
+        regenerate codemeta snapshots for all internal releases in bulk and schedule a single
+        task that rebuilds the filesystem metadata and git mirror for the releases that changed
+        """
+        changed_release_ids = self.releases.internal().rebuild_codemeta_snapshots()
+        if changed_release_ids:
+            from .tasks import update_fs_codebase_release_metadata
+
+            logger.info(
+                "Queueing async metadata rebuild codebase_id=%s release_ids=%s",
+                self.id,
+                changed_release_ids,
+            )
+            transaction.on_commit(
+                lambda codebase_id=self.id: update_fs_codebase_release_metadata(
+                    codebase_id, changed_release_ids
+                )
+            )
+        return changed_release_ids
 
     @classmethod
     def get_indexed_objects(cls):
-        return cls.objects.public()
+        # same codebases as public() without its release contributor prefetch, search
+        # documents use the with_search_fields aggregates instead
+        return cls.objects.filter(live=True).exclude_spam().with_search_fields()
 
     def __str__(self):
         return f"[codebase] {self.title} {self.date_created} (identifier:{self.identifier}, live:{self.live})"
@@ -1744,6 +2064,59 @@ class CodebaseReleaseQuerySet(models.QuerySet):
     def with_submitter(self):
         return self.prefetch_related("submitter")
 
+    def with_adjacent_release_dois(self):
+        """annotate each release with the DOIs of the previous and next releases of its codebase"""
+        siblings = CodebaseRelease.objects.filter(codebase=OuterRef("codebase"))
+        return self.annotate(
+            previous_release_doi=Subquery(
+                siblings.filter(version_number__lt=OuterRef("version_number"))
+                .order_by("-version_number")
+                .values("doi")[:1]
+            ),
+            next_release_doi=Subquery(
+                siblings.filter(version_number__gt=OuterRef("version_number"))
+                .order_by("version_number")
+                .values("doi")[:1]
+            ),
+        )
+
+    def with_metadata(self):
+        """
+        load everything needed to generate CodeMeta, CFF and DataCite metadata for these
+        releases in a fixed number of queries regardless of how many releases there are
+        """
+        return (
+            self.select_related("codebase", "license")
+            .prefetch_related(*CodebaseRelease.get_metadata_prefetches())
+            .with_adjacent_release_dois()
+        )
+
+    def rebuild_codemeta_snapshots(self) -> list[int]:
+        """
+        regenerate codemeta_snapshot for all of these releases in a single pass and write the
+        ones that changed with bulk_update. Returns the ids of the changed releases
+
+        bulk_update skips auto_now and post_save, so last_modified (which incremental metrics
+        refreshes rely on) is set explicitly and the changed releases are queued for search
+        reindexing directly
+        """
+        from search.indexing import mark_dirty
+
+        now = timezone.now()
+        changed_releases = []
+        for release in self.with_metadata():
+            if release.codemeta.dict(serialize=True) != release.codemeta_snapshot:
+                release.last_modified = now
+                # regenerate so that dateModified matches the new last_modified
+                release.codemeta_snapshot = release.codemeta.dict(serialize=True)
+                changed_releases.append(release)
+        CodebaseRelease.objects.bulk_update(
+            changed_releases, ["codemeta_snapshot", "last_modified"], batch_size=100
+        )
+        changed_release_ids = [release.id for release in changed_releases]
+        mark_dirty(CodebaseRelease, *changed_release_ids)
+        return changed_release_ids
+
     def internal(self, **kwargs):
         """returns only releases that are locally uploaded and not archived from an external service"""
         return self.filter(imported_release_sync_state__isnull=True, **kwargs)
@@ -2247,7 +2620,120 @@ class CodebaseRelease(index.Indexed, ClusterableModel):
         )
 
     def download_count(self):
-        return self.downloads.count()
+        return self.download_counts.total()
+
+    METADATA_PREFETCH_CACHE_NAMES = (
+        "codebase_contributors",
+        "releaselanguage_set",
+        "tagged_release_platforms",
+    )
+
+    @classmethod
+    def get_metadata_prefetches(cls):
+        return [
+            Prefetch(
+                "codebase_contributors",
+                ReleaseContributor.objects.select_related(
+                    "contributor__user__member_profile"
+                ).order_by("index"),
+            ),
+            # contributor ORCID urls are read from their users' social accounts
+            "codebase_contributors__contributor__user__socialaccount_set",
+            Prefetch(
+                "releaselanguage_set",
+                ReleaseLanguage.objects.select_related("programming_language"),
+            ),
+            "tagged_release_platforms__tag",
+            "codebase__tagged_codebases__tag",
+        ]
+
+    def load_metadata(self):
+        """
+        (re)load this release's metadata relations in place, equivalent to fetching it via
+        CodebaseRelease.objects.with_metadata(). Previously prefetched relations are discarded
+        so that metadata is always generated from fresh data
+        """
+        self.clear_metadata()
+        prefetch_related_objects(
+            [self], "codebase", "license", *self.get_metadata_prefetches()
+        )
+        adjacent_release_dois = (
+            CodebaseRelease.objects.filter(pk=self.pk)
+            .with_adjacent_release_dois()
+            .values("previous_release_doi", "next_release_doi")
+            .first()
+        ) or {}
+        self.previous_release_doi = adjacent_release_dois.get("previous_release_doi")
+        self.next_release_doi = adjacent_release_dois.get("next_release_doi")
+
+    def clear_metadata(self):
+        """discard metadata relations loaded by load_metadata or with_metadata"""
+        prefetched = getattr(self, "_prefetched_objects_cache", {})
+        for cache_name in self.METADATA_PREFETCH_CACHE_NAMES:
+            prefetched.pop(cache_name, None)
+        if CodebaseRelease.codebase.is_cached(self):
+            getattr(self.codebase, "_prefetched_objects_cache", {}).pop(
+                "tagged_codebases", None
+            )
+        for attr in ("previous_release_doi", "next_release_doi"):
+            self.__dict__.pop(attr, None)
+
+    def get_metadata_release_languages(self):
+        """release languages with their programming languages, prefetched if available"""
+        if "releaselanguage_set" in getattr(self, "_prefetched_objects_cache", {}):
+            return self.releaselanguage_set.all()
+        return self.release_languages.select_related("programming_language")
+
+    def get_metadata_platforms(self):
+        """
+        platform tag names sorted case insensitively, read from prefetched
+        tagged_release_platforms if available
+        """
+        if "tagged_release_platforms" in getattr(self, "_prefetched_objects_cache", {}):
+            tagged_items = self.tagged_release_platforms.all()
+        else:
+            tagged_items = self.tagged_release_platforms.select_related("tag")
+        return sorted(
+            (tagged_item.tag.name for tagged_item in tagged_items), key=str.casefold
+        )
+
+    def get_metadata_release_contributors(self):
+        """
+        returns (authors, nonauthors) lists of release contributors ordered by index, read from
+        prefetched codebase_contributors if available or a single query otherwise
+        """
+        if "codebase_contributors" in getattr(self, "_prefetched_objects_cache", {}):
+            release_contributors = self.codebase_contributors.all()
+        else:
+            release_contributors = self.codebase_contributors.select_related(
+                "contributor__user__member_profile"
+            ).order_by("index")
+        authors = []
+        nonauthors = []
+        for release_contributor in release_contributors:
+            # mirrors ReleaseContributorQuerySet.authors()
+            if (
+                release_contributor.include_in_citation
+                or Role.AUTHOR in release_contributor.roles
+            ):
+                authors.append(release_contributor)
+            else:
+                nonauthors.append(release_contributor)
+        return authors, nonauthors
+
+    def get_adjacent_release_dois(self):
+        """
+        returns the (previous, next) release DOIs, using values annotated by
+        CodebaseReleaseQuerySet.with_adjacent_release_dois() if available
+        """
+        if "previous_release_doi" not in self.__dict__:
+            previous_release = self.get_previous_release()
+            next_release = self.get_next_release()
+            self.previous_release_doi = (
+                previous_release.doi if previous_release else None
+            )
+            self.next_release_doi = next_release.doi if next_release else None
+        return self.previous_release_doi, self.next_release_doi
 
     def get_previous_release(self):
         return (
@@ -2333,6 +2819,14 @@ class CodebaseRelease(index.Indexed, ClusterableModel):
         """a freshly generated CodeMeta object representing this release"""
         return CodeMetaConverter.convert_release(self)
 
+    def build_codemeta_snapshot(self) -> dict:
+        """generate serialized CodeMeta from freshly loaded metadata relations"""
+        self.load_metadata()
+        try:
+            return self.codemeta.dict(serialize=True)
+        finally:
+            self.clear_metadata()
+
     @property
     def cff(self):
         """an object representing this release in the Citation File Format"""
@@ -2552,17 +3046,17 @@ class CodebaseRelease(index.Indexed, ClusterableModel):
                 # save first so m2m/reverse relations used by codemeta generation can be accessed
                 # do not mess with the filesystem if this is a new release
                 super().save(**kwargs)
-                self.codemeta_snapshot = self.codemeta.dict(serialize=True)
+                self.codemeta_snapshot = self.build_codemeta_snapshot()
                 super().save(update_fields=["codemeta_snapshot"])
             else:
                 logger.debug("Building codemeta for release: %s", self)
                 old_codemeta = self.codemeta_snapshot
-                self.codemeta_snapshot = self.codemeta.dict(serialize=True)
+                self.codemeta_snapshot = self.build_codemeta_snapshot()
                 super().save(**kwargs)
 
                 if old_codemeta != self.codemeta_snapshot:
                     if defer_fs:
-                        from .tasks import update_fs_release_metadata
+                        from .tasks import schedule_fs_release_metadata_rebuild
 
                         # Schedule after transaction commit so the worker can reliably read the release row.
                         logger.info(
@@ -2572,12 +3066,13 @@ class CodebaseRelease(index.Indexed, ClusterableModel):
                             self.version_number,
                         )
                         transaction.on_commit(
-                            lambda release_id=self.id: update_fs_release_metadata(
+                            lambda release_id=self.id: schedule_fs_release_metadata_rebuild(
                                 release_id
                             )
                         )
                     else:
                         self.get_fs_api().rebuild_metadata()
+        Codebase.invalidate_page_cache_by_id(self.codebase_id)
 
     @classmethod
     def get_indexed_objects(cls):
@@ -3394,7 +3889,7 @@ class CommonMetadata:
         self.description = codebase.description.raw
         self.release_notes = release.release_notes.raw if release.release_notes else ""
         self.version = release.version_number
-        self.release_languages = release.release_languages.all()
+        self.release_languages = release.get_metadata_release_languages()
         self.os = release.os
         self.identifier = release.permanent_url
         self.url = release.permanent_url
@@ -3404,7 +3899,6 @@ class CommonMetadata:
         self.keywords = self.convert_keywords()
         self.runtime_platform = self.convert_platforms()
         self.download_url = release.get_download_url()
-        self.get_featured_rendition_url = codebase.get_featured_rendition_url()
 
         self.citations = [
             text
@@ -3444,10 +3938,10 @@ class CommonMetadata:
         self.permanent_url = release.permanent_url
 
     def convert_keywords(self):
-        return [tag.name for tag in self.codebase_release.codebase.tags.all()]
+        return self.codebase_release.codebase.get_metadata_keywords()
 
     def convert_platforms(self):
-        return [tag.name for tag in self.codebase_release.platform_tags.all()]
+        return self.codebase_release.get_metadata_platforms()
 
     @classmethod
     def default_license(cls):
@@ -3475,14 +3969,20 @@ class CommonMetadata:
         ]
 
     @cached_property
-    def release_contributor_nonauthors(self):
-        return ReleaseContributor.objects.nonauthors().for_release(
-            self.codebase_release
-        )
+    def get_featured_rendition_url(self):
+        return self.codebase_release.codebase.get_featured_rendition_url()
 
     @cached_property
+    def release_contributors_by_role(self):
+        return self.codebase_release.get_metadata_release_contributors()
+
+    @property
+    def release_contributor_nonauthors(self):
+        return self.release_contributors_by_role[1]
+
+    @property
     def release_contributor_authors(self):
-        return ReleaseContributor.objects.authors().for_release(self.codebase_release)
+        return self.release_contributors_by_role[0]
 
 
 class DataCiteSchema(ABC):
@@ -3724,25 +4224,26 @@ class ReleaseDataCiteSchema(DataCiteSchema):
         """
         Set relationships to siblings
         """
-        previous_release = common_metadata.codebase_release.get_previous_release()
-        next_release = common_metadata.codebase_release.get_next_release()
+        previous_release_doi, next_release_doi = (
+            common_metadata.codebase_release.get_adjacent_release_dois()
+        )
 
         # set relationship to previous_release
-        if previous_release and previous_release.doi:
+        if previous_release_doi:
             metadata["relatedIdentifiers"].append(
                 {
                     "relationType": "IsNewVersionOf",
-                    "relatedIdentifier": previous_release.doi,
+                    "relatedIdentifier": previous_release_doi,
                     "relatedIdentifierType": "DOI",
                 }
             )
 
         # set relationship to next_release
-        if next_release and next_release.doi:
+        if next_release_doi:
             metadata["relatedIdentifiers"].append(
                 {
                     "relationType": "IsPreviousVersionOf",
-                    "relatedIdentifier": next_release.doi,
+                    "relatedIdentifier": next_release_doi,
                     "relatedIdentifierType": "DOI",
                 }
             )
@@ -2,7 +2,7 @@ import logging
 from collections import defaultdict
 from urllib.parse import parse_qs, urlparse
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
@@ -39,6 +39,7 @@ from .models import (
     Codebase,
     CodebaseRelease,
     CodebaseReleaseDownload,
+    CodebaseReleaseDownloadCount,
     Contributor,
     License,
     ProgrammingLanguage,
@@ -632,7 +633,9 @@ class DownloadRequestSerializer(serializers.ModelSerializer):
         # update user's profile to reflect information provided
         if instance.user and save_to_profile:
             self.update_profile(instance, industry, affiliation)
-        instance.save()
+        with transaction.atomic():
+            instance.save()
+            CodebaseReleaseDownloadCount.objects.increment(instance)
         return instance
 
     def update_profile(self, instance, industry, affiliation):
@@ -0,0 +1,120 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from core.models import MemberProfile
+
+from .models import (
+    Codebase,
+    CodebaseRelease,
+    CodebaseReleasePlatformTag,
+    Contributor,
+    ReleaseLanguage,
+)
+
+logger = logging.getLogger(__name__)
+
+# User fields rendered into cached codebase detail page fragments via Contributor.get_full_name
+CONTRIBUTOR_USER_FIELDS = frozenset({"first_name", "last_name"})
+
+
+def on_contributor_change(sender, instance: Contributor, **kwargs):
+    Codebase.invalidate_page_cache_by_contributors([instance])
+
+
+def on_user_change(sender, instance: User, update_fields=None, **kwargs):
+    # skip frequent partial saves that do not touch contributor names, e.g. last_login updates
+    if update_fields is not None and not CONTRIBUTOR_USER_FIELDS.intersection(
+        update_fields
+    ):
+        return
+    Codebase.invalidate_page_cache_by_contributors(
+        Contributor.objects.filter(user=instance)
+    )
+
+
+def on_member_profile_change(sender, instance: MemberProfile, **kwargs):
+    Codebase.invalidate_page_cache_by_contributors(
+        Contributor.objects.filter(user_id=instance.user_id)
+    )
+
+
+def touch_releases(release_ids):
+    """
+    platform tags and release languages live in through rows, changing them does not update the
+    release. Bump last_modified so that incremental metrics refreshes (see
+    home.metrics.Metrics.get_changed_years) recount the releases' years
+    """
+    release_ids = [release_id for release_id in release_ids if release_id is not None]
+    if release_ids:
+        CodebaseRelease.objects.filter(pk__in=release_ids).update(
+            last_modified=timezone.now()
+        )
+
+
+def on_release_language_change(sender, instance: ReleaseLanguage, **kwargs):
+    touch_releases([instance.release_id])
+
+
+def on_release_platform_tag_change(
+    sender, instance: CodebaseReleasePlatformTag, **kwargs
+):
+    touch_releases([instance.content_object_id])
+
+
+def on_release_categories_m2m_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """m2m add / remove / clear bulk create and delete through rows without save signals"""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # instance is the tag or programming language, pk_set holds release ids
+        touch_releases(pk_set or [])
+    else:
+        touch_releases([instance.pk])
+
+
+def register_signal_handlers():
+    post_save.connect(
+        on_contributor_change,
+        sender=Contributor,
+        dispatch_uid="library_page_cache_contributor",
+    )
+    post_save.connect(
+        on_user_change, sender=User, dispatch_uid="library_page_cache_user"
+    )
+    post_save.connect(
+        on_member_profile_change,
+        sender=MemberProfile,
+        dispatch_uid="library_page_cache_member_profile",
+    )
+    post_save.connect(
+        on_release_language_change,
+        sender=ReleaseLanguage,
+        dispatch_uid="library_metrics_release_language_save",
+    )
+    post_delete.connect(
+        on_release_language_change,
+        sender=ReleaseLanguage,
+        dispatch_uid="library_metrics_release_language_delete",
+    )
+    post_save.connect(
+        on_release_platform_tag_change,
+        sender=CodebaseReleasePlatformTag,
+        dispatch_uid="library_metrics_release_platform_tag_save",
+    )
+    post_delete.connect(
+        on_release_platform_tag_change,
+        sender=CodebaseReleasePlatformTag,
+        dispatch_uid="library_metrics_release_platform_tag_delete",
+    )
+    for through in (ReleaseLanguage, CodebaseReleasePlatformTag):
+        m2m_changed.connect(
+            on_release_categories_m2m_change,
+            sender=through,
+            dispatch_uid=f"library_metrics_m2m_{through._meta.label_lower}",
+        )
+    logger.debug("registered codebase page cache and release metrics signal handlers")
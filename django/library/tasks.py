@@ -1,5 +1,9 @@
-from huey.contrib.djhuey import db_task, on_commit_task
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from huey.contrib.djhuey import HUEY, db_task, on_commit_task
+from huey.exceptions import TaskLockedException
 from django.conf import settings
+from django.utils import timezone
 
 from .models import (
     Codebase,
@@ -8,7 +12,7 @@ from .models import (
     GitRefSyncState,
     ImportedReleaseSyncState,
 )
-from .github_integration import GitHubApi
+from .github_integration import GitHubApi, list_github_releases_for_remote
 from .fs import CodebaseGitRepositoryApi
 
 import logging
@@ -90,9 +94,38 @@ def update_local_repo_release_branch(release_id: int):
     local_repo = git_fs_api.update_release_branch(release)
 
 
+# number of GitHub releases created concurrently by push_all_releases_to_github
+PUSH_RELEASE_CONCURRENCY = 4
+
+
+def get_push_lock_name(codebase_id: int) -> str:
+    return f"push-all-releases-{codebase_id}"
+
+
+def _format_push_summary(lines: list[str]) -> str:
+    return f"[{timezone.now().isoformat()}]:\n" + "\n".join(lines or ["no refs pushed"])
+
+
 @db_task(retries=1, retry_delay=30)
 def push_all_releases_to_github(codebase_id: int, remote_id: int):
-    """Manually push all releases to GitHub for a remote, one-by-one."""
+    """Push the main branch and all release refs with RUNNING sync states to GitHub.
+
+    All pending refs are pushed in a single multi-refspec push, then GitHub releases are
+    created concurrently. Each GitRefSyncState is checkpointed as it progresses (pushed commit
+    recorded after the push, SUCCESS once its GitHub release exists) so that a retried or
+    resumed job skips refs that were already pushed. Progress is available via
+    GitRefSyncState.get_push_progress
+    """
+    try:
+        with HUEY.lock_task(get_push_lock_name(codebase_id)):
+            _push_all_releases_to_github(codebase_id, remote_id)
+    except TaskLockedException:
+        logger.info(
+            "push already in progress for codebase_id=%s, skipping", codebase_id
+        )
+
+
+def _push_all_releases_to_github(codebase_id: int, remote_id: int):
     codebase = Codebase.objects.get(id=codebase_id)
     remote = CodebaseGitRemote.objects.get(id=remote_id, codebase__id=codebase_id)
     git_fs_api = CodebaseGitRepositoryApi(codebase)
@@ -105,38 +138,123 @@ def push_all_releases_to_github(codebase_id: int, remote_id: int):
         remote.url = repo.html_url
         remote.save(update_fields=["url", "last_modified"])
 
-    # push main first if job started
+    local_branches = {head.name: head for head in local_repo.heads}
+    local_tags = {tag.name for tag in local_repo.tags}
+    refspecs: list[str] = []
+
     main_state = GitRefSyncState.for_codebase(codebase)
-    if main_state.status == GitRefSyncState.Status.RUNNING:
-        try:
-            commit_sha, summary = gh_api.push_main(local_repo)
-            main_state.record_push_success(commit_sha, summary)
-        except Exception as e:
-            main_state.log_failure(str(e))
-            logger.exception("Failed to push main: %s", e)
+    main_branch = local_branches.get(CodebaseGitRepositoryApi.DEFAULT_BRANCH_NAME)
+    push_main = main_state.status == GitRefSyncState.Status.RUNNING
+    if push_main:
+        if main_branch is None:
+            main_state.log_failure(_format_push_summary(["main: not found locally"]))
+            push_main = False
+        else:
+            refspecs.append(
+                f"refs/heads/{main_branch.name}:refs/heads/{main_branch.name}"
+            )
 
-    # iterate releases in ascending semver order
-    releases = codebase.ordered_releases_list(internal_only=True, asc=True)
-    for release in releases:
+    # collect running release jobs in ascending semver order
+    jobs = []
+    for release in codebase.ordered_releases_list(internal_only=True, asc=True):
         state = release.get_or_create_git_ref_sync_state()
         # skip if job not started
         if state.status != GitRefSyncState.Status.RUNNING:
             continue
-        try:
-            commit_sha, summary = gh_api.push_release(
-                local_repo,
-                release,
-                branch_name=state.branch_name,
-                tag_name=state.tag_name,
+        branch_name = state.branch_name or (
+            f"{CodebaseGitRepositoryApi.RELEASE_BRANCH_PREFIX}{release.version_number}"
+        )
+        tag_name = state.tag_name or release.version_number
+        branch = local_branches.get(branch_name)
+        if branch is None:
+            state.log_failure(f"missing local branch for release: {branch_name}")
+            continue
+        summary = []
+        if state.pushed_commit_sha == branch.commit.hexsha:
+            # checkpointed by an earlier, interrupted run
+            summary.append(f"branch ({branch_name}): previously pushed")
+        else:
+            branch_refspec, tag_refspec = GitHubApi.get_release_refspecs(
+                branch_name, tag_name
             )
-            # create a release for this tag on GitHub if needed
-            gh_api.create_release_for_tag(local_repo, release.version_number)
-            state.record_push_success(commit_sha, summary)
-        except Exception as e:
+            refspecs.append(branch_refspec)
+            if tag_name in local_tags:
+                refspecs.append(tag_refspec)
+            else:
+                summary.append(f"tag ({tag_name}): not found locally")
+        jobs.append((release, state, branch, branch_name, tag_name, summary))
+
+    # push every pending ref at once
+    try:
+        pushed = gh_api.push_refspecs(local_repo, refspecs)
+    except Exception as e:
+        logger.exception("Failed to push refs for codebase_id=%s: %s", codebase_id, e)
+        if push_main:
+            main_state.log_failure(str(e))
+        for _, state, _, _, _, _ in jobs:
             state.log_failure(str(e))
-            # continue with remaining releases, keeping per-release isolation
-            logger.exception("Failed to push release %s: %s", release.version_number, e)
+        return
+
+    if push_main:
+        if pushed.get(f"refs/heads/{main_branch.name}"):
+            main_state.record_push_success(
+                main_branch.commit.hexsha,
+                _format_push_summary(["main: successfully pushed"]),
+            )
+        else:
+            main_state.log_failure(_format_push_summary(["main: did not push"]))
+
+    # checkpoint pushed release refs, releases are created for those only
+    pending_releases = []
+    for release, state, branch, branch_name, tag_name, summary in jobs:
+        branch_ref = f"refs/heads/{branch_name}"
+        if branch_ref in pushed:
+            if not pushed[branch_ref]:
+                summary.append(f"branch ({branch_name}): did not push")
+                state.log_failure(_format_push_summary(summary))
+                continue
+            summary.append(f"branch ({branch_name}): successfully pushed")
+            state.record_pushed_commit(branch.commit.hexsha)
+        elif state.pushed_commit_sha != branch.commit.hexsha:
+            summary.append(f"branch ({branch_name}): did not push")
+            state.log_failure(_format_push_summary(summary))
             continue
+        pending_releases.append(
+            (
+                release,
+                state,
+                branch,
+                summary,
+                GitHubApi.get_tag_message(local_repo, release.version_number),
+            )
+        )
+
+    # create GitHub releases concurrently, the threads only talk to the GitHub API and all
+    # database and local repository access stays on this thread
+    with ThreadPoolExecutor(max_workers=PUSH_RELEASE_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(
+                gh_api.create_release_for_tag,
+                local_repo,
+                release.version_number,
+                message,
+            ): (release, state, branch, summary)
+            for release, state, branch, summary, message in pending_releases
+        }
+        for future in as_completed(futures):
+            release, state, branch, summary = futures[future]
+            try:
+                future.result()
+                state.record_push_success(
+                    branch.commit.hexsha, _format_push_summary(summary)
+                )
+            except Exception as e:
+                # keep per-release isolation, the pushed commit checkpoint is kept so that
+                # a retry only needs to create the release
+                state.log_failure(str(e))
+                logger.exception(
+                    "Failed to create GitHub release %s: %s", release.version_number, e
+                )
 
 
 @db_task(retries=1, retry_delay=30)
@@ -179,6 +297,96 @@ def update_fs_release_metadata(release_id: int):
         update_local_repo_release_branch(release_id)
 
 
+def schedule_fs_release_metadata_rebuild(release_id: int):
+    """debounced update_fs_release_metadata, rapid successive edits to a release only
+    rebuild its filesystem metadata once
+    """
+    return HUEY.enqueue_coalesced(
+        update_fs_release_metadata, f"release:{release_id}", release_id
+    )
+
+
+@db_task(retries=1, retry_delay=30)
+def build_release_archive(release_id: int):
+    """build the archive.zip of a published release whose archive is missing, e.g., one that was
+    streamed to a client straight from its submission package
+    """
+    release = CodebaseRelease.objects.filter(id=release_id).first()
+    if release is None or not release.is_published:
+        return
+    release.get_fs_api().build_archive()
+
+
+def schedule_release_archive_build(release_id: int):
+    """debounced build_release_archive, concurrent downloads of a release with a missing archive
+    only build it once
+    """
+    return HUEY.enqueue_coalesced(
+        build_release_archive, f"archive:{release_id}", release_id
+    )
+
+
+@db_task(retries=1, retry_delay=30)
+def refresh_github_releases(remote_id: int):
+    """revalidate the cached GitHub release listing of a remote and upsert its import sync states"""
+    remote = CodebaseGitRemote.objects.filter(id=remote_id).first()
+    if remote is None:
+        return
+    list_github_releases_for_remote(remote, refresh=True)
+
+
+def schedule_github_releases_refresh(remote_id: int):
+    """debounced refresh_github_releases, a burst of release events for a repository (e.g.,
+    created and then published) only refreshes its listing once
+    """
+    return HUEY.enqueue_coalesced(
+        refresh_github_releases, f"remote:{remote_id}", remote_id
+    )
+
+
+@db_task(retries=1, retry_delay=30)
+def update_fs_codebase_release_metadata(codebase_id: int, release_ids: list[int]):
+    """rebuild the filesystem metadata and git mirror release branches of several releases of a
+    codebase together, scheduled once per codebase save instead of once per release
+    """
+    logger.info(
+        "Starting metadata rebuild task codebase_id=%s release_ids=%s",
+        codebase_id,
+        release_ids,
+    )
+    releases = list(
+        CodebaseRelease.objects.filter(codebase_id=codebase_id, id__in=release_ids)
+        .select_related("codebase", "git_ref_sync_state")
+        .order_by("id")
+    )
+    failed_release_ids = []
+    for release in releases:
+        try:
+            release.get_fs_api().rebuild_metadata()
+        except Exception:
+            logger.exception(
+                "Metadata rebuild failed release_id=%s codebase_id=%s version=%s",
+                release.id,
+                codebase_id,
+                release.version_number,
+            )
+            failed_release_ids.append(release.id)
+    mirrored_releases = [
+        release
+        for release in releases
+        if release.id not in failed_release_ids
+        and release.is_published
+        and getattr(release, "git_ref_sync_state", None)
+    ]
+    if mirrored_releases:
+        git_fs_api = CodebaseGitRepositoryApi(releases[0].codebase)
+        git_fs_api.update_release_branches(mirrored_releases)
+    if failed_release_ids:
+        raise RuntimeError(
+            f"Metadata rebuild failed for releases {failed_release_ids} of codebase {codebase_id}"
+        )
+
+
 @on_commit_task()
 def schedule_mint_public_doi(release_id: int, dry_run: bool = False):
     """
@@ -1,5 +1,9 @@
+import zipfile
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
 from git import Repo
+from django.core.files.base import ContentFile
 from django.test import TestCase
 from django.conf import settings
 
@@ -15,9 +19,18 @@ from library.fs import (
     MessageLevels,
     import_archive,
     CodebaseGitRepositoryApi,
+    ContentAddressedBlobStore,
 )
+from library.github_integration import GitHubApi
+from library.tasks import push_all_releases_to_github
 from library.tests.base import CodebaseFactory, TEST_SAMPLES_DIR
-from library.models import License, GitRefSyncState, ProgrammingLanguage
+from library.models import (
+    Codebase,
+    CodebaseGitRemote,
+    License,
+    GitRefSyncState,
+    ProgrammingLanguage,
+)
 
 
 import logging
@@ -89,6 +102,163 @@ class ArchiveExtractorTestCase(TestCase):
         cls.nested_code_folder.with_suffix(".zip").unlink(missing_ok=True)
 
 
+class ReleaseArchiveTestCase(TestCase):
+    def setUp(self):
+        self.user_factory = UserFactory()
+        self.submitter = self.user_factory.create()
+        self.codebase_factory = CodebaseFactory(submitter=self.submitter)
+        self.release = self.codebase_factory.create_published_release()
+        self.fs_api = self.release.get_fs_api()
+
+    def test_archive_built_from_sip(self):
+        self.assertTrue(self.fs_api.archivepath.exists())
+        # the aip is kept as the preservation copy of the sip
+        self.assertTrue(self.fs_api.aip_dir.joinpath("bagit.txt").exists())
+        with zipfile.ZipFile(self.fs_api.archivepath) as archive:
+            names = archive.namelist()
+            self.assertIsNone(archive.testzip())
+            self.assertTrue(
+                all(
+                    info.compress_type == zipfile.ZIP_STORED
+                    for info in archive.infolist()
+                )
+            )
+        sip_files = {str(p) for p in self.fs_api.get_sip_storage().list()}
+        self.assertEqual(set(names), sip_files)
+        # metadata files are written last so they can be replaced without rewriting the rest
+        self.assertEqual(names[-1], "LICENSE")
+
+    def test_rebuild_metadata_reuses_unchanged_entries(self):
+        with zipfile.ZipFile(self.fs_api.archivepath) as archive:
+            offsets = {info.filename: info.header_offset for info in archive.infolist()}
+        self.release.release_notes = "Updated release notes"
+        self.release.save()
+        self.fs_api.rebuild_metadata()
+        with zipfile.ZipFile(self.fs_api.archivepath) as archive:
+            self.assertIsNone(archive.testzip())
+            for info in archive.infolist():
+                if info.filename.startswith("code/"):
+                    self.assertEqual(info.header_offset, offsets[info.filename])
+            self.assertEqual(
+                archive.read("codemeta.json").decode("utf-8"),
+                self.fs_api.codemeta_path.read_text(encoding="utf-8"),
+            )
+
+    def test_aip_shares_unchanged_sip_files(self):
+        self.fs_api.rebuild_metadata()
+        sip_files = [p for p in self.fs_api.sip_contents_dir.rglob("*") if p.is_file()]
+        self.assertTrue(sip_files)
+        for sip_path in sip_files:
+            relpath = sip_path.relative_to(self.fs_api.sip_dir)
+            aip_path = self.fs_api.aip_dir.joinpath(relpath)
+            self.assertEqual(aip_path.read_bytes(), sip_path.read_bytes())
+            if sip_path.parent != self.fs_api.sip_contents_dir:
+                self.assertTrue(aip_path.samefile(sip_path))
+        # nothing changed since the last sync
+        self.assertEqual(self.fs_api.build_aip(), 0)
+
+
+class SipFileManifestTestCase(TestCase):
+    def setUp(self):
+        self.user_factory = UserFactory()
+        self.submitter = self.user_factory.create()
+        self.codebase_factory = CodebaseFactory(submitter=self.submitter)
+        self.release = self.codebase_factory.create_published_release()
+        self.fs_api = self.release.get_fs_api()
+
+    def test_manifest_matches_sip(self):
+        entries = self.release.file_manifest.entries
+        sip_files = {str(p) for p in self.fs_api.get_sip_storage().list()}
+        self.assertEqual(set(entries), sip_files)
+        entry = entries["code/some_code_file.py"]
+        path = self.fs_api.sip_contents_dir.joinpath("code", "some_code_file.py")
+        self.assertEqual(entry["category"], "code")
+        self.assertEqual(entry["size"], path.stat().st_size)
+        self.assertEqual(entry["sha256"], ContentAddressedBlobStore.hash_file(path))
+        self.assertEqual(entries["codemeta.json"]["category"], "metadata")
+
+    def test_listing_does_not_touch_filesystem(self):
+        fs_api = self.release.get_fs_api()
+        with self.assertNumQueries(1):
+            contents = fs_api.list_sip_contents()
+            self.assertTrue(fs_api.check_category_file_exists(FileCategories.code))
+        labels = {item["label"] for item in contents["contents"]}
+        self.assertTrue({"code", "docs", "codemeta.json"} <= labels)
+        # files removed behind the api's back are still listed until the next rescan
+        self.fs_api.sip_contents_dir.joinpath("docs", "some_doc_file.md").unlink()
+        self.assertTrue(fs_api.check_category_file_exists(FileCategories.docs))
+
+    def test_mutations_update_manifest(self):
+        self.fs_api.delete(FileCategories.docs, Path("some_doc_file.md"))
+        self.assertFalse(self.fs_api.check_category_file_exists(FileCategories.docs))
+        self.fs_api.clear_category(FileCategories.code)
+        self.assertEqual(
+            self.fs_api.list(StagingDirectories.sip, FileCategories.code), []
+        )
+        self.release.file_manifest.refresh_from_db()
+        self.assertNotIn("code/some_code_file.py", self.release.file_manifest.entries)
+
+    def test_deferred_changes_are_saved_once(self):
+        manifest = self.fs_api.file_manifest
+        with patch.object(manifest, "_save", wraps=manifest._save) as save:
+            with manifest.deferred():
+                for name in ("first.py", "second.py"):
+                    self.fs_api.add(
+                        FileCategories.code, ContentFile(b"print()", name=name)
+                    )
+                self.fs_api.delete(FileCategories.docs, Path("some_doc_file.md"))
+                save.assert_not_called()
+            save.assert_called_once()
+        self.assertEqual(
+            self.fs_api.list(StagingDirectories.sip, FileCategories.code),
+            ["first.py", "second.py", "some_code_file.py"],
+        )
+        self.assertFalse(self.fs_api.check_category_file_exists(FileCategories.docs))
+
+    def test_missing_manifest_is_rebuilt(self):
+        self.release.file_manifest.delete()
+        fs_api = self.release.get_fs_api()
+        self.assertEqual(
+            fs_api.list(StagingDirectories.sip, FileCategories.code),
+            ["some_code_file.py"],
+        )
+
+
+class ContentAddressedBlobStoreTestCase(TestCase):
+    def setUp(self):
+        self.user_factory = UserFactory()
+        self.submitter = self.user_factory.create()
+        self.codebase_factory = CodebaseFactory(submitter=self.submitter)
+        self.release = self.codebase_factory.create_published_release()
+
+    def test_copied_originals_share_blobs(self):
+        review_draft = self.release.codebase.create_review_draft_from_release(
+            self.release
+        )
+        source_api = self.release.get_fs_api()
+        draft_api = review_draft.get_fs_api()
+        relpath = Path("code", "some_code_file.py")
+        for stage_dir in ("originals_dir", "sip_contents_dir"):
+            source_stat = getattr(source_api, stage_dir).joinpath(relpath).stat()
+            draft_stat = getattr(draft_api, stage_dir).joinpath(relpath).stat()
+            self.assertEqual(source_stat.st_ino, draft_stat.st_ino)
+        # deduplicating again is a no-op
+        self.assertEqual(draft_api.deduplicate(), 0)
+
+    def test_collect_garbage(self):
+        # isolated store, blobs must be on the same filesystem as the release files
+        with TemporaryDirectory(dir=settings.LIBRARY_ROOT) as blob_root:
+            blob_store = ContentAddressedBlobStore(root=blob_root)
+            fs_api = self.release.get_fs_api()
+            fs_api.deduplicate(blob_store=blob_store)
+            path = fs_api.originals_dir.joinpath("code", "some_code_file.py")
+            blob = blob_store.blob_path(blob_store.hash_file(path))
+            self.assertTrue(blob.exists())
+            fs_api.delete(FileCategories.code, Path("some_code_file.py"))
+            blob_store.collect_garbage()
+            self.assertFalse(blob.exists())
+
+
 class GitRepoApiTestCase(TestCase):
     model_dir = TEST_SAMPLES_DIR / "releases" / "animals-model"
     release_1_dir = model_dir / "1.0.0"
@@ -169,6 +339,25 @@ class GitRepoApiTestCase(TestCase):
                 )
             )
 
+    def test_update_release_branch_stages_only_changed_files(self):
+        update_release_from_sample(
+            self.release_1, self.release_1_dir, version_number="1.0.0"
+        )
+        self.release_1.publish()
+        api = CodebaseGitRepositoryApi(self.codebase)
+        api.build()
+        self.release_1.release_notes = "Updated release notes"
+        self.release_1.save(defer_fs=False)
+        repo = api.update_release_branch(self.release_1)
+        self.assertIsNotNone(repo)
+        self.assertFalse(repo.is_dirty())
+        commit = repo.heads[api.get_release_branch_name(self.release_1)].commit
+        changed_files = set(commit.stats.files)
+        self.assertIn("codemeta.json", changed_files)
+        self.assertTrue(changed_files <= {"codemeta.json", "CITATION.cff", "LICENSE"})
+        # nothing left to stage
+        self.assertIsNone(api.update_release_branch(self.release_1))
+
     def test_will_not_append_lower_version(self):
         # publish 2.0.0 first and build
         update_release_from_sample(
@@ -215,6 +404,96 @@ class GitRepoApiTestCase(TestCase):
             )
 
 
+class PushAllReleasesTestCase(TestCase):
+    def setUp(self):
+        self.submitter = UserFactory().create()
+        self.codebase = CodebaseFactory(submitter=self.submitter).create()
+        for version_number in ["1.0.0", "2.0.0"]:
+            release = self.codebase.create_release()
+            update_release_from_sample(
+                release,
+                GitRepoApiTestCase.model_dir / version_number,
+                version_number=version_number,
+            )
+            release.publish()
+        self.remote = CodebaseGitRemote.objects.create(
+            codebase=self.codebase,
+            owner="comses-models",
+            repo_name="animals",
+            is_active=True,
+        )
+        # push to a local bare repository standing in for github
+        origin_dir = TemporaryDirectory()
+        self.addCleanup(origin_dir.cleanup)
+        self.origin = Repo.init(origin_dir.name, bare=True)
+
+        def get_origin(api, local_repo):
+            if "origin" not in local_repo.remotes:
+                local_repo.create_remote("origin", origin_dir.name)
+            return local_repo.remote(name="origin")
+
+        github_repo = MagicMock(html_url="https://github.com/comses-models/animals")
+        patchers = [
+            patch.object(
+                GitHubApi, "get_origin", autospec=True, side_effect=get_origin
+            ),
+            patch.object(GitHubApi, "get_or_create_repo", return_value=github_repo),
+            patch.object(GitHubApi, "create_release_for_tag"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.create_release_for_tag = GitHubApi.create_release_for_tag
+
+    def tearDown(self):
+        clear_test_shared_folder(settings.REPOSITORY_ROOT)
+
+    def get_release_state(self, version_number):
+        return GitRefSyncState.objects.get(
+            release__codebase=self.codebase, release__version_number=version_number
+        )
+
+    def push_all(self):
+        codebase = Codebase.objects.get(pk=self.codebase.pk)
+        self.assertTrue(
+            GitRefSyncState.start_all_push_jobs_for_codebase(codebase, self.remote)
+        )
+        push_all_releases_to_github.call_local(self.codebase.id, self.remote.id)
+
+    def test_push_all_and_resume(self):
+        self.create_release_for_tag.side_effect = lambda repo, tag, message: (
+            self.fail_release(tag)
+        )
+        self.push_all()
+        self.assertEqual({tag.name for tag in self.origin.tags}, {"1.0.0", "2.0.0"})
+        self.assertIn("main", self.origin.heads)
+        failed = self.get_release_state("1.0.0")
+        self.assertEqual(failed.status, GitRefSyncState.Status.ERROR)
+        # the pushed commit is checkpointed even though creating the release failed
+        self.assertEqual(failed.pushed_commit_sha, failed.built_commit_sha)
+        self.assertEqual(
+            self.get_release_state("2.0.0").status, GitRefSyncState.Status.SUCCESS
+        )
+        progress = GitRefSyncState.get_push_progress(self.codebase)
+        self.assertEqual(
+            (progress["total"], progress["success"], progress["error"]), (3, 2, 1)
+        )
+
+        # resuming only creates the missing release without pushing the ref again
+        self.create_release_for_tag.side_effect = None
+        self.create_release_for_tag.reset_mock()
+        self.push_all()
+        self.create_release_for_tag.assert_called_once()
+        resumed = self.get_release_state("1.0.0")
+        self.assertEqual(resumed.status, GitRefSyncState.Status.SUCCESS)
+        self.assertIn("previously pushed", resumed.last_log)
+
+    @staticmethod
+    def fail_release(tag):
+        if tag == "1.0.0":
+            raise ValueError("GitHub API error")
+
+
 def tearDownModule():
     destroy_test_shared_folders()
 
@@ -1,14 +1,19 @@
+import time
 from unittest.mock import patch, MagicMock
+from django.core.cache import cache
 from django.test import TestCase
 from github.GithubException import UnknownObjectException
 
 from core.tests.base import UserFactory
 from library.github_integration import (
+    GITHUB_RELEASES_MAX_AGE,
     GitHubApi,
     GitHubRepoValidator,
     GitHubReleaseImporter,
     _serialize_github_release_listing_item,
     extract_semver,
+    get_github_releases_cache_key,
+    list_github_releases_for_remote,
 )
 from library.models import (
     CodebaseGitRemote,
@@ -386,3 +391,74 @@ class GitHubIntegrationHelpersTests(TestCase):
             draft=False,
             prerelease=False,
         )
+
+
+class GitHubReleaseListingTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory().create()
+        self.codebase = CodebaseFactory(submitter=self.user).create()
+        self.remote = CodebaseGitRemote.objects.create(
+            codebase=self.codebase,
+            owner="testuser",
+            repo_name="test-repo",
+            is_user_repo=True,
+            is_active=True,
+        )
+        cache_key = get_github_releases_cache_key(self.remote.id)
+        cache.delete(cache_key)
+        self.addCleanup(cache.delete, cache_key)
+        patcher = patch(
+            "library.github_integration.GitHubApi.get_installation_access_token_for_remote",
+            return_value="token",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def mock_response(self, status_code=200, releases=None, etag='"abc"'):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = {"ETag": etag}
+        response.links = {}
+        response.json.return_value = releases or []
+        return response
+
+    @patch("library.tasks.schedule_github_releases_refresh")
+    @patch("library.github_integration.requests.Session.get")
+    def test_listing_is_cached_and_revalidated_with_etag(self, mock_get, mock_refresh):
+        # a cold cache is refreshed in the background instead of on page load
+        self.assertEqual(list_github_releases_for_remote(self.remote), [])
+        mock_refresh.assert_called_once_with(self.remote.id)
+        mock_get.assert_not_called()
+
+        mock_get.return_value = self.mock_response(releases=[SAMPLE_PAYLOAD["release"]])
+        releases = list_github_releases_for_remote(self.remote, refresh=True)
+        self.assertEqual([r["id"] for r in releases], ["12345"])
+        self.assertEqual(
+            releases[0]["imported_sync_state"]["status"],
+            ImportedReleaseSyncState.Status.PENDING,
+        )
+        # served from the cache on subsequent page loads
+        mock_refresh.reset_mock()
+        with self.assertNumQueries(1):
+            list_github_releases_for_remote(self.remote)
+        self.assertEqual(mock_get.call_count, 1)
+        mock_refresh.assert_not_called()
+
+        # stale listings are still served while they are revalidated in the background
+        with patch(
+            "library.github_integration.time.time",
+            return_value=time.time() + GITHUB_RELEASES_MAX_AGE,
+        ):
+            releases = list_github_releases_for_remote(self.remote)
+        self.assertEqual([r["id"] for r in releases], ["12345"])
+        self.assertEqual(mock_get.call_count, 1)
+        mock_refresh.assert_called_once_with(self.remote.id)
+
+        # an explicit refresh sends the etag and reuses the cached page on 304
+        mock_get.return_value = self.mock_response(status_code=304)
+        releases = list_github_releases_for_remote(self.remote, refresh=True)
+        self.assertEqual([r["id"] for r in releases], ["12345"])
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"], {"If-None-Match": '"abc"'}
+        )
+        self.assertEqual(ImportedReleaseSyncState.objects.count(), 1)
@@ -1,13 +1,22 @@
 import logging
+from unittest.mock import patch
 
 from codemeticulous.cff.models import LicenseEnum
 from django.test import TestCase
 from core.tests.base import BaseModelTestCase, UserFactory
 from .base import (
     CodebaseFactory,
+    ContributorFactory,
+    ReleaseContributorFactory,
     ReleaseSetup,
 )
-from library.metadata import CodeMeta, CodeMetaConverter, ReleaseMetadataConverter
+from library.metadata import (
+    CodeMeta,
+    CodeMetaConverter,
+    DataCiteConverter,
+    ReleaseMetadataConverter,
+)
+from library.models import CodebaseRelease
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +63,38 @@ class CodebaseMetadataTestCase(BaseModelTestCase):
         new_datacite_metadata = self.codebase.datacite_temp.dict(serialize=True)
         self.assertNotEqual(old_datacite_metadata, new_datacite_metadata)
 
+    @patch("search.indexing.mark_dirty")
+    @patch("library.tasks.update_fs_codebase_release_metadata")
+    def test_codebase_save_rebuilds_release_metadata_in_bulk(
+        self, rebuild_task, mark_dirty
+    ):
+        release2 = CodebaseFactory(submitter=self.submitter).create_published_release(
+            codebase=self.codebase
+        )
+        last_modified = {
+            release.id: release.last_modified
+            for release in self.codebase.releases.all()
+        }
+        self.codebase.title = "Updated codebase title"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.codebase.save()
+        rebuild_task.assert_called_once()
+        codebase_id, release_ids = rebuild_task.call_args.args
+        self.assertEqual(codebase_id, self.codebase.id)
+        self.assertEqual(set(release_ids), {self.release1.id, release2.id})
+        model, *dirty_ids = mark_dirty.call_args.args
+        self.assertEqual(model, CodebaseRelease)
+        self.assertEqual(set(dirty_ids), set(release_ids))
+        for release in self.codebase.releases.all():
+            self.assertEqual(
+                release.codemeta_snapshot["name"], "Updated codebase title"
+            )
+            self.assertGreater(release.last_modified, last_modified[release.id])
+            # dateModified reflects the new last_modified
+            self.assertEqual(
+                release.codemeta_snapshot, release.codemeta.dict(serialize=True)
+            )
+
     def test_release_codemeta_updates_on_save(self):
         old_codemeta_snapshot = self.release1.codemeta_snapshot
         self.release1.release_notes = "Updated release notes"
@@ -120,6 +161,76 @@ class CodebaseMetadataTestCase(BaseModelTestCase):
         )
 
 
+class ReleaseMetadataLoadingTestCase(BaseModelTestCase):
+    # 1 releases (with codebases, licenses and adjacent release dois)
+    # + 1 release contributors (with contributors, users and member profiles)
+    # + 1 contributor social accounts
+    # + 1 release languages (with programming languages)
+    # + 2 platform tags (tagged_release_platforms, tags)
+    # + 2 codebase tags (tagged_codebases, tags)
+    METADATA_QUERIES = 1 + 1 + 1 + 1 + 2 + 2
+
+    def setUp(self):
+        self.user_factory = UserFactory()
+        self.submitter = self.user_factory.create()
+        codebase_factory = CodebaseFactory(submitter=self.submitter)
+        self.release_ids = []
+        for index in range(3):
+            codebase = codebase_factory.create()
+            codebase.tags.add("agent based model", f"keyword {index}")
+            codebase.save()
+            release = ReleaseSetup.setUpPublishableDraftRelease(codebase)
+            release.platform_tags.add("netlogo")
+            release.save()
+            release.publish()
+            self.release_ids.append(release.id)
+        self.releases = CodebaseRelease.objects.filter(
+            id__in=self.release_ids
+        ).order_by("id")
+
+    def convert_releases(self, releases):
+        return [
+            (
+                CodeMetaConverter.convert_release(release).dict(serialize=True),
+                DataCiteConverter.get_release_related_identifiers(release),
+            )
+            for release in releases
+        ]
+
+    def test_metadata_query_count_is_constant(self):
+        with self.assertNumQueries(self.METADATA_QUERIES):
+            self.convert_releases(self.releases.with_metadata()[:1])
+        with self.assertNumQueries(self.METADATA_QUERIES):
+            converted = self.convert_releases(self.releases.with_metadata())
+        self.assertEqual(len(converted), len(self.release_ids))
+
+    def test_bulk_metadata_matches_snapshot(self):
+        for release in self.releases.with_metadata():
+            codemeta = CodeMetaConverter.convert_release(release).dict(serialize=True)
+            self.assertEqual(codemeta, release.codemeta_snapshot)
+            self.assertEqual(codemeta["keywords"][0], "agent based model")
+            self.assertEqual(codemeta["runtimePlatform"], ["netlogo"])
+            self.assertTrue(codemeta["author"])
+
+    def test_keywords_and_platforms_ignore_case_when_sorted(self):
+        release = self.releases.first()
+        release.codebase.tags.add("Zombies", "epidemiology")
+        release.platform_tags.add("Mesa")
+        release = self.releases.with_metadata().get(id=release.id)
+        self.assertEqual(
+            release.codebase.get_metadata_keywords(),
+            ["agent based model", "epidemiology", "keyword 0", "Zombies"],
+        )
+        self.assertEqual(release.get_metadata_platforms(), ["Mesa", "netlogo"])
+
+    def test_save_reloads_prefetched_metadata(self):
+        release = self.releases.with_metadata().first()
+        contributor = ContributorFactory(user=self.user_factory.create()).create()
+        ReleaseContributorFactory(release).create(contributor)
+        release.save()
+        self.assertEqual(len(release.codemeta_snapshot["author"]), 2)
+
+
 class ReleaseMetadataConverterTestCase(TestCase):
 
     def setUp(self):
@@ -4,9 +4,13 @@ import semver
 import uuid
 
 from django.conf import settings
-from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.models import AnonymousUser, Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from guardian.shortcuts import assign_perm
 from rest_framework.exceptions import ValidationError
 
+from core.queryset import get_viewable_objects_for_user
 from core.tests.base import UserFactory, BaseModelTestCase
 from .base import (
     CodebaseFactory,
@@ -143,6 +147,120 @@ class CodebaseTest(BaseModelTestCase):
         # self.assertEqual(source_sip_contents, review_draft_sip_contents)
 
 
+class CodebaseSearchFieldsTest(BaseModelTestCase):
+    def setUp(self):
+        super().setUp()
+        self.codebase_factory = CodebaseFactory(submitter=self.user)
+        self.contributor_factory = ContributorFactory(user=self.user)
+        self.python, _created = ProgrammingLanguage.objects.get_or_create(name="Python")
+
+    def create_indexable_codebase(self, n_contributors=2):
+        release = self.codebase_factory.create_published_release(
+            codebase=self.codebase_factory.create()
+        )
+        release.platform_tags.add("mesa")
+        release.save()
+        ReleaseLanguage.objects.create(
+            programming_language=self.python, release=release
+        )
+        release_contributor_factory = ReleaseContributorFactory(release)
+        for contributor in self.contributor_factory.create_unique_contributors(
+            n_contributors
+        ):
+            release_contributor_factory.create(contributor)
+        return release.codebase
+
+    def get_search_values(self, codebase):
+        return (
+            set(codebase.get_all_contributors_search_fields().split()),
+            sorted(codebase.all_release_frameworks),
+            sorted(filter(None, codebase.all_release_programming_languages)),
+            sorted(tag.name for tag in codebase.tags.all()),
+        )
+
+    def build_indexed_search_values(self):
+        with CaptureQueriesContext(connection) as queries:
+            values = {
+                codebase.pk: self.get_search_values(codebase)
+                for codebase in Codebase.get_indexed_objects()
+            }
+        return values, len(queries)
+
+    def test_annotated_values_match_per_object_values(self):
+        codebases = [self.create_indexable_codebase(n) for n in (1, 3)]
+        indexed_values, _ = self.build_indexed_search_values()
+        for codebase in codebases:
+            codebase = Codebase.objects.get(pk=codebase.pk)
+            self.assertEqual(
+                indexed_values[codebase.pk], self.get_search_values(codebase)
+            )
+        self.assertEqual(indexed_values[codebases[0].pk][2], ["Python"])
+
+    def test_query_count_independent_of_codebase_count(self):
+        self.create_indexable_codebase()
+        _, single_codebase_queries = self.build_indexed_search_values()
+        for _ in range(3):
+            self.create_indexable_codebase()
+        values, many_codebase_queries = self.build_indexed_search_values()
+        self.assertEqual(len(values), 4)
+        self.assertEqual(single_codebase_queries, many_codebase_queries)
+
+
+class ViewableCodebaseQuerySetTest(BaseModelTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_user_factory = UserFactory()
+        self.other_user = self.other_user_factory.create()
+        codebase_factory = CodebaseFactory(submitter=self.other_user)
+        self.public_codebase = codebase_factory.create(live=True)
+        self.private_codebase = codebase_factory.create()
+        self.own_codebase = CodebaseFactory(submitter=self.user).create()
+        self.shared_codebase = codebase_factory.create()
+        self.group_codebase = codebase_factory.create()
+        assign_perm("library.change_codebase", self.user, self.shared_codebase)
+        group = Group.objects.create(name="viewable codebase reviewers")
+        group.user_set.add(self.user)
+        assign_perm("library.view_codebase", group, self.group_codebase)
+
+    def test_viewable_codebases(self):
+        self.assertCountEqual(
+            Codebase.objects.accessible(self.user),
+            [
+                self.public_codebase,
+                self.own_codebase,
+                self.shared_codebase,
+                self.group_codebase,
+            ],
+        )
+        self.assertCountEqual(
+            Codebase.objects.accessible(AnonymousUser()), [self.public_codebase]
+        )
+        superuser = self.other_user_factory.create(is_superuser=True)
+        self.assertEqual(
+            Codebase.objects.accessible(superuser).count(), Codebase.objects.count()
+        )
+
+    def test_single_query(self):
+        queryset = get_viewable_objects_for_user(self.user, Codebase.objects.all())
+        with self.assertNumQueries(1):
+            self.assertEqual(len(queryset), 4)
+
+    def test_object_permission_subqueries_use_index(self):
+        queryset = get_viewable_objects_for_user(self.user, Codebase.objects.all())
+        self.assertIn("EXISTS", str(queryset.query))
+        with connection.cursor() as cursor:
+            # test tables are tiny, make sequential scans prohibitively expensive so the plan
+            # only avoids them if an index can serve the permission lookups
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        for table in (
+            "guardian_userobjectpermission",
+            "guardian_groupobjectpermission",
+        ):
+            self.assertIn(table, plan)
+            self.assertNotIn(f"Seq Scan on {table}", plan)
+
+
 class CodebaseReleaseTest(BaseModelTestCase):
     def get_perm_str(self, perm_prefix):
         return "{}.{}_{}".format(
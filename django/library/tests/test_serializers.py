@@ -3,7 +3,7 @@ import rest_framework.exceptions as rf
 
 from django.conf import settings
 from core.tests.base import BaseModelTestCase
-from ..models import Codebase
+from ..models import Codebase, CodebaseReleaseDownloadCount
 from ..serializers import (
     CodebaseSerializer,
     ContributorSerializer,
@@ -153,6 +153,30 @@ class SerializerTestCase(BaseModelTestCase):
         self.assertEqual(user, crs.user)
         self.assertEqual(release, crs.release)
 
+    def test_download_request_updates_download_counts(self):
+        codebase = self.create_codebase(title="Download Count Codebase")
+        release = codebase.releases.last()
+        data = {
+            "ip_address": "127.0.0.1",
+            "referrer": "https://comses.net",
+            "user": self.user.id,
+            "release": release.id,
+            "reason": "research",
+            "industry": "university",
+            "save_to_profile": False,
+        }
+        for _ in range(3):
+            download_request = DownloadRequestSerializer(data=data)
+            download_request.is_valid(raise_exception=True)
+            download_request.save()
+        self.assertEqual(CodebaseReleaseDownloadCount.objects.count(), 1)
+        self.assertEqual(release.download_count(), 3)
+        self.assertEqual(codebase.download_count(), 3)
+        # rebuilding from the raw log reconciles a drifted rollup
+        CodebaseReleaseDownloadCount.objects.update(count=1)
+        CodebaseReleaseDownloadCount.objects.rebuild()
+        self.assertEqual(codebase.download_count(), 3)
+
     def test_invalid_download_request_raises_validation_error(self):
         codebase = self.create_codebase(title="Download Request Codebase 2")
         release = codebase.releases.last()
@@ -1,8 +1,12 @@
 import io
 import pathlib
 import shutil
+import zipfile
+
+from unittest.mock import patch
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase, RequestFactory
 from django.urls import reverse
 from guardian.shortcuts import assign_perm
@@ -11,6 +15,7 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.test import APIClient
 
 from core.tests.base import UserFactory
+from curator.fs import CodebaseReleaseFileConsistencyChecker
 from core.tests.permissions_base import (
     BaseViewSetTestCase,
     create_perm_str,
@@ -22,11 +27,13 @@ from library.models import (
     ProgrammingLanguage,
     ReleaseLanguage,
     Codebase,
+    CodebaseGitRemote,
     CodebaseRelease,
     License,
     PeerReview,
 )
 from library.fs import FileCategories
+from library.tasks import build_release_archive
 from library.tests.base import ReviewSetup
 from .base import (
     CodebaseFactory,
@@ -613,6 +620,53 @@ class CodebaseReleasePublishTestCase(TestCase):
         )
 
 
+class CodebaseReleaseArchiveDownloadTestCase(TestCase):
+    def setUp(self):
+        self.user_factory = UserFactory()
+        self.submitter = self.user_factory.create()
+        self.codebase_factory = CodebaseFactory(submitter=self.submitter)
+        self.codebase = self.codebase_factory.create()
+
+    def assertStreamedArchive(self, response, expected_names):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        archive_bytes = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertTrue(expected_names.issubset(set(archive.namelist())))
+        return archive_bytes
+
+    def test_review_download_is_streamed(self):
+        release = ReleaseSetup.setUpPublishableDraftRelease(self.codebase)
+        response = self.client.get(release.get_review_download_url())
+        self.assertStreamedArchive(
+            response,
+            {"code/some_code_file.py", "docs/some_doc_file.md", "codemeta.json"},
+        )
+
+    @patch("library.views.schedule_release_archive_build")
+    def test_missing_archive_is_streamed_and_built(
+        self, schedule_release_archive_build
+    ):
+        release = self.codebase_factory.create_published_release(codebase=self.codebase)
+        fs_api = release.get_fs_api()
+        fs_api.archivepath.unlink()
+        self.client.login(
+            username=self.submitter.username, password=self.user_factory.password
+        )
+        response = self.client.get(release.get_download_url())
+        self.assertStreamedArchive(response, {"code/some_code_file.py", "LICENSE"})
+        # streamed bytes are never cached as the archive
+        self.assertFalse(fs_api.archivepath.exists())
+        schedule_release_archive_build.assert_called_once_with(release.id)
+        build_release_archive.call_local(release.id)
+        self.assertTrue(
+            CodebaseReleaseFileConsistencyChecker(release).check_fixity_of_archive()
+        )
+        response = self.client.get(release.get_download_url())
+        self.assertIn("X-Accel-Redirect", response)
+
+
 class CodebaseRenderPageTestCase(TestCase):
     def setUp(self):
         self.user_factory = UserFactory()
@@ -659,6 +713,54 @@ class CodebaseReleaseRenderPageTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class CodebaseReleasePageCacheTestCase(TestCase):
+    def setUp(self):
+        submitter = UserFactory().create()
+        codebase_factory = CodebaseFactory(submitter=submitter)
+        self.codebase = codebase_factory.create()
+        self.release = codebase_factory.create_published_release(codebase=self.codebase)
+        self.clear_page_cache_version()
+        self.addCleanup(self.clear_page_cache_version)
+        self.url = self.release.get_absolute_url()
+
+    def clear_page_cache_version(self):
+        cache.delete(Codebase.get_page_cache_version_key(self.codebase.pk))
+
+    @patch.object(Codebase, "ordered_releases_list", autospec=True)
+    def test_fragments_cached_until_codebase_saved(self, ordered_releases_list):
+        ordered_releases_list.return_value = []
+        for _ in range(2):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        ordered_releases_list.assert_called_once()
+        version = self.codebase.get_page_cache_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.release.save()
+        self.assertNotEqual(self.codebase.get_page_cache_version(), version)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(ordered_releases_list.call_count, 2)
+
+    def test_contributor_edits_invalidate_fragments(self):
+        contributor = self.release.codebase_contributors.first().contributor
+        version = self.codebase.get_page_cache_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            contributor.given_name = "Renamed"
+            contributor.save()
+        self.assertNotEqual(self.codebase.get_page_cache_version(), version)
+        user = contributor.user
+        version = self.codebase.get_page_cache_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=["last_login"])
+        self.assertEqual(self.codebase.get_page_cache_version(), version)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.last_name = "Renamed"
+            user.save()
+        self.assertNotEqual(self.codebase.get_page_cache_version(), version)
+        version = self.codebase.get_page_cache_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.member_profile.save()
+        self.assertNotEqual(self.codebase.get_page_cache_version(), version)
+
+
 class CodebaseSearchTestCase(TestCase):
     def setUp(self):
         user_factory = UserFactory()
@@ -864,6 +966,25 @@ class GitHubWebhookTestCase(ResponseStatusCodesMixin, TestCase):
         self.assertEqual(installation.installation_id, 22222)
         self.assertEqual(installation.github_login, "testuser-renamed")
 
+    @override_settings(GITHUB_INTEGRATION_APP_WEBHOOK_SECRET="test-secret")
+    @patch("library.views.schedule_github_releases_refresh")
+    def test_release_webhook_refreshes_matching_remotes(self, mock_refresh):
+        codebase = CodebaseFactory(submitter=self.user).create()
+        remote = CodebaseGitRemote.objects.create(
+            codebase=codebase, owner="TestUser", repo_name="test-repo"
+        )
+        payload = {
+            "action": "published",
+            "release": {"id": 12345},
+            "repository": {"name": "test-repo", "owner": {"login": "testuser"}},
+        }
+        request = self._create_signed_raw_request(
+            json.dumps(payload).encode("utf-8"), event="release"
+        )
+        response = github_sync_webhook(request)
+        self.assertEqual(response.status_code, 200)
+        mock_refresh.assert_called_once_with(remote.id)
+
     @override_settings(GITHUB_INTEGRATION_APP_WEBHOOK_SECRET="test-secret")
     def test_bad_signature(self):
         # requests with a bad signature should be rejected
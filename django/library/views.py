@@ -8,8 +8,12 @@ from django.contrib import messages
 from django.contrib.auth.mixins import PermissionRequiredMixin, LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
 from django.db import transaction, IntegrityError
-from django.db.models import Q
-from django.http import HttpResponse, Http404, HttpResponseRedirect
+from django.http import (
+    HttpResponse,
+    Http404,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import resolve, reverse
 from django.utils import timezone
@@ -22,6 +26,7 @@ from django.views.generic.base import RedirectView
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import UpdateView
 from django.views.generic.list import ListView
+from huey.contrib.djhuey import HUEY
 from ipware import get_client_ip
 from rest_framework import (
     viewsets,
@@ -72,6 +77,7 @@ from .forms import (
 from .fs import (
     FileCategories,
     StagingDirectories,
+    MessageGroup,
     MessageLevels,
 )
 from .models import (
@@ -117,6 +123,9 @@ from .tasks import (
     import_github_release_task,
     push_all_releases_to_github,
     build_local_git_repo,
+    get_push_lock_name,
+    schedule_github_releases_refresh,
+    schedule_release_archive_build,
 )
 
 import logging
@@ -433,7 +442,7 @@ class CodebaseFilter(filters.BaseFilterBackend):
         published_start_date = query_params.get("published_after")
         published_end_date = query_params.get("published_before")
         peer_review_status = query_params.get("peer_review_status")
-        # platform = query_params.get("platform")
+        platforms = query_params.getlist("platform")
         programming_languages = query_params.getlist("programming_languages")
 
         tags = query_params.getlist("tags")
@@ -462,20 +471,18 @@ class CodebaseFilter(filters.BaseFilterBackend):
                 criteria.update(peer_reviewed=True)
             elif peer_review_status == "not_reviewed":
                 criteria.update(peer_reviewed=False)
-        if programming_languages:
-            # FIXME: this does not work for the same reason tags__name__in does not work, e.g.,
-            # https://docs.wagtail.org/en/stable/topics/search/indexing.html#filtering-on-index-relatedfields
-            # criteria.update(releases__release_languages__programming_language__name__in=programming_languages)
-            codebases = Codebase.objects.public(
-                releases__programming_languages__name__in=programming_languages
-            )
-            criteria.update(id__in=codebases.values_list("id", flat=True))
 
-        return get_search_queryset(
-            query_params,
-            queryset,
-            tags=tags,
-            criteria=criteria,
+        # date range and peer review criteria on concrete fields are translated into
+        # elasticsearch filter clauses by wagtail, the list-valued FilterFields are applied as
+        # keyword term filters by search.backends.FacetedSearchResults
+        results = get_search_queryset(query_params, queryset, criteria=criteria)
+        return (
+            results.filter_terms(
+                "tag_names", [tag.lower() for tag in tags], match_all=True
+            )
+            .filter_terms("all_release_programming_languages", programming_languages)
+            .filter_terms("all_release_frameworks", platforms)
+            .with_facets(*view.search_facets)
         )
 
 
@@ -496,6 +503,7 @@ class CodebaseViewSet(SpamCatcherViewSetMixin, CommonViewSetMixin, HtmlNoDeleteV
     )
     ordering = ["-first_published_at"]
     context_list_name = "codebases"
+    search_facets = ("all_release_programming_languages",)
 
     def get_list_context(self, page_or_queryset):
         context = {self.context_list_name: page_or_queryset}
@@ -510,21 +518,14 @@ class CodebaseViewSet(SpamCatcherViewSetMixin, CommonViewSetMixin, HtmlNoDeleteV
         if request.accepted_renderer.format == "html":
             context = self.get_list_context(page or queryset)
 
-            try:
-                language_facets = queryset.facet("all_release_programming_languages")
-            except NotImplementedError:
-                # Some backends (e.g. database search backend) do not implement facet support.
-                logger.info(
-                    "Skipping language facets for codebase list because backend does not support faceting"
-                )
-                language_facets = None
+            # collected by the same elasticsearch request that counted the results
+            language_facets = queryset.get_facets().get(
+                "all_release_programming_languages"
+            )
             if language_facets:
                 logger.debug(
                     "Appending language_facets to response: %s", language_facets
                 )
-                # remove '0' key which represents releases with no programming languages
-                if "0" in language_facets:
-                    del language_facets["0"]
                 context["language_facets"] = json.dumps(language_facets)
 
             return Response(context)
@@ -707,13 +708,18 @@ class CodebaseGitRemoteViewSet(
             raise ValidationError("Active remote not found")
 
         # prevent concurrent push jobs for the same codebase
-        if GitRefSyncState.objects.filter(
-            Q(release__codebase=codebase) | Q(codebase=codebase),
-            status=GitRefSyncState.Status.RUNNING,
-        ).exists():
-            raise ValidationError(
-                "Push already in progress for this codebase. Please wait."
-            )
+        if (
+            GitRefSyncState.for_codebase_refs(codebase)
+            .filter(status=GitRefSyncState.Status.RUNNING)
+            .exists()
+        ):
+            if HUEY.is_locked(get_push_lock_name(codebase.id)):
+                raise ValidationError(
+                    "Push already in progress for this codebase. Please wait."
+                )
+            # the previous push job was interrupted, resume it from its checkpoints
+            push_all_releases_to_github(codebase.id, active_remote.id)
+            return Response(status=status.HTTP_202_ACCEPTED, data="Push resumed.")
 
         # start all push jobs for this remote (set remotes and mark running)
         started = GitRefSyncState.start_all_push_jobs_for_codebase(
@@ -725,6 +731,14 @@ class CodebaseGitRemoteViewSet(
         push_all_releases_to_github(codebase.id, active_remote.id)
         return Response(status=status.HTTP_202_ACCEPTED, data="Push started.")
 
+    @action(detail=False, methods=["get"])
+    def push_progress(self, request, *args, **kwargs):
+        """Counts of this codebase's git refs (main branch and releases) by sync status."""
+        codebase = self.get_codebase()
+        progress = GitRefSyncState.get_push_progress(codebase)
+        progress["in_progress"] = HUEY.is_locked(get_push_lock_name(codebase.id))
+        return Response(progress)
+
     @action(detail=False, methods=["get"])
     def active_remote(self, request, *args, **kwargs):
         queryset = self.get_queryset()
@@ -753,14 +767,17 @@ class CodebaseGitRemoteViewSet(
         """fetch releases from the connected GitHub repository for this codebase
 
         requires an active remote. returns minimal release info suitable for client display
-        and import selection.
+        and import selection. Releases come from a cached listing that is kept up to date by
+        release webhook events and refreshed in the background once it is stale, pass
+        ?refresh=true to revalidate it with GitHub before responding.
         """
         queryset = self.get_queryset()
         active_remote = queryset.filter(is_active=True).first()
         if not active_remote:
             return Response([], status=status.HTTP_200_OK)
+        refresh = request.query_params.get("refresh", "").lower() in ("1", "true")
         try:
-            releases = list_github_releases_for_remote(active_remote)
+            releases = list_github_releases_for_remote(active_remote, refresh=refresh)
             return Response(releases, status=status.HTTP_200_OK)
         except Exception as e:
             logger.exception("Failed to fetch GitHub releases: %s", e)
@@ -942,6 +959,7 @@ def github_sync_webhook(request):
     """
     Handle GitHub app webhook events:
     - new installations (match to connected socialaccount and save the installation record)
+    - release changes (refresh the cached release listing of matching remotes)
 
     for local testing, use smee.io or similar to forward webhooks:
     https://docs.github.com/en/webhooks/using-webhooks/handling-webhook-deliveries#setup
@@ -998,6 +1016,20 @@ def github_sync_webhook(request):
             )
             logger.debug("Installation record updated/created: %s", installation)
             return HttpResponse("OK", status=200)
+    elif event == "release":
+        try:
+            payload = json.loads(request.body)
+            repository = payload["repository"]
+            owner = repository["owner"]["login"]
+            repo_name = repository["name"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return HttpResponse("Malformed payload", status=400)
+        remote_ids = CodebaseGitRemote.objects.filter(
+            owner__iexact=owner, repo_name__iexact=repo_name
+        ).values_list("id", flat=True)
+        for remote_id in remote_ids:
+            schedule_github_releases_refresh(remote_id)
+        return HttpResponse("OK", status=200)
 
     return HttpResponse(status=202)
 
@@ -1103,32 +1135,55 @@ class NestedCodebaseReleaseUnpublishedFilesPermission(permissions.BasePermission
         return True
 
 
+def build_archive_streaming_response(codebase_release, archive_stream):
+    """
+    Returns a StreamingHttpResponse that sends a codebase archive zipfile as it is being built
+    """
+    response = StreamingHttpResponse(archive_stream, content_type="application/zip")
+    response["Content-Disposition"] = "attachment; filename={}".format(
+        codebase_release.archive_filename
+    )
+    return response
+
+
 def build_archive_download_response(codebase_release, review_archive=False):
     """
     Returns an HttpResponse object that uses nginx to serve our codebase archive zipfiles.
     (https://www.nginx.com/resources/wiki/start/topics/examples/x-accel/)
+    If the archive has not been built yet, it is streamed directly from the release's submission
+    package and built in the background for subsequent requests.
     :param codebase_release: The specific CodebaseRelease instance archive to download
-    :param review_archive: when true we force a rebuild of the CodebaseRelease archive and use the review archive URI
-    which is basically just review_archive.zip instead of archive.zip
+    :param review_archive: when true we stream a freshly built review archive instead of serving the
+    published archive.zip
     :return:
     """
     fs_api = codebase_release.get_fs_api()
+    if review_archive:
+        # review archives must reflect the latest files, stream them as they are built instead
+        # of blocking the request on a full archive build
+        return build_archive_streaming_response(
+            codebase_release, fs_api.stream_review_archive()
+        )
+    archive_uri = fs_api.archive_uri
+    archive_absolute_path = fs_api.archivepath
+    if not archive_absolute_path.exists():
+        if not fs_api.sip_contents_dir.exists():
+            raise FileNotFoundError
+        logger.warning(
+            "archive missing for codebase release %s, streaming from the submission package",
+            codebase_release.id,
+        )
+        # the streamed bytes are not byte-identical to a built archive, build it separately
+        schedule_release_archive_build(codebase_release.id)
+        return build_archive_streaming_response(
+            codebase_release, fs_api.stream_archive()
+        )
     response = HttpResponse()
     response["Content-Type"] = ""
     response["Content-Disposition"] = "attachment; filename={}".format(
         codebase_release.archive_filename
     )
     # response['Content-Length'] = fs_api.archive_size
-    archive_uri = fs_api.archive_uri
-    archive_absolute_path = fs_api.archivepath
-    if review_archive:
-        fs_api.build_review_archive()
-        archive_absolute_path = fs_api.review_archivepath
-        archive_uri = fs_api.review_archive_uri
-    #    response['Content-Length'] = fs_api.review_archive_size
-
-    if not archive_absolute_path.exists():
-        raise FileNotFoundError
     response["X-Accel-Redirect"] = "/library/internal/{0}".format(archive_uri)
     return response
 
@@ -1573,10 +1628,14 @@ class CodebaseReleaseFilesOriginalsViewSet(BaseCodebaseReleaseFilesViewSet):
         codebase_release = self.get_object()
         fs_api = codebase_release.get_fs_api()
         category = self.get_category()
-        fileobj = request.FILES.get("file")
-        if fileobj is None:
+        fileobjs = request.FILES.getlist("file")
+        if not fileobjs:
             raise ValidationError({"file": ["This field is required"]})
-        msgs = fs_api.add(content=fileobj, category=category)
+        msgs = MessageGroup()
+        # update the file manifest once for the whole upload
+        with fs_api.file_manifest.deferred():
+            for fileobj in fileobjs:
+                msgs.append(fs_api.add(content=fileobj, category=category))
         logs, level = msgs.serialize()
         status_code = (
             status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,184 @@
+"""
+Elasticsearch backend with native keyword filters and aggregations
+
+wagtail can only translate queryset filters on concrete model fields into elasticsearch filter
+clauses, so list-valued FilterFields (tags, release languages and frameworks) could not be
+filtered on without falling back to SQL subqueries or fuzzy text matches. FacetedSearchResults
+adds term filter clauses on those fields directly to the elasticsearch query and collects terms
+aggregations for facet counts in the same request that counts the hits.
+
+Search and count responses are cached for SEARCH_RESULT_CACHE_TIMEOUT seconds keyed on the full
+request (query, filters, sort and page window) and a results version that is bumped whenever
+documents are reindexed, so repeated searches and pagination round trips skip elasticsearch.
+
+Enabled by setting the WAGTAILSEARCH_BACKENDS BACKEND to "search.backends".
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+from django.core.cache import cache
+from wagtail.search.backends.base import FilterFieldError
+from wagtail.search.backends.elasticsearch7 import (
+    Elasticsearch7SearchBackend,
+    Elasticsearch7SearchResults,
+)
+
+# maximum number of buckets returned per facet
+FACET_SIZE = 100
+SEARCH_RESULT_CACHE_TIMEOUT = 60
+SEARCH_RESULT_VERSION_KEY = "search.results.version"
+
+
+def get_results_version():
+    return cache.get_or_set(SEARCH_RESULT_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_cached_results():
+    try:
+        cache.incr(SEARCH_RESULT_VERSION_KEY)
+    except ValueError:
+        # key is missing, there is nothing cached under the current version
+        pass
+
+
+def get_results_cache_key(method, body, params):
+    request = json.dumps([method, body, params], sort_keys=True, default=str)
+    digest = hashlib.sha256(request.encode()).hexdigest()
+    return f"search.results.{get_results_version()}.{digest}"
+
+
+class FacetedSearchResults(Elasticsearch7SearchResults):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._terms_filters = []
+        self._facet_fields = []
+        self._facets_cache = None
+
+    def _clone(self):
+        new = super()._clone()
+        new._terms_filters = list(self._terms_filters)
+        new._facet_fields = list(self._facet_fields)
+        return new
+
+    def _get_column_name(self, field_name):
+        field = self.query_compiler._get_filterable_field(field_name)
+        if field is None:
+            raise FilterFieldError(
+                f'Cannot filter or facet search results with field "{field_name}". '
+                f"Please add index.FilterField('{field_name}') to "
+                f"{self.query_compiler.queryset.model.__name__}.search_fields.",
+                field_name=field_name,
+            )
+        return self.query_compiler.mapping.get_field_column_name(field)
+
+    def filter_terms(self, field_name, values, match_all=False):
+        """
+        restrict results to documents whose field_name contains any of the given values, or all of
+        them if match_all is set. Values must match the indexed keyword exactly.
+        """
+        values = list(values)
+        if not values:
+            return self
+        column_name = self._get_column_name(field_name)
+        new = self._clone()
+        if match_all:
+            new._terms_filters.extend({"term": {column_name: v}} for v in values)
+        else:
+            new._terms_filters.append({"terms": {column_name: values}})
+        return new
+
+    def with_facets(self, *field_names):
+        """
+        request terms aggregations over the given FilterFields, returned by get_facets()
+        """
+        new = self._clone()
+        new._facet_fields.extend(field_names)
+        return new
+
+    def _get_es_body(self, for_count=False):
+        body = super()._get_es_body(for_count=for_count)
+        if self._terms_filters:
+            body["query"] = {
+                "bool": {"must": body["query"], "filter": self._terms_filters}
+            }
+        return body
+
+    def _get_aggregations(self):
+        return {
+            field_name: {
+                "terms": {
+                    "field": self._get_column_name(field_name),
+                    "size": FACET_SIZE,
+                }
+            }
+            for field_name in self._facet_fields
+        }
+
+    def _do_count(self):
+        index = self.backend.get_index_for_model(
+            self.query_compiler.queryset.model
+        ).name
+        body = self._get_es_body(for_count=True)
+        if self._facet_fields:
+            # count the hits and aggregate the facets in a single request
+            body["aggregations"] = self._get_aggregations()
+            response = self._backend_do_search(
+                body, index=index, size=0, track_total_hits=True
+            )
+            self._facets_cache = {
+                field_name: OrderedDict(
+                    (bucket["key"], bucket["doc_count"])
+                    for bucket in response["aggregations"][field_name]["buckets"]
+                )
+                for field_name in self._facet_fields
+            }
+            hit_count = response["hits"]["total"]["value"]
+        else:
+            # wagtail counts with backend.es.count directly, bypassing the response cache
+            hit_count = self._backend_do_count(body, index=index)["count"]
+        hit_count -= self.start
+        if self.stop is not None:
+            hit_count = min(hit_count, self.stop - self.start)
+        return max(hit_count, 0)
+
+    def _get_cached_response(self, method, body, params, fetch):
+        key = get_results_cache_key(method, body, params)
+        response = cache.get(key)
+        if response is None:
+            response = fetch(body, **params)
+            # the elasticsearch 8 client wraps responses, cache the plain dict
+            response = getattr(response, "body", response)
+            cache.set(key, response, timeout=SEARCH_RESULT_CACHE_TIMEOUT)
+        return response
+
+    def _backend_do_search(self, body, **kwargs):
+        if "scroll" in kwargs:
+            # scroll contexts are stateful on the server side
+            return super()._backend_do_search(body, **kwargs)
+        return self._get_cached_response(
+            "search", body, kwargs, super()._backend_do_search
+        )
+
+    def _es_count(self, body, **kwargs):
+        return self.backend.es.count(body=body, **kwargs)
+
+    def _backend_do_count(self, body, **kwargs):
+        return self._get_cached_response("count", body, kwargs, self._es_count)
+
+    def get_facets(self):
+        """
+        :return: dict of {field_name: OrderedDict(value -> document count)} for the fields
+        requested via with_facets(), collected while counting the results
+        """
+        if self._facets_cache is None and self._facet_fields:
+            self._count_cache = self._do_count()
+        return self._facets_cache or {}
+
+
+class FacetedElasticsearch7SearchBackend(Elasticsearch7SearchBackend):
+    results_class = FacetedSearchResults
+
+
+SearchBackend = FacetedElasticsearch7SearchBackend
@@ -0,0 +1,133 @@
+"""
+Incremental search indexing
+
+Saves and deletes of indexed models (and of the related models that feed their search documents)
+record "<app_label.model>:<pk>" entries in a redis set instead of writing to elasticsearch
+inline. search.tasks.update_dirty_search_documents drains the set periodically and bulk indexes
+only the affected documents. A full rebuild (manage.py rebuild_search_index) remains available
+for repairs and pauses draining while the new index is built so that changes made during the
+rebuild are applied to the live index once the alias has been swapped.
+"""
+
+import logging
+from collections import defaultdict
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+from django_redis import get_redis_connection
+from wagtail.search.backends import get_search_backends
+
+from .backends import invalidate_cached_results
+
+logger = logging.getLogger(__name__)
+
+DIRTY_SET_KEY = "search.index.dirty"
+REBUILD_LOCK_KEY = "search.index.rebuild"
+# upper bound on a full rebuild, the lock expires after this in case the rebuild process dies
+REBUILD_LOCK_TIMEOUT = 60 * 60 * 6
+DRAIN_BATCH_SIZE = 500
+
+
+def get_redis():
+    return get_redis_connection("default")
+
+
+def get_dirty_label(model) -> str:
+    return model._meta.label_lower
+
+
+def get_indexed_model(instance):
+    """wagtail pages are indexed under their specific class, which may not be the saved class"""
+    return getattr(instance, "specific_class", None) or type(instance)
+
+
+def mark_dirty(model, *pks):
+    """
+    queue search documents for reindexing once the current transaction commits so that the
+    drain task never reads uncommitted (or rolled back) rows
+    """
+    members = [f"{get_dirty_label(model)}:{pk}" for pk in pks if pk is not None]
+    if members:
+        transaction.on_commit(partial(get_redis().sadd, DIRTY_SET_KEY, *members))
+
+
+def mark_instance_dirty(instance):
+    mark_dirty(get_indexed_model(instance), instance.pk)
+
+
+def dirty_count() -> int:
+    return get_redis().scard(DIRTY_SET_KEY)
+
+
+def is_rebuilding() -> bool:
+    return bool(get_redis().exists(REBUILD_LOCK_KEY))
+
+
+def rebuild_lock():
+    return get_redis().lock(
+        REBUILD_LOCK_KEY, timeout=REBUILD_LOCK_TIMEOUT, blocking_timeout=0
+    )
+
+
+def group_dirty_entries(entries):
+    """
+    group raw "<app_label.model>:<pk>" set members into {model: {pk, ...}}, skipping entries
+    for models that no longer exist
+    """
+    grouped = defaultdict(set)
+    for entry in entries:
+        if isinstance(entry, bytes):
+            entry = entry.decode()
+        label, _, pk = entry.rpartition(":")
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            logger.warning("discarding dirty search entry for unknown model %s", entry)
+            continue
+        grouped[model].add(model._meta.pk.to_python(pk))
+    return grouped
+
+
+def index_documents(model, pks):
+    """
+    bulk (re)index the given model instances, removing documents for instances that were deleted
+    or are no longer indexable (e.g., unpublished or marked as spam)
+    """
+    objects = list(model.get_indexed_objects().filter(pk__in=pks))
+    removed_pks = set(pks).difference(obj.pk for obj in objects)
+    for backend in get_search_backends():
+        if objects:
+            backend.add_bulk(model, objects)
+        for pk in removed_pks:
+            backend.delete(model(pk=pk))
+    return len(objects), len(removed_pks)
+
+
+def update_dirty_documents(batch_size=DRAIN_BATCH_SIZE):
+    """
+    drain the dirty set in batches and reindex the affected documents. A batch that fails to
+    index is returned to the set so that it is retried on the next run.
+
+    :return: dict with the number of documents indexed and removed
+    """
+    conn = get_redis()
+    stats = {"indexed": 0, "removed": 0}
+    if is_rebuilding():
+        logger.info(
+            "full search index rebuild in progress, deferring incremental update"
+        )
+        return stats
+    while entries := conn.spop(DIRTY_SET_KEY, batch_size):
+        try:
+            for model, pks in group_dirty_entries(entries).items():
+                indexed, removed = index_documents(model, pks)
+                stats["indexed"] += indexed
+                stats["removed"] += removed
+        except Exception:
+            conn.sadd(DIRTY_SET_KEY, *entries)
+            raise
+    if any(stats.values()):
+        invalidate_cached_results()
+        logger.info("incremental search index update: %s", stats)
+    return stats
@@ -3,6 +3,7 @@ import logging
 from django.core.management.base import BaseCommand
 from wagtail.contrib.search_promotions.models import Query, QueryDailyHits
 from search.models import ArchivedQueryHits
+from search.query_hits import flush_query_hits
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,8 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        # include hits still buffered in redis
+        flush_query_hits()
         ArchivedQueryHits.archive_from_daily_hits()
 
         logger.info(
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from wagtail.search.backends import get_search_backend
+
+from library.models import Codebase
+
+
+class Command(BaseCommand):
+    help = """Report how many codebase search documents per second can be built with per-codebase
+    queries (Codebase.objects.public()) versus the batched Codebase.get_indexed_objects() queryset.
+    Documents are built in memory and not sent to elasticsearch."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-l",
+            "--limit",
+            type=int,
+            default=500,
+            help="number of codebases to build documents for, defaults to 500",
+        )
+
+    def handle(self, *args, **options):
+        mapping = get_search_backend().mapping_class(Codebase)
+        querysets = {
+            "per-codebase": Codebase.objects.public(),
+            "batched": Codebase.get_indexed_objects(),
+        }
+        for label, queryset in querysets.items():
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                documents = [
+                    mapping.get_document(codebase)
+                    for codebase in queryset.order_by("pk")[: options["limit"]]
+                ]
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{label}: {len(documents)} documents in {elapsed:.2f}s "
+                f"({len(documents) / elapsed:.1f} documents/sec, {len(queries)} queries)"
+            )
@@ -0,0 +1,29 @@
+import logging
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from search.backends import invalidate_cached_results
+from search.indexing import dirty_count, rebuild_lock
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """Repair the search index with a full rebuild. Wagtail's atomic rebuild populates a new
+    index and swaps the alias to it once complete, so searches keep working throughout.
+    Incremental updates are paused during the rebuild and applied to the new index afterwards."""
+
+    def handle(self, *args, **options):
+        lock = rebuild_lock()
+        if not lock.acquire():
+            raise CommandError("A search index rebuild is already in progress")
+        try:
+            call_command("update_index", verbosity=options["verbosity"])
+        finally:
+            lock.release()
+        invalidate_cached_results()
+        logger.info(
+            "search index rebuilt, %d changed documents queued for incremental update",
+            dirty_count(),
+        )
@@ -0,0 +1,115 @@
+"""
+Buffered search query hit counting
+
+Recording a hit with wagtail's Query.get(query_string).add_hit() takes two get_or_create round
+trips and an UPDATE inside the search request. record_query_hit instead increments a counter in a
+redis hash keyed on the day and normalized query string, and search.tasks.flush_search_query_hits
+periodically moves the buffered counts into Query / QueryDailyHits in one transaction.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from wagtail.contrib.search_promotions.models import Query, QueryDailyHits
+from wagtail.search.utils import normalise_query_string
+
+from .indexing import get_redis
+
+logger = logging.getLogger(__name__)
+
+QUERY_HITS_KEY = "search.query.hits"
+# buffered hits are renamed to this key while they are being flushed
+QUERY_HITS_FLUSH_KEY = "search.query.hits.flushing"
+
+
+def record_query_hit(query_string, day=None):
+    query_string = normalise_query_string(query_string)
+    if not query_string:
+        return
+    if day is None:
+        day = timezone.now().date()
+    get_redis().hincrby(QUERY_HITS_KEY, f"{day.isoformat()}:{query_string}", 1)
+
+
+def parse_buffered_hits(buffered):
+    """
+    :return: dict of {(date, query_string): hits} for raw "<iso date>:<query string>" -> hits
+    redis hash entries
+    """
+    hits = defaultdict(int)
+    for field, count in buffered.items():
+        if isinstance(field, bytes):
+            field = field.decode()
+        day, _, query_string = field.partition(":")
+        hits[(date.fromisoformat(day), query_string)] += int(count)
+    return hits
+
+
+@transaction.atomic
+def save_query_hits(hits):
+    query_strings = {query_string for _, query_string in hits}
+    Query.objects.bulk_create(
+        [Query(query_string=query_string) for query_string in query_strings],
+        ignore_conflicts=True,
+    )
+    query_ids = dict(
+        Query.objects.filter(query_string__in=query_strings).values_list(
+            "query_string", "id"
+        )
+    )
+    hits = {
+        (query_ids[query_string], day): count
+        for (day, query_string), count in hits.items()
+    }
+    existing = list(
+        QueryDailyHits.objects.select_for_update().filter(
+            query_id__in=query_ids.values(), date__in={day for _, day in hits}
+        )
+    )
+    updated = []
+    for daily_hits in existing:
+        count = hits.pop((daily_hits.query_id, daily_hits.date), None)
+        if count:
+            daily_hits.hits = F("hits") + count
+            updated.append(daily_hits)
+    QueryDailyHits.objects.bulk_update(updated, ["hits"])
+    QueryDailyHits.objects.bulk_create(
+        [
+            QueryDailyHits(query_id=query_id, date=day, hits=count)
+            for (query_id, day), count in hits.items()
+        ]
+    )
+
+
+def flush_query_hits():
+    """
+    move buffered query hits into the database. Buffered hits are restored to redis if the
+    database write fails so that they are retried on the next flush.
+
+    :return: the number of hits flushed
+    """
+    conn = get_redis()
+    # a leftover flush key means a previous flush died after the rename, retry those hits too
+    if not conn.exists(QUERY_HITS_FLUSH_KEY):
+        if not conn.exists(QUERY_HITS_KEY):
+            return 0
+        conn.rename(QUERY_HITS_KEY, QUERY_HITS_FLUSH_KEY)
+    buffered = conn.hgetall(QUERY_HITS_FLUSH_KEY)
+    hits = parse_buffered_hits(buffered)
+    try:
+        save_query_hits(hits)
+    except Exception:
+        pipeline = conn.pipeline()
+        for field, count in buffered.items():
+            pipeline.hincrby(QUERY_HITS_KEY, field, int(count))
+        pipeline.delete(QUERY_HITS_FLUSH_KEY)
+        pipeline.execute()
+        raise
+    conn.delete(QUERY_HITS_FLUSH_KEY)
+    total = sum(hits.values())
+    logger.info("flushed %d search query hits", total)
+    return total
@@ -0,0 +1,66 @@
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from wagtail.search.index import get_indexed_models
+
+from library.models import (
+    Codebase,
+    CodebaseRelease,
+    Contributor,
+    ReleaseContributor,
+    ReleaseLanguage,
+)
+
+from .indexing import mark_dirty, mark_instance_dirty
+
+logger = logging.getLogger(__name__)
+
+
+def on_indexed_object_change(sender, instance, **kwargs):
+    mark_instance_dirty(instance)
+
+
+def on_release_change(sender, instance: CodebaseRelease, **kwargs):
+    """codebase documents aggregate release languages and frameworks"""
+    mark_dirty(Codebase, instance.codebase_id)
+
+
+def on_release_dependency_change(sender, instance, **kwargs):
+    """contributors and languages are denormalized into release and codebase documents"""
+    mark_dirty(CodebaseRelease, instance.release_id)
+    # avoid instance.release, the release may already be gone when deletes cascade
+    mark_dirty(
+        Codebase,
+        *CodebaseRelease.objects.filter(pk=instance.release_id).values_list(
+            "codebase_id", flat=True
+        ),
+    )
+
+
+def on_contributor_change(sender, instance: Contributor, **kwargs):
+    mark_dirty(
+        Codebase,
+        *Codebase.objects.filter(releases__codebase_contributors__contributor=instance)
+        .values_list("pk", flat=True)
+        .distinct(),
+    )
+
+
+def register_signal_handlers():
+    for model in get_indexed_models():
+        post_save.connect(
+            on_indexed_object_change,
+            sender=model,
+            dispatch_uid=f"search_dirty_save_{model._meta.label_lower}",
+        )
+        post_delete.connect(
+            on_indexed_object_change,
+            sender=model,
+            dispatch_uid=f"search_dirty_delete_{model._meta.label_lower}",
+        )
+    for signal in (post_save, post_delete):
+        signal.connect(on_release_change, sender=CodebaseRelease)
+        signal.connect(on_release_dependency_change, sender=ReleaseContributor)
+        signal.connect(on_release_dependency_change, sender=ReleaseLanguage)
+    post_save.connect(on_contributor_change, sender=Contributor)
+    logger.debug("registered incremental search index signal handlers")
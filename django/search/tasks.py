@@ -0,0 +1,23 @@
+import logging
+
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task, lock_task
+
+from .indexing import update_dirty_documents
+from .query_hits import flush_query_hits
+
+logger = logging.getLogger(__name__)
+
+
+@db_periodic_task(crontab(minute="*"))
+@lock_task("search-index-update-dirty-documents")
+def update_dirty_search_documents():
+    """bulk reindex search documents for objects changed since the last run"""
+    return update_dirty_documents()
+
+
+@db_periodic_task(crontab(minute="*/5"))
+@lock_task("search-flush-query-hits")
+def flush_search_query_hits():
+    """move search query hits buffered in redis into QueryDailyHits"""
+    return flush_query_hits()
@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.core.cache import cache
+from wagtail.search.backends import get_search_backend
+from wagtail.search.backends.base import FilterFieldError
+from wagtail.search.backends.elasticsearch7 import Elasticsearch7SearchResults
+from wagtail.search.query import MATCH_ALL
+
+from library.models import Codebase
+from search.backends import (
+    SEARCH_RESULT_VERSION_KEY,
+    FacetedSearchResults,
+    invalidate_cached_results,
+)
+
+
+class FacetedSearchResultsTestCase(TestCase):
+    def setUp(self):
+        cache.delete(SEARCH_RESULT_VERSION_KEY)
+        self.results = get_search_backend().search(MATCH_ALL, Codebase.objects.all())
+
+    def test_terms_filters(self):
+        self.assertIsInstance(self.results, FacetedSearchResults)
+        results = self.results.filter_terms(
+            "tag_names", ["agent based", "abm"], match_all=True
+        ).filter_terms("all_release_programming_languages", ["NetLogo", "Python"])
+        filters = results._get_es_body()["query"]["bool"]["filter"]
+        self.assertEqual(
+            filters,
+            [
+                {"term": {"tag_names_filter": "agent based"}},
+                {"term": {"tag_names_filter": "abm"}},
+                {
+                    "terms": {
+                        "all_release_programming_languages_filter": [
+                            "NetLogo",
+                            "Python",
+                        ]
+                    }
+                },
+            ],
+        )
+        # filtering returns a new results object
+        self.assertEqual(self.results._terms_filters, [])
+        self.assertIs(self.results.filter_terms("tag_names", []), self.results)
+
+    def test_unknown_filter_field(self):
+        with self.assertRaises(FilterFieldError):
+            self.results.filter_terms("submitter", ["x"])
+
+    def test_count_collects_facets_in_one_request(self):
+        results = self.results.with_facets("all_release_programming_languages")
+        response = {
+            "hits": {"total": {"value": 3}, "hits": []},
+            "aggregations": {
+                "all_release_programming_languages": {
+                    "buckets": [
+                        {"key": "NetLogo", "doc_count": 2},
+                        {"key": "Python", "doc_count": 1},
+                    ]
+                }
+            },
+        }
+        with patch.object(
+            Elasticsearch7SearchResults, "_backend_do_search", return_value=response
+        ) as do_search:
+            self.assertEqual(results.count(), 3)
+            facets = results.get_facets()
+        do_search.assert_called_once()
+        self.assertEqual(
+            dict(facets["all_release_programming_languages"]),
+            {"NetLogo": 2, "Python": 1},
+        )
+
+    def test_counts_without_facets_are_cached(self):
+        with patch.object(
+            FacetedSearchResults, "_es_count", return_value={"count": 5}
+        ) as es_count:
+            self.assertEqual(self.results._do_count(), 5)
+            self.assertEqual(self.results[1:3]._do_count(), 2)
+            self.assertEqual(self.results._do_count(), 5)
+        es_count.assert_called_once()
+        self.assertNotIn("aggregations", es_count.call_args.args[0])
+
+    def test_responses_are_cached_until_invalidated(self):
+        body = self.results._get_es_body()
+        response = {"hits": {"total": {"value": 0}, "hits": []}}
+        with patch.object(
+            Elasticsearch7SearchResults, "_backend_do_search", return_value=response
+        ) as do_search:
+            for _ in range(2):
+                self.assertEqual(
+                    self.results._backend_do_search(body, from_=0, size=10), response
+                )
+            self.assertEqual(do_search.call_count, 1)
+            # a different page is a different request
+            self.results._backend_do_search(body, from_=10, size=10)
+            self.assertEqual(do_search.call_count, 2)
+            invalidate_cached_results()
+            self.results._backend_do_search(body, from_=0, size=10)
+            self.assertEqual(do_search.call_count, 3)
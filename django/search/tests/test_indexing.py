@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from core.tests.base import UserFactory
+from library.models import Codebase, CodebaseRelease
+from library.tests.base import (
+    CodebaseFactory,
+    ContributorFactory,
+    ReleaseContributorFactory,
+)
+from search.indexing import (
+    DIRTY_SET_KEY,
+    get_redis,
+    mark_dirty,
+    rebuild_lock,
+    update_dirty_documents,
+)
+
+
+class IncrementalIndexingTestCase(TestCase):
+    def setUp(self):
+        self.conn = get_redis()
+        self.conn.delete(DIRTY_SET_KEY)
+        self.submitter = UserFactory().create()
+        self.codebase_factory = CodebaseFactory(submitter=self.submitter)
+        self.release = self.codebase_factory.create_published_release()
+        self.codebase = self.release.codebase
+        self.conn.delete(DIRTY_SET_KEY)
+        self.backend = MagicMock()
+        patcher = patch(
+            "search.indexing.get_search_backends", return_value=[self.backend]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.conn.delete(DIRTY_SET_KEY)
+
+    def dirty_entries(self):
+        return {entry.decode() for entry in self.conn.smembers(DIRTY_SET_KEY)}
+
+    def test_save_marks_dirty_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.codebase.save()
+        self.assertFalse(self.dirty_entries())
+        for callback in callbacks:
+            callback()
+        self.assertIn(f"library.codebase:{self.codebase.pk}", self.dirty_entries())
+
+    def test_contributor_change_marks_release_and_codebase_dirty(self):
+        contributor = ContributorFactory(self.submitter).create()
+        with self.captureOnCommitCallbacks(execute=True):
+            ReleaseContributorFactory(self.release).create(contributor)
+        self.assertTrue(
+            {
+                f"library.codebase:{self.codebase.pk}",
+                f"library.codebaserelease:{self.release.pk}",
+            }.issubset(self.dirty_entries())
+        )
+        self.conn.delete(DIRTY_SET_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            contributor.save()
+        self.assertEqual(
+            self.dirty_entries(),
+            {
+                f"library.contributor:{contributor.pk}",
+                f"library.codebase:{self.codebase.pk}",
+            },
+        )
+
+    def test_update_indexes_changed_and_removes_missing_documents(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_dirty(Codebase, self.codebase.pk, 999999)
+            mark_dirty(CodebaseRelease, self.release.pk)
+        stats = update_dirty_documents(batch_size=1)
+        self.assertEqual(stats, {"indexed": 2, "removed": 1})
+        self.assertFalse(self.dirty_entries())
+        indexed = {
+            (model, obj.pk)
+            for (model, objects), _ in self.backend.add_bulk.call_args_list
+            for obj in objects
+        }
+        self.assertEqual(
+            indexed, {(Codebase, self.codebase.pk), (CodebaseRelease, self.release.pk)}
+        )
+        (removed,), _ = self.backend.delete.call_args
+        self.assertEqual((type(removed), removed.pk), (Codebase, 999999))
+
+    def test_failed_batch_is_requeued(self):
+        self.backend.add_bulk.side_effect = ConnectionError
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_dirty(Codebase, self.codebase.pk)
+        with self.assertRaises(ConnectionError):
+            update_dirty_documents()
+        self.assertEqual(self.dirty_entries(), {f"library.codebase:{self.codebase.pk}"})
+
+    def test_update_is_deferred_during_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_dirty(Codebase, self.codebase.pk)
+        lock = rebuild_lock()
+        self.assertTrue(lock.acquire())
+        try:
+            self.assertEqual(update_dirty_documents(), {"indexed": 0, "removed": 0})
+        finally:
+            lock.release()
+        self.assertEqual(self.dirty_entries(), {f"library.codebase:{self.codebase.pk}"})
+        self.assertEqual(update_dirty_documents()["indexed"], 1)
@@ -0,0 +1,58 @@
+import datetime
+from unittest.mock import patch
+
+from django.test import TestCase
+from wagtail.contrib.search_promotions.models import Query, QueryDailyHits
+
+from search.indexing import get_redis
+from search.query_hits import (
+    QUERY_HITS_FLUSH_KEY,
+    QUERY_HITS_KEY,
+    flush_query_hits,
+    record_query_hit,
+)
+
+
+class QueryHitsTestCase(TestCase):
+    def setUp(self):
+        self.conn = get_redis()
+        self.conn.delete(QUERY_HITS_KEY, QUERY_HITS_FLUSH_KEY)
+        self.addCleanup(self.conn.delete, QUERY_HITS_KEY, QUERY_HITS_FLUSH_KEY)
+        self.date1 = datetime.date(2023, 1, 1)
+        self.date2 = datetime.date(2023, 1, 10)
+
+    def test_flush_merges_buffered_hits(self):
+        Query.get("acorns").add_hit(self.date1)
+        for _ in range(3):
+            record_query_hit("Acorns ", self.date1)
+        record_query_hit("acorns", self.date2)
+        record_query_hit("chestnuts", self.date1)
+        record_query_hit("   ", self.date1)
+        self.assertFalse(QueryDailyHits.objects.filter(date=self.date2).exists())
+
+        self.assertEqual(flush_query_hits(), 5)
+        hits = {
+            (daily.query.query_string, daily.date): daily.hits
+            for daily in QueryDailyHits.objects.select_related("query")
+        }
+        self.assertEqual(
+            hits,
+            {
+                ("acorns", self.date1): 4,
+                ("acorns", self.date2): 1,
+                ("chestnuts", self.date1): 1,
+            },
+        )
+        self.assertFalse(self.conn.exists(QUERY_HITS_KEY))
+        self.assertEqual(flush_query_hits(), 0)
+
+    def test_failed_flush_restores_buffered_hits(self):
+        record_query_hit("acorns", self.date1)
+        with patch(
+            "search.query_hits.save_query_hits", side_effect=ConnectionError
+        ), self.assertRaises(ConnectionError):
+            flush_query_hits()
+        record_query_hit("acorns", self.date1)
+        self.assertFalse(self.conn.exists(QUERY_HITS_FLUSH_KEY))
+        self.assertEqual(flush_query_hits(), 2)
+        self.assertEqual(Query.get("acorns").daily_hits.get(date=self.date1).hits, 2)
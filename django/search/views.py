@@ -2,7 +2,8 @@ from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.shortcuts import render
 
 from wagtail.models import Page
-from wagtail.contrib.search_promotions.models import Query
+
+from .query_hits import record_query_hit
 
 
 def search(request):
@@ -12,10 +13,9 @@ def search(request):
     # Search
     if search_query:
         search_results = Page.objects.live().search(search_query)
-        query = Query.get(search_query)
 
         # Record hit
-        query.add_hit()
+        record_query_hit(search_query)
     else:
         search_results = Page.objects.none()
 